@@ -34,16 +34,22 @@
 ##                                                                            ##
 ################################################################################
 
+import copy
+import json
+import time
 import socket
 import asyncore
 import asynchat
 import threading
 from traceback import format_exc
-from xml.etree import cElementTree as etree
 
 from tadek import connection
 from tadek.connection import protocol
+from tadek.connection import tracing
+from tadek.core import dump
 from tadek.core import queue
+from tadek.core import search
+from tadek.core import constants
 from tadek.core.accessible import Path, Accessible
 from tadek.core.utils import decode
 
@@ -86,6 +92,95 @@ class ConnectionRefusedError(ClosingError):
         Error.__init__(self, msg)
 
 
+def _requestKey(request):
+    '''
+    Returns a key of the given request that does not depend on its id.
+    '''
+    request = copy.copy(request)
+    request.id = 0
+    return request.marshal()
+
+
+class Recorder(object):
+    '''
+    A class of recorders of client sessions. Each response is written to
+    a file as a line of JSON object containing the response, a request it
+    responds to, if any, a time of its reception since the recording
+    start and a latency of the response in seconds.
+    '''
+    def __init__(self, file):
+        '''
+        Opens the given recording file.
+
+        :param file: A path to the file
+        :type file: string
+        '''
+        self._fd = open(file, 'w')
+        self._mutex = threading.Lock()
+        self._start = self._connected = time.time()
+        # Marshaled requests and times of sending them by request ids
+        self._pending = {}
+
+    def connect(self):
+        '''
+        Notes a time of connecting to a daemon, the latency of the information
+        message is measured from.
+        '''
+        self._connected = time.time()
+
+    def request(self, request):
+        '''
+        Notes the given request sent to a daemon.
+
+        :param request: A sent request
+        :type request: tadek.connection.protocol.Request
+        '''
+        self._mutex.acquire()
+        try:
+            self._pending[request.id] = (request.marshal(), time.time())
+        finally:
+            self._mutex.release()
+
+    def response(self, response, data):
+        '''
+        Writes the given response received from a daemon together with
+        a request it responds to.
+
+        :param response: A received response
+        :type response: tadek.connection.protocol.Response
+        :param data: The response data as received
+        :type data: string
+        '''
+        stamp = time.time()
+        self._mutex.acquire()
+        try:
+            if self._fd is None:
+                return
+            request, sent = self._pending.pop(response.id,
+                                              (None, self._connected))
+            record = {
+                "time": stamp - self._start,
+                "latency": stamp - sent,
+                "request": request,
+                "response": data
+            }
+            self._fd.write(json.dumps(record) + '\n')
+        finally:
+            self._mutex.release()
+
+    def close(self):
+        '''
+        Closes the recording file.
+        '''
+        self._mutex.acquire()
+        try:
+            if self._fd is not None:
+                self._fd.close()
+                self._fd = None
+        finally:
+            self._mutex.release()
+
+
 class Client(asynchat.async_chat):
     '''
     A base class of clients.
@@ -106,13 +201,66 @@ class Client(asynchat.async_chat):
         '''
         asynchat.async_chat.__init__(self)
         self._mutex = threading.RLock()
+        self._recorder = None
+        self.tracer = None
         self.messages = self.queueClass()
         self.set_terminator(protocol.MSG_TERMINATOR)
 
+    def startRecording(self, file):
+        '''
+        Starts recording of all received responses together with requests
+        they respond to and their latencies to the given file. The recording
+        can be replayed using ReplayClient.
+
+        :param file: A path to the recording file
+        :type file: string
+        '''
+        self.stopRecording()
+        self._recorder = Recorder(file)
+
+    def stopRecording(self):
+        '''
+        Stops recording of the client session.
+        '''
+        recorder, self._recorder = self._recorder, None
+        if recorder is not None:
+            recorder.close()
+
+    def isRecording(self):
+        '''
+        Indicates whether the client session is recorded or not.
+
+        :return: True if the session is recorded, False otherwise
+        :rtype: boolean
+        '''
+        return self._recorder is not None
+
+    def startTracing(self, size=1024, hook=None):
+        '''
+        Starts tracing of timing spans of requests.
+
+        :param size: A number of the latest spans kept
+        :type size: integer
+        :param hook: A function called with each finished span
+        :type hook: function
+        :return: A tracer of the requests
+        :rtype: tadek.connection.tracing.Tracer
+        '''
+        self.tracer = tracing.Tracer(size, hook)
+        return self.tracer
+
+    def stopTracing(self):
+        '''
+        Stops tracing of requests.
+        '''
+        self.tracer = None
+
     def connect(self, address, port):
         '''
         Function for connecting to server.
         '''
+        if self._recorder is not None:
+            self._recorder.connect()
         try:
             if not self.socket:
                 self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -175,8 +323,18 @@ class Client(asynchat.async_chat):
         Function called when message terminator set by function set_terminator
         is found.
         '''
-        self.messages.put(protocol.parse(self._get_data(),
-                                         defaultClass=protocol.DefaultResponse))
+        tracer = self.tracer
+        if tracer is not None:
+            framed = time.time()
+        data = self._get_data()
+        message = protocol.parse(data, defaultClass=protocol.DefaultResponse)
+        if tracer is not None:
+            tracer.mark(message.id, tracing.STAGE_FRAMED, framed)
+            tracer.mark(message.id, tracing.STAGE_PARSED)
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.response(message, data)
+        self.messages.put(message)
 
     def handle_write(self):
         '''
@@ -185,6 +343,9 @@ class Client(asynchat.async_chat):
         self._mutex.acquire()
         try:
             asynchat.async_chat.handle_write(self)
+            tracer = self.tracer
+            if tracer is not None and not self.producer_fifo:
+                tracer.sent()
         finally:
             self._mutex.release()
 
@@ -222,7 +383,22 @@ class Client(asynchat.async_chat):
         '''
         self._mutex.acquire()
         try:
-            self.push(''.join([request.marshal(), self.get_terminator()]))
+            recorder = self._recorder
+            if recorder is not None:
+                recorder.request(request)
+            tracer = self.tracer
+            if tracer is None:
+                self.push(''.join([request.marshal(), self.get_terminator()]))
+            else:
+                tracer.begin(request)
+                data = request.marshal()
+                tracer.mark(request.id, tracing.STAGE_MARSHALLED)
+                self.push(''.join([data, self.get_terminator()]))
+                tracer.mark(request.id, tracing.STAGE_PUSHED)
+                if self.producer_fifo:
+                    tracer.unsent(request.id)
+                else:
+                    tracer.mark(request.id, tracing.STAGE_SENT)
         except Exception, err:
             self.messages.put(Error(err))
         finally:
@@ -238,7 +414,11 @@ class Client(asynchat.async_chat):
         :return: A fist response from the message queue
         :rtype: tadek.connection.protocol.Response
         '''
-        return self.messages.get(id, timeout=timeout)
+        response = self.messages.get(id, timeout=timeout)
+        tracer = self.tracer
+        if tracer is not None and response is not None:
+            tracer.mark(response.id, tracing.STAGE_DEQUEUED)
+        return response
 
     def error(self, timeout=None):
         '''
@@ -258,35 +438,30 @@ class XmlClient(object):
     '''
     queueClass = queue.Queue
 
+    #: Requests to offline clients are not traced
+    tracer = None
+
     def __init__(self):
         self._root = None
+        self._index = None
         self.messages = self.queueClass()
 
     def connect(self, file):
         '''
-        Loads an accessible tree from the given file.
+        Loads an accessible tree from the given file and indexes it. If
+        the file is a dump of the compact format then it is memory-mapped
+        and accessibles are decoded on demand.
 
-        :param file: A name of the XML file to load
+        :param file: A name of the XML or compact dump file to load
         :type file: string
         '''
-        def setPath(acc, parentPath=None):
-            if parentPath is None:
-                acc.path = Path()
-            else:
-                acc.path = parentPath.child(acc.index)
-            for child in acc.children():
-                setPath(child, acc.path)
-
         try:
-            element = etree.ElementTree(file=file).getroot()
-            acc = Accessible.unmarshal(element)
-            if not acc.path.tuple:
-                self._root = acc
-            else:                
-                self._root = Accessible(Path(), children=(acc,))
-            acc.index = 0
-            setPath(self._root)
+            self._index = dump.openIndex(file)
+            self._root = self._index.get(Path())
+            if self._root is None:
+                raise ValueError("Empty dump file: %s" % file)
         except Exception, err:
+            self.disconnect()
             self.messages.put(Error(err))
 
     def disconnect(self):
@@ -294,7 +469,10 @@ class XmlClient(object):
         Clears the element tree loaded using connect(). Changes the state
         to disconnected.
         '''
+        if isinstance(self._index, dump.DumpIndex):
+            self._index.close()
         self._root = None
+        self._index = None
 
     def isConnected(self):
         '''
@@ -313,52 +491,18 @@ class XmlClient(object):
         :param request: A request to handle
         :type request: tadek.connection.protocol.Request
         '''
-        def getAccessible(path):
-            '''
-            Gets an accessible of the given path.
-            '''
-            # TODO
-            #if not path.tuple:
-            #    # Create a fake accessible representing the root
-            #    return Accessible(self._root.path.parent() or Path(),
-            #                      children=(self._root,))
-            #n = len(self._root.path.tuple)
-            #if len(path.tuple) < n or path.tuple[:n] != self._root.path.tuple:
-            #    return None
-            acc = self._root
-            if acc.path == path:
-                return acc
-            try:
-                #for idx in path.tuple[n:]:
-                for idx in path.tuple:
-                    if idx >= acc.count:
-                        return None
-                    i = 0
-                    for child in acc.children():
-                        if i == idx:
-                            acc = child
-                            break
-                        i += 1
-                    if i != idx:
-                        return None
-            except Exception, err:
-                self.messages.put(Error(err))
-                acc = None
-            return acc
-        
         extras = {}
         if self._root is None:
             self.messages.put(Error("XML client is not connected"))
         elif request.target == protocol.MSG_TARGET_ACCESSIBILITY:
             if request.name == protocol.MSG_NAME_GET:
-                accessible = getAccessible(request.path)
+                accessible = self._index.get(request.path)
                 extras = {
                     "status": accessible is not None,
                     "accessible": accessible or Accessible(Path())
                 }
             elif request.name == protocol.MSG_NAME_SEARCH:
-                acc = getAccessible(request.path)
-                # TODO: Currently not used
+                extras = self._search(request)
             elif request.name == protocol.MSG_NAME_PUT:
                 extras = {
                     "status": False
@@ -394,6 +538,43 @@ class XmlClient(object):
         response.id = request.id
         self.messages.put(response)
 
+    def _search(self, request):
+        '''
+        Searches the indexed accessible tree according to the given search
+        request and returns parameters of a response to it.
+        '''
+        searchers = getattr(request, "searchers", None)
+        findAll = searchers is not None or hasattr(request, "include")
+        accessible = self._index.get(request.path)
+        found = None
+        try:
+            if accessible is None:
+                pass
+            elif searchers is not None:
+                found = search.search(accessible, request.method,
+                                      request.predicates, searchers,
+                                      self._index)
+                found = [found] if found is not None else []
+            elif findAll:
+                found = search.searchAll(accessible, request.method,
+                                         request.predicates,
+                                         index=self._index)
+            else:
+                found = search.search(accessible, request.method,
+                                      request.predicates, index=self._index)
+        except Exception, err:
+            self.messages.put(Error(err))
+            found = None
+        if findAll:
+            return {
+                "status": found is not None,
+                "accessibles": found or []
+            }
+        return {
+            "status": found is not None,
+            "accessible": found or Accessible(Path())
+        }
+
     def response(self, id, timeout=None):
         '''
         Subsequent calls of this method return queued responses of the given ID
@@ -416,3 +597,147 @@ class XmlClient(object):
         '''
         return self.messages.get(protocol.ERROR_MSG_ID, block=False)
 
+
+class ReplayClient(object):
+    '''
+    A class of fake clients used to replay client sessions recorded using
+    Client.startRecording(). Requests are answered with recorded responses
+    to equal requests in order of recording, the last one is repeated if
+    a request is sent more times than recorded. Responses are delivered
+    at once or, in the real time mode, after their recorded latencies.
+    '''
+    queueClass = queue.Queue
+
+    #: A path to the recording file, if None then the connected address is
+    #: a path to the file
+    recording = None
+    #: Requests to replaying clients are not traced
+    tracer = None
+    #: If True then responses are delayed by their recorded latencies
+    realtime = False
+
+    def __init__(self):
+        self._connected = False
+        self._info = None
+        self._responses = {}
+        self._timers = []
+        self.messages = self.queueClass()
+
+    def connect(self, address, port=None):
+        '''
+        Loads the recording from the given file and queues a recorded device
+        information message.
+
+        :param address: A path to the recording file if the recording class
+            attribute is not set
+        :type address: string
+        :param port: Not used
+        :type port: integer
+        '''
+        self._responses = {}
+        self._info = None
+        fd = None
+        try:
+            fd = open(self.recording or address, 'r')
+            for line in fd:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                data = record["response"].encode(constants.ENCODING)
+                response = (record["latency"], data)
+                if record["request"] is None:
+                    if protocol.parse(data).id == protocol.INFO_MSG_ID:
+                        self._info = response
+                    continue
+                request = protocol.parse(
+                            record["request"].encode(constants.ENCODING),
+                            defaultClass=protocol.DefaultRequest)
+                self._responses.setdefault(_requestKey(request),
+                                           []).append(response)
+            self._connected = True
+        except Exception, err:
+            self.messages.put(Error(err))
+        finally:
+            if fd:
+                fd.close()
+        if self._connected and self._info is not None:
+            latency, data = self._info
+            self._deliver(protocol.parse(data), latency)
+
+    def disconnect(self):
+        '''
+        Cancels delivering of delayed responses and changes the state
+        to disconnected.
+        '''
+        for timer in self._timers:
+            timer.cancel()
+        self._timers = []
+        self._connected = False
+
+    def isConnected(self):
+        '''
+        Indicates whether client is connected to some recording.
+
+        :return: Current connection state
+        :rtype: boolean
+        '''
+        return self._connected
+
+    def _deliver(self, message, latency):
+        '''
+        Queues the given message at once or after the specified latency
+        in the real time mode.
+        '''
+        if not self.realtime or latency <= 0:
+            self.messages.put(message)
+            return
+        self._timers = [t for t in self._timers if t.isAlive()]
+        timer = threading.Timer(latency, self.messages.put, (message,))
+        timer.setDaemon(True)
+        self._timers.append(timer)
+        timer.start()
+
+    def request(self, request):
+        '''
+        Answers the given request with a recorded response.
+
+        :param request: A request to handle
+        :type request: tadek.connection.protocol.Request
+        '''
+        if not self._connected:
+            self.messages.put(Error("Replay client is not connected"))
+            return
+        responses = self._responses.get(_requestKey(request))
+        if not responses:
+            response = protocol.DefaultResponse(request.target, request.name,
+                                                status=False)
+            latency = 0.0
+        else:
+            latency, data = responses[0] if len(responses) == 1 \
+                                         else responses.pop(0)
+            response = protocol.parse(data,
+                                      defaultClass=protocol.DefaultResponse)
+        response.id = request.id
+        self._deliver(response, latency)
+
+    def response(self, id, timeout=None):
+        '''
+        Subsequent calls of this method return queued responses of the given ID
+        in order of reception.
+
+        :param id: ID of the response to get
+        :type id: integer
+        :return: A fist response from the message queue
+        :rtype: tadek.connection.protocol.Response
+        '''
+        return self.messages.get(id, timeout=timeout)
+
+    def error(self, timeout=None):
+        '''
+        Subsequent calls of this method return queued errors in order
+        of reception.
+
+        :return: A fist error from the message queue
+        :rtype: tadek.connection.protocol.Response
+        '''
+        return self.messages.get(protocol.ERROR_MSG_ID, timeout=timeout)
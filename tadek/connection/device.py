@@ -37,12 +37,24 @@
 import time
 import threading
 
+from tadek.core import timing
 from tadek.core.locale import escape
 from tadek.connection import ConnectionError
 from tadek.connection import protocol
-from tadek.connection.client import Client, XmlClient
+from tadek.connection.client import Client, XmlClient, ReplayClient
 
-__all__ = ["Device", "OfflineDevice"]
+__all__ = ["Device", "OfflineDevice", "ReplayDevice"]
+
+#: Names of accessible fields that can be requested from devices
+FIELDS = (u"name", u"description", u"role", u"count", u"position", u"size",
+          u"text", u"value", u"actions", u"states", u"attributes",
+          u"relations")
+
+def _include(all=False, **fields):
+    '''
+    Returns a list of names of the given accessible fields to request.
+    '''
+    return [field for field in FIELDS if all or fields.get(field)]
 
 class ConnectionThread(threading.Thread):
     '''
@@ -101,6 +113,8 @@ class Device(object):
         :type params: dictionary
         '''
         self.client = self.clientClass()
+        # Names of search methods not supported by the connected device
+        self._unsupported = set()
         self.params = {
             "name" : name,
             "address" : address,
@@ -190,6 +204,7 @@ class Device(object):
         '''
         if self.isConnected():
             return False
+        self._unsupported.clear()
         self.client.connect(*self.address)
         self._ensureConnection()
         attempt = 0
@@ -228,6 +243,37 @@ class Device(object):
         ''' 
         return self.client.isConnected()
 
+    @property
+    def tracer(self):
+        '''
+        Gets a tracer of requests to the device.
+
+        :return: A tracer or None if requests are not traced
+        :rtype: tadek.connection.tracing.Tracer
+        '''
+        return self.client.tracer
+
+    def startTracing(self, size=1024, hook=None):
+        '''
+        Starts tracing of timing spans of requests to the device from their
+        creation to dequeuing of their responses.
+
+        :param size: A number of the latest spans kept
+        :type size: integer
+        :param hook: A function called with each finished span, e.g. to
+            export it
+        :type hook: function
+        :return: A tracer of the requests
+        :rtype: tadek.connection.tracing.Tracer
+        '''
+        return self.client.startTracing(size, hook)
+
+    def stopTracing(self):
+        '''
+        Stops tracing of requests to the device.
+        '''
+        self.client.stopTracing()
+
 # Asynchronous methods
     def request(self, target, name, params):
         '''
@@ -245,8 +291,16 @@ class Device(object):
         '''
         if not self.isConnected():
             raise ConnectionError("Device is not connected")
+        tracer = self.client.tracer
+        profile = timing.current()
+        if tracer is not None or profile is not None:
+            created = time.time()
         request = protocol.create(protocol.MSG_TYPE_REQUEST,
                                   target, name, **params)
+        if tracer is not None:
+            tracer.begin(request, created)
+        if profile is not None:
+            profile.request(request.id, target, name, created)
         self.client.request(request) 
         return request.id
 
@@ -297,31 +351,11 @@ class Device(object):
         :return: Id of the sent request
         :rtype: integer
         '''
-        include = []
-        if name or all:
-            include.append(u"name")
-        if description or all:
-            include.append(u"description")
-        if role or all:
-            include.append(u"role")
-        if count or all:
-            include.append(u"count")
-        if position or all:
-            include.append(u"position")
-        if size or all:
-            include.append(u"size")
-        if text or all:
-            include.append(u"text")
-        if value or all:
-            include.append(u"value")
-        if actions or all:
-            include.append(u"actions")
-        if states or all:
-            include.append(u"states")
-        if attributes or all:
-            include.append(u"attributes")
-        if relations or all:
-            include.append(u"relations")
+        include = _include(name=name, description=description, role=role,
+                           count=count, position=position, size=size,
+                           text=text, value=value, actions=actions,
+                           states=states, attributes=attributes,
+                           relations=relations, all=all)
         params = {
             "path": path,
             "depth": depth,
@@ -330,6 +364,38 @@ class Device(object):
         return self.request(protocol.MSG_TARGET_ACCESSIBILITY,
                             protocol.MSG_NAME_GET, params)
 
+    def _predicates(self, name=None, description=None, role=None, index=None,
+                          count=None, action=None, relation=None, state=None,
+                          text=None, nth=0, **attrs):
+        '''
+        Returns a dictionary of search predicates with translated values.
+        '''
+        predicates = {
+            "nth": nth
+        }
+        if name is not None:
+            predicates["name"] = escape(name, self)
+        if description is not None:
+            predicates["description"] = escape(description, self)
+        if role is not None:
+            predicates["role"] = role
+        if index is not None:
+            predicates["index"] = index
+        if count is not None:
+            predicates["count"] = count
+        if action is not None:
+            predicates["action"] = action
+        if relation is not None:
+            predicates["relation"] = relation
+        if state is not None:
+            predicates["state"] = state
+        if text is not None:
+            predicates["text"] = escape(text, self)
+        predicates.update(attrs)
+        for attr, value in attrs.iteritems():
+            predicates[attr] = escape(value, self)
+        return predicates
+
     def requestSearchAccessible(self, path, method, name=None, description=None,
                                       role=None, index=None, count=None,
                                       action=None, relation=None, state=None,
@@ -367,38 +433,104 @@ class Device(object):
         :return: Id of the sent request
         :rtype: integer
         '''
-        predicates = {
-            "nth": nth
-        }
-        if name is not None:
-            predicates["name"] = escape(name, self)
-        if description is not None:
-            predicates["description"] = escape(description, self)
-        if role is not None:
-            predicates["role"] = role
-        if index is not None:
-            predicates["index"] = index
-        if count is not None:
-            predicates["count"] = count
-        if action is not None:
-            predicates["action"] = action
-        if relation is not None:
-            predicates["relation"] = relation
-        if state is not None:
-            predicates["state"] = state
-        if text is not None:
-            predicates["text"] = escape(text, self)
-        predicates.update(attrs)
-        for attr, value in attrs.iteritems():
-            predicates[attr] = escape(value, self)
+        predicates = self._predicates(name=name, description=description,
+                                      role=role, index=index, count=count,
+                                      action=action, relation=relation,
+                                      state=state, text=text, nth=nth, **attrs)
+        return self.requestSearch(path, method, predicates)
+
+    def requestSearch(self, path, method, predicates, include=None,
+                      searchers=None):
+        '''
+        Sends a request for searching accessible objects starting from
+        the given path and using the specified search method. Values of
+        the given predicates have to be already escaped (translated) using
+        the device locale, they are sent as they are.
+
+        :param path: A starting path for the searching of accessible objects
+        :type path: tadek.core.accessible.Path
+        :param method: A search method of accessibles
+        :type method: string
+        :param predicates: A dictionary of escaped predicates of searched
+            accessibles including the 'nth' one
+        :type predicates: dictionary
+        :param include: Names of accessible fields to request for all matched
+            accessibles or None to search only the nth one
+        :type include: tuple
+        :param searchers: A list of searchers defining a structure as
+            dictionaries of a search method, escaped predicates and searchers
+            or None
+        :type searchers: list
+        :return: Id of the sent request
+        :rtype: integer
+        '''
         params = {
             "path": path,
             "method": method,
             "predicates": predicates
         }
+        if include is not None:
+            params["include"] = [field for field in FIELDS if field in include]
+        if searchers is not None:
+            params["searchers"] = searchers
         return self.request(protocol.MSG_TARGET_ACCESSIBILITY,
                             protocol.MSG_NAME_SEARCH, params)
 
+    def requestSearchAccessibles(self, path, method, include=(), **predicates):
+        '''
+        Sends a request for searching all accessible objects starting from
+        the given path and using the specified search method. The response
+        contains the nth matched accessible and all accessibles matched after
+        it, each with the given fields.
+
+        :param path: A starting path for the searching of accessible objects
+        :type path: tadek.core.accessible.Path
+        :param method: A search method of accessibles
+        :type method: string
+        :param include: Names of accessible fields to request
+        :type include: tuple
+        :param predicates: Predicates of searched accessibles, the same as
+            in requestSearchAccessible() method
+        :type predicates: dictionary
+        :return: Id of the sent request
+        :rtype: integer
+        '''
+        return self.requestSearch(path, method, self._predicates(**predicates),
+                                  include=include)
+
+    def _searchers(self, searchers):
+        '''
+        Returns a list of the given searchers with translated predicates.
+        '''
+        return [{
+            "method": s["method"],
+            "predicates": self._predicates(**s["predicates"]),
+            "searchers": self._searchers(s.get("searchers", ()))
+        } for s in searchers]
+
+    def requestSearchStructure(self, path, method, searchers, **predicates):
+        '''
+        Sends a request for searching an accessible object starting from
+        the given path and using the specified search method, that is
+        the nth root of a structure of accessible objects defined by the given
+        searchers.
+
+        :param path: A starting path for the searching of accessible object
+        :type path: tadek.core.accessible.Path
+        :param method: A search method of accessible
+        :type method: string
+        :param searchers: A list of searchers defining the structure as
+            dictionaries of a search method, predicates and searchers
+        :type searchers: list
+        :param predicates: Predicates of the searched root accessible, the same
+            as in requestSearchAccessible() method
+        :type predicates: dictionary
+        :return: Id of the sent request
+        :rtype: integer
+        '''
+        return self.requestSearch(path, method, self._predicates(**predicates),
+                                  searchers=self._searchers(searchers))
+
     def requestDoAccessible(self, path, action):
         '''
         Sends a request performing the given action on an accessible object of
@@ -579,6 +711,9 @@ class Device(object):
         :rtype: tadek.connection.protocol.Response
         '''
         response = self.client.response(id, timeout)
+        profile = timing.current()
+        if profile is not None:
+            profile.response(id)
         if response is None:
             raise Exception("Timeout reached while waiting for response")
         return response
@@ -621,12 +756,146 @@ class Device(object):
         :rtype: tadek.core.accessible.Accessible
         '''
         id = self.requestSearchAccessible(path, method=method, **kwargs)
-        response = self.getResponse(id)
+        return self._accessible(self.getResponse(id))
+
+    def searchEscaped(self, path, method, predicates):
+        '''
+        Searches an accessible object starting from the given path and using
+        the specified search method and already escaped predicates.
+
+        :param path: A starting path for the searching of accessible object
+        :type path: tadek.core.accessible.Path
+        :param method: A search method of accessible object
+        :type method: string
+        :param predicates: A dictionary of escaped predicates including
+            the 'nth' one
+        :type predicates: dictionary
+        :return: Searched accessible object or None if request failed
+        :rtype: tadek.core.accessible.Accessible
+        '''
+        id = self.requestSearch(path, method, predicates)
+        return self._accessible(self.getResponse(id))
+
+    def _accessible(self, response):
+        '''
+        Returns an accessible from the given response or None if the request
+        failed.
+        '''
         if not response.status:
             return None
         response.accessible.setDevice(self)
         return response.accessible
 
+    def _accessibles(self, name, response):
+        '''
+        Returns a list of accessibles from the given response to a request
+        of the specified method name. If the device does not support
+        the request, it is remembered and None is returned.
+        '''
+        if (isinstance(response, protocol.DefaultResponse) or
+            not hasattr(response, "accessibles")):
+            self._unsupported.add(name)
+            return None
+        if not response.status:
+            return None
+        accessibles = list(response.accessibles)
+        for accessible in accessibles:
+            accessible.setDevice(self)
+        return accessibles
+
+    def searchAccessibles(self, path, method, **kwargs):
+        '''
+        Searches all accessible objects starting from the given path and using
+        the specified search method in one request.
+
+        :param path: A starting path for the searching of accessible objects
+        :type path: tadek.core.accessible.Path
+        :param method: A search method of accessible objects
+        :type method: string
+        :param kwargs: A collection of keyword arguments to
+            requestSearchAccessibles() method
+        :type kwargs: dictionary
+        :return: A list of searched accessible objects or None if request
+            failed or it is not supported by the device
+        :rtype: list
+        '''
+        if "searchAccessibles" in self._unsupported:
+            return None
+        id = self.requestSearchAccessibles(path, method=method, **kwargs)
+        return self._accessibles("searchAccessibles", self.getResponse(id))
+
+    def searchAllEscaped(self, path, method, predicates, include=()):
+        '''
+        Searches all accessible objects starting from the given path and using
+        the specified search method and already escaped predicates in one
+        request.
+
+        :param path: A starting path for the searching of accessible objects
+        :type path: tadek.core.accessible.Path
+        :param method: A search method of accessible objects
+        :type method: string
+        :param predicates: A dictionary of escaped predicates including
+            the 'nth' one
+        :type predicates: dictionary
+        :param include: Names of accessible fields to request
+        :type include: tuple
+        :return: A list of searched accessible objects or None if request
+            failed or it is not supported by the device
+        :rtype: list
+        '''
+        if "searchAccessibles" in self._unsupported:
+            return None
+        id = self.requestSearch(path, method, predicates, include=include)
+        return self._accessibles("searchAccessibles", self.getResponse(id))
+
+    def searchStructure(self, path, method, searchers, **predicates):
+        '''
+        Searches a root accessible object of a structure of accessible objects
+        defined by the given searchers starting from the specified path and
+        using the search method in one request.
+
+        :param path: A starting path for the searching of accessible object
+        :type path: tadek.core.accessible.Path
+        :param method: A search method of accessible object
+        :type method: string
+        :param searchers: A list of searchers defining the structure
+        :type searchers: list
+        :param predicates: Predicates of the searched root accessible
+        :type predicates: dictionary
+        :return: A list containing the found root accessible object if any or
+            None if request failed or it is not supported by the device
+        :rtype: list
+        '''
+        if "searchStructure" in self._unsupported:
+            return None
+        id = self.requestSearchStructure(path, method, searchers, **predicates)
+        return self._accessibles("searchStructure", self.getResponse(id))
+
+    def searchStructureEscaped(self, path, method, searchers, predicates):
+        '''
+        Searches a root accessible object of a structure of accessible objects
+        defined by the given searchers starting from the specified path and
+        using the search method and already escaped predicates in one request.
+
+        :param path: A starting path for the searching of accessible object
+        :type path: tadek.core.accessible.Path
+        :param method: A search method of accessible object
+        :type method: string
+        :param searchers: A list of searchers defining the structure with
+            escaped predicates
+        :type searchers: list
+        :param predicates: A dictionary of escaped predicates of the searched
+            root accessible including the 'nth' one
+        :type predicates: dictionary
+        :return: A list containing the found root accessible object if any or
+            None if request failed or it is not supported by the device
+        :rtype: list
+        '''
+        if "searchStructure" in self._unsupported:
+            return None
+        id = self.requestSearch(path, method, predicates, searchers=searchers)
+        return self._accessibles("searchStructure", self.getResponse(id))
+
     def doAccessible(self, path, action):
         '''
         Performs the given action on an accessible object specified by the path.
@@ -824,3 +1093,52 @@ class OfflineDevice(Device):
             self.client.disconnect()
             return not self.isConnected()
 
+
+class ReplayDevice(Device):
+    '''
+    A class of devices that replay client sessions recorded from real devices.
+    '''
+    clientClass = ReplayClient
+
+    def __init__(self, name, file, realtime=False, **params):
+        '''
+        Assigns a name and other parameters, and next initializes a related
+        replay client.
+
+        :param name: A name of the device
+        :type name: string
+        :param file: A path to the recording file
+        :type file: string
+        :param realtime: If True then responses are delayed by their recorded
+            latencies, otherwise they are delivered at once
+        :type realtime: boolean
+        :param params: A dictionary with parameters
+        :type params: dictionary
+        '''
+        Device.__init__(self, name, file, 0, **params)
+        self.client.realtime = realtime
+
+    def connect(self):
+        '''
+        Initializes a connection with the replayed device.
+        '''
+        if self.isConnected():
+            raise ConnectionError("Replay device already connected")
+        self._unsupported.clear()
+        self.client.connect(self.address[0])
+        if self.isConnected():
+            try:
+                self._info = self.getResponse(protocol.INFO_MSG_ID,
+                                              self._infoTimeout)
+                return True
+            except:
+                self.client.disconnect()
+        raise ConnectionError("Replay device could not connect")
+
+    def disconnect(self):
+        '''
+        Closes a connection with the replayed device.
+        '''
+        if self.isConnected():
+            self.client.disconnect()
+            return not self.isConnected()
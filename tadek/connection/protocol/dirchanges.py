@@ -0,0 +1,261 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import os
+import re
+import time
+import bisect
+import threading
+
+from tadek.connection.protocol import extension
+from tadek.connection.protocol import parameters
+from tadek.connection.protocol.dirfiles import FileDetailsParameter
+from tadek.core.structs import FileDetails
+
+# A resolution of modification times of directories in seconds, listings of
+# directories modified recently are not reused
+_MTIME_RESOLUTION = 1.0
+
+class DirIndex(object):
+    '''
+    A class of indexes of directory files that track changes of the files.
+    Only directories modified since the last scan are listed again.
+    '''
+    def __init__(self, path, pattern, recursive=False, links=False):
+        self.path = path
+        self._pattern = re.compile(pattern)
+        self._recursive = recursive
+        self._links = links
+        #: An unique identifier of the index used in cursors
+        self.epoch = u"%x%x" % (int(time.time() * 1000), id(self))
+        #: A sequence number of the last change
+        self.sequence = 0
+        # A dictionary of files: path -> (mtime, size, sequence)
+        self._files = {}
+        # A dictionary of directories: path -> (mtime, stable, subdirectories)
+        self._dirs = {}
+        # A log of changes as sorted lists of sequences and paths
+        self._sequences = []
+        self._paths = []
+        self._lock = threading.Lock()
+
+    def _listDir(self, dirpath, files):
+        '''
+        Lists the given directory adding matching files to the specified set
+        and returns a list of its subdirectories.
+        '''
+        dirs = []
+        try:
+            names = os.listdir(dirpath)
+        except OSError:
+            return dirs
+        for name in names:
+            path = os.path.join(dirpath, name)
+            if os.path.islink(path) and not self._links:
+                continue
+            if os.path.isfile(path):
+                match = self._pattern.match(name)
+                if match and match.span() == (0, len(name)):
+                    files.add(path)
+            elif os.path.isdir(path) and self._recursive:
+                dirs.append(path)
+        return dirs
+
+    def _scan(self):
+        '''
+        Updates the index and logs changed files.
+        '''
+        files = set(self._files)
+        dirs = {}
+        stack = [self.path]
+        stamp = time.time() - _MTIME_RESOLUTION
+        while stack:
+            dirpath = stack.pop()
+            try:
+                mtime = os.path.getmtime(dirpath)
+            except OSError:
+                continue
+            cached = self._dirs.get(dirpath)
+            if cached is not None and cached[:2] == (mtime, True):
+                subdirs = cached[2]
+            else:
+                subdirs = self._listDir(dirpath, files)
+            dirs[dirpath] = (mtime, mtime < stamp, subdirs)
+            stack.extend(subdirs)
+        self._dirs = dirs
+        sequence = self.sequence + 1
+        for path in files:
+            try:
+                mtime = os.path.getmtime(path)
+                size = os.path.getsize(path)
+            except OSError:
+                self._files.pop(path, None)
+                continue
+            details = self._files.get(path)
+            if details is None or details[:2] != (mtime, size):
+                self._files[path] = (mtime, size, sequence)
+                self._sequences.append(sequence)
+                self._paths.append(path)
+        if self._sequences and self._sequences[-1] == sequence:
+            self.sequence = sequence
+        # Compact the log of changes
+        if len(self._paths) > 2 * len(self._files) + 64:
+            log = sorted([(seq, path) for path, (mtime, size, seq)
+                                      in self._files.iteritems()])
+            self._sequences = [seq for seq, path in log]
+            self._paths = [path for seq, path in log]
+
+    def changes(self, cursor=None):
+        '''
+        Scans the indexed directory and returns files changed since the given
+        cursor. All files are returned if the cursor is not valid for
+        the index.
+
+        :param cursor: A cursor returned by previous call or None
+        :type cursor: string
+        :return: A list of changed files and a new cursor
+        :rtype: tuple
+        '''
+        since = 0
+        if cursor:
+            epoch, sep, sequence = cursor.rpartition(u':')
+            if epoch == self.epoch and sequence.isdigit():
+                since = int(sequence)
+        self._lock.acquire()
+        try:
+            self._scan()
+            files = []
+            seen = set()
+            start = bisect.bisect_right(self._sequences, since)
+            for path in self._paths[start:]:
+                if path in seen or path not in self._files:
+                    continue
+                seen.add(path)
+                mtime, size, sequence = self._files[path]
+                if sequence > since:
+                    files.append(FileDetails(path, mtime=mtime, size=size))
+            return files, u"%s:%d" % (self.epoch, self.sequence)
+        finally:
+            self._lock.release()
+
+
+# A cache of directory indexes
+_indexes = {}
+_indexesLock = threading.Lock()
+
+def getIndex(path, pattern, recursive=False, links=False):
+    '''
+    Gets an index of directory files of the given parameters.
+
+    :param path: A path to the directory
+    :type path: string
+    :param pattern: A pattern as regular expression of file names
+    :type pattern: string
+    :param recursive: True if the index should include files from all
+        subdirectories
+    :type recursive: boolean
+    :param links: True if the index should include symbolic links
+    :type links: boolean
+    :return: An index of the directory files
+    :rtype: DirIndex
+    '''
+    key = (path, pattern, recursive, links)
+    _indexesLock.acquire()
+    try:
+        index = _indexes.get(key)
+        if index is None:
+            _indexes[key] = index = DirIndex(*key)
+        return index
+    finally:
+        _indexesLock.release()
+
+
+class DirChangesExtension(extension.ProtocolExtension):
+    '''
+    A protocol extension class for listing directory files changed since
+    a given cursor.
+    '''
+    name = u"dirchanges"
+
+    requestParams = {
+        "path": parameters.UnicodeParameter(),
+        "pattern": parameters.UnicodeParameter(),
+        "recursive": parameters.BooleanParameter(),
+        "links": parameters.BooleanParameter(),
+        "cursor": parameters.UnicodeParameter()
+    }
+
+    responseParams = {
+        "files": parameters.ListParameter(FileDetailsParameter(), iname="file"),
+        "cursor": parameters.UnicodeParameter()
+    }
+
+    def request(self, path, pattern=".+", recursive=False, links=False,
+                cursor=u''):
+        '''
+        Provides a full list of the changed file details request.
+
+        :param path: A name of the directory with files
+        :type path: string
+        :param pattern: A pattern as regular expression of file names
+        :type pattern: string
+        :param recursive: True if the result should include files from all
+                          subdirectories
+        :type recursive: boolean
+        :param links: True if the result should include symbolic links
+        :type links: boolen
+        :param cursor: A cursor returned by the previous response, or empty
+                       string to get all files
+        :type cursor: string
+        :return: A dictionary containing all request parameters
+        :rtype: dictionary
+        '''
+        return extension.ProtocolExtension.request(self, path=path,
+                                                         pattern=pattern,
+                                                         recursive=recursive,
+                                                         links=links,
+                                                         cursor=cursor)
+
+    def response(self, path, pattern, recursive, links, cursor):
+        '''
+        Gets list of directory files specified by the path according to
+        the given parameters that changed since the cursor.
+        '''
+        if not os.path.isdir(path):
+            return False, {"files": [], "cursor": cursor}
+        index = getIndex(os.path.abspath(path), pattern, recursive, links)
+        files, cursor = index.changes(cursor)
+        return True, {"files": files, "cursor": cursor}
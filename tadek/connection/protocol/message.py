@@ -295,28 +295,61 @@ registerResponse(MSG_TARGET_ACCESSIBILITY, MSG_NAME_GET,
                  accessible=AccessibleParameter()
 )
 
+def _searchMethod():
+    '''
+    Creates a parameter of accessibility search methods.
+    '''
+    return ChoiceParameter(MHD_SEARCH_SIMPLE, MHD_SEARCH_BACKWARDS,
+                           MHD_SEARCH_DEEP)
+
+def _searchPredicates():
+    '''
+    Creates a parameter of accessibility search predicates.
+    '''
+    return ParameterSet(UnicodeParameter(),
+                        name=UnicodeParameter(),
+                        description=UnicodeParameter(),
+                        role=UnicodeParameter(),
+                        index=IntParameter(),
+                        count=IntParameter(),
+                        action=UnicodeParameter(),
+                        relation=UnicodeParameter(),
+                        state=UnicodeParameter(),
+                        text=UnicodeParameter(),
+                        nth=IntParameter())
+
 # Search accessibility
 registerRequest(MSG_TARGET_ACCESSIBILITY, MSG_NAME_SEARCH,
                 path=PathParameter(),
-                method=ChoiceParameter(MHD_SEARCH_SIMPLE,
-                                       MHD_SEARCH_BACKWARDS,
-                                       MHD_SEARCH_DEEP),
-                predicates=ParameterSet(UnicodeParameter(),
-                                        name=UnicodeParameter(),
-                                        description=UnicodeParameter(),
-                                        role=UnicodeParameter(),
-                                        index=IntParameter(),
-                                        count=IntParameter(),
-                                        action=UnicodeParameter(),
-                                        relation=UnicodeParameter(),
-                                        state=UnicodeParameter(),
-                                        text=UnicodeParameter(),
-                                        nth=IntParameter())
+                method=_searchMethod(),
+                predicates=_searchPredicates()
 )
 registerResponse(MSG_TARGET_ACCESSIBILITY, MSG_NAME_SEARCH,
                  accessible=AccessibleParameter()
 )
 
+# Search all matching accessibility
+registerRequest(MSG_TARGET_ACCESSIBILITY, MSG_NAME_SEARCH,
+                path=PathParameter(),
+                method=_searchMethod(),
+                predicates=_searchPredicates(),
+                include=ListParameter(UnicodeParameter(), iname="attr")
+)
+registerResponse(MSG_TARGET_ACCESSIBILITY, MSG_NAME_SEARCH,
+                 accessibles=ListParameter(AccessibleParameter(),
+                                           iname="accessible")
+)
+
+# Search accessibility structure (the response is the one of search all)
+registerRequest(MSG_TARGET_ACCESSIBILITY, MSG_NAME_SEARCH,
+                path=PathParameter(),
+                method=_searchMethod(),
+                predicates=_searchPredicates(),
+                searchers=ListParameter(SearcherParameter(_searchMethod(),
+                                                          _searchPredicates()),
+                                        iname="searcher")
+)
+
 # Put accessibility text & value
 registerRequest(MSG_TARGET_ACCESSIBILITY, MSG_NAME_PUT,
                 path=PathParameter(),
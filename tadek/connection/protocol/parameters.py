@@ -42,7 +42,8 @@ from tadek.core.utils import decode
 __all__ = ["ParameterError", "MessageParameter",
            "UnicodeParameter", "IntParameter", "FloatParameter",
            "BooleanParameter", "ListParameter", "ChoiceParameter",
-           "ParameterSet", "PathParameter", "AccessibleParameter"]
+           "ParameterSet", "PathParameter", "AccessibleParameter",
+           "SearcherParameter"]
 
 class ParameterError(Exception):
     '''
@@ -202,7 +203,7 @@ class ParameterSet(MessageParameter):
                 self._default.validate(val)
 
     def marshal(self, element, value):
-        for name, val in value.iteritems():
+        for name, val in sorted(value.iteritems()):
             if name in self._params:
                 self._params[name].marshal(etree.SubElement(element, name), val)
             else:
@@ -245,3 +246,50 @@ class AccessibleParameter(MessageParameter):
     def unmarshal(self, element):
         return self.type.unmarshal(element)
 
+
+class SearcherParameter(MessageParameter):
+    '''
+    A class of searcher message parameters. A searcher is a dictionary of
+    a search method, search predicates and an optional list of searchers
+    defining a structure of accessibles.
+    '''
+    type = dict
+
+    def __init__(self, method, predicates):
+        if not isinstance(method, MessageParameter):
+            raise ParameterError("Invalid method parameter type: %s", method)
+        if not isinstance(predicates, MessageParameter):
+            raise ParameterError("Invalid predicates parameter type: %s",
+                                 predicates)
+        MessageParameter.__init__(self)
+        self._params = {
+            "method": method,
+            "predicates": predicates,
+            "searchers": ListParameter(self, iname="searcher")
+        }
+
+    def validate(self, value):
+        MessageParameter.validate(self, value)
+        for name, param in self._params.iteritems():
+            if name in value:
+                param.validate(value[name])
+            elif name != "searchers":
+                raise ParameterError("Not specified parameter: %s" % name)
+        for name in value:
+            if name not in self._params:
+                raise ParameterError("Invalid parameter name: %s" % name)
+
+    def marshal(self, element, value):
+        for name in sorted(value):
+            self._params[name].marshal(etree.SubElement(element, name),
+                                       value[name])
+
+    def unmarshal(self, element):
+        value = {
+            "searchers": ()
+        }
+        for param in element.getchildren():
+            if param.tag not in self._params:
+                raise ParameterError("Invalid parameter name: %s" % param.tag)
+            value[param.tag] = self._params[param.tag].unmarshal(param)
+        return value
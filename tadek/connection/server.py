@@ -46,7 +46,7 @@ class Handler(asynchat.async_chat):
     '''
     A class for handling client requests on the server side.
     '''
-    def __init__(self, socket, client):
+    def __init__(self, socket, client, map=None):
         '''
         Initializes channel between client and server.
 
@@ -54,8 +54,11 @@ class Handler(asynchat.async_chat):
         :type socket: socket.Socket
         :param client: Client address
         :type client: tuple containing client IP address and port
+        :param map: A map of channels of a server loop, if None then the global
+            one is used
+        :type map: dictionary
         '''
-        asynchat.async_chat.__init__(self, socket)
+        asynchat.async_chat.__init__(self, socket, map)
         self.client = client
         self.set_terminator(protocol.MSG_TERMINATOR)
 
@@ -152,16 +155,19 @@ class Server(asyncore.dispatcher):
     #: Class which is responsible for serving client.
     handlerClass = Handler
 
-    def __init__(self, address):
+    def __init__(self, address, map=None):
         '''
         Starts a server.
 
         :param address: An address of the server as ("ip", port)
         :type address: tuple
+        :param map: A map of channels of a server loop, if None then the global
+            one is used
+        :type map: dictionary
         '''
         try:
             self.address = address
-            asyncore.dispatcher.__init__(self)
+            asyncore.dispatcher.__init__(self, map=map)
             self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
             if os.name == "posix":
                 self.set_reuse_addr()
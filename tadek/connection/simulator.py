@@ -0,0 +1,405 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+import copy
+import heapq
+import random
+import select
+import asyncore
+import threading
+import time
+
+from tadek.connection import protocol
+from tadek.connection.client import Error, XmlClient
+from tadek.connection.server import Handler, Server
+from tadek.core import log
+from tadek.core import search
+from tadek.core.accessible import Path, Accessible
+
+__all__ = ["SimulatedTree", "SimulatedHandler", "SimulatedDaemon",
+           "syntheticTree"]
+
+#: Protocol extensions served by simulated daemons by default
+DEFAULT_EXTENSIONS = (u"dirfiles", u"utime")
+
+def syntheticTree(depth=4, fanout=5, path=None):
+    '''
+    Creates a synthetic accessible tree of the given depth, where each
+    accessible, except leaves, has the specified number of children.
+
+    :param depth: A number of levels below the root accessible
+    :type depth: integer
+    :param fanout: A number of children of each accessible
+    :type fanout: integer
+    :return: A root accessible of the tree
+    :rtype: tadek.core.accessible.Accessible
+    '''
+    if path is None:
+        path = Path()
+    children = ()
+    if depth > 0:
+        children = [syntheticTree(depth - 1, fanout, path.child(i))
+                    for i in xrange(fanout)]
+    acc = Accessible(path, children)
+    if path.tuple:
+        level = len(path.tuple)
+        acc.role = u"FRAME" if level == 1 else (u"PANEL" if depth else
+                                                u"PUSH_BUTTON")
+        acc.name = u"Node %s" % u'.'.join([str(i) for i in path.tuple])
+        acc.states = [u"ENABLED", u"VISIBLE"]
+        if not depth:
+            acc.actions = [u"CLICK"]
+            acc.text = u''
+            acc.editable = True
+    return acc
+
+
+class SimulatedTree(XmlClient):
+    '''
+    A class of accessible trees served by simulated daemons. It answers all
+    requests of the protocol that concern accessibility, system and supported
+    protocol extensions.
+    '''
+    def __init__(self, root=None, extensions=DEFAULT_EXTENSIONS):
+        XmlClient.__init__(self)
+        self.extensions = list(extensions)
+        # Files put to the simulated system
+        self.files = {}
+        if root is not None:
+            self.load(root)
+
+    def load(self, root):
+        '''
+        Serves the given accessible tree.
+
+        :param root: A root accessible of the tree
+        :type root: tadek.core.accessible.Accessible
+        '''
+        self.disconnect()
+        self._root = root
+        self._index = search.AccessibleIndex(root)
+
+    def _trim(self, accessible, depth):
+        '''
+        Returns a copy of the given accessible with descendants of at most
+        the specified number of generations, -1 for all of them.
+        '''
+        acc = copy.copy(accessible)
+        acc._children = []
+        if depth:
+            for child in self._index.iterate(accessible,
+                                             protocol.MHD_SEARCH_SIMPLE, {}):
+                acc._children.append(self._trim(child, depth - 1))
+        return acc
+
+    def _respond(self, request):
+        '''
+        Returns parameters of a response to the given request or None if
+        the request is not supported.
+        '''
+        if request.target == protocol.MSG_TARGET_ACCESSIBILITY:
+            if request.name == protocol.MSG_NAME_SEARCH:
+                return self._search(request)
+            accessible = self._index.get(request.path)
+            if request.name == protocol.MSG_NAME_GET:
+                if accessible is None:
+                    return {"status": False, "accessible": Accessible(Path())}
+                return {"status": True,
+                        "accessible": self._trim(accessible, request.depth)}
+            elif request.name == protocol.MSG_NAME_PUT:
+                if hasattr(request, "text"):
+                    status = accessible is not None and accessible.editable
+                    if status:
+                        accessible.text = request.text
+                else:
+                    status = accessible is not None
+                    if status:
+                        accessible.value = request.value
+                return {"status": status}
+            elif request.name == protocol.MSG_NAME_EXEC:
+                if hasattr(request, "action"):
+                    return {"status": accessible is not None and
+                                      request.action in accessible.actions}
+                return {"status": accessible is not None}
+        elif request.target == protocol.MSG_TARGET_SYSTEM:
+            if request.name == protocol.MSG_NAME_GET:
+                data = self.files.get(request.path)
+                return {"status": data is not None, "data": data or u''}
+            elif request.name == protocol.MSG_NAME_PUT:
+                self.files[request.path] = request.data
+                return {"status": True}
+            elif request.name == protocol.MSG_NAME_EXEC:
+                return {"status": True, "stdout": u'', "stderr": u''}
+        elif request.target == protocol.MSG_TARGET_EXTENSION:
+            if request.name in self.extensions:
+                params = dict([(name, getattr(request, name))
+                               for name in request.getParams()])
+                status, params = protocol.getExtension(
+                                            request.name).response(**params)
+                params["status"] = status
+                return params
+        return None
+
+    def request(self, request):
+        '''
+        Handles the given request and queues a response to it.
+
+        :param request: A request to handle
+        :type request: tadek.connection.protocol.Request
+        '''
+        params = None
+        if self._index is None:
+            self.messages.put(Error("Simulated tree is not loaded"))
+        elif not isinstance(request, protocol.DefaultRequest):
+            params = self._respond(request)
+        if params is None:
+            response = protocol.DefaultResponse(request.target, request.name,
+                                                status=False)
+        else:
+            response = protocol.create(protocol.MSG_TYPE_RESPONSE,
+                                       request.target, request.name, **params)
+        response.id = request.id
+        self.messages.put(response)
+
+
+class SimulatedHandler(Handler):
+    '''
+    A class of handlers of clients of simulated daemons. Responses are sent
+    after injected latencies and at a limited bandwidth.
+    '''
+    def __init__(self, socket, client, daemon):
+        Handler.__init__(self, socket, client, daemon._map)
+        self.daemon = daemon
+        # A heap of due times, sequence numbers and data of responses
+        self._pending = []
+        self._sequence = 0
+        self._busy = 0.0
+        self._schedule(protocol.create(protocol.MSG_TYPE_RESPONSE,
+                                       protocol.MSG_TARGET_SYSTEM,
+                                       protocol.MSG_NAME_INFO, status=True,
+                                       version=daemon.version,
+                                       locale=daemon.locale,
+                                       extensions=daemon.tree.extensions))
+
+    def onRequest(self, data):
+        '''
+        Handles the given request data with the simulated tree of the daemon.
+
+        :param data: Request data
+        :type data: string
+        :return: Request and related response instance
+        :rtype: tuple
+        '''
+        request = protocol.parse(data, defaultClass=protocol.DefaultRequest)
+        self.daemon.tree.request(request)
+        response = self.daemon.tree.response(request.id)
+        if self.daemon.fail():
+            # An injected failure of a supported request
+            response.status = False
+        return request, response
+
+    def onError(self, exception):
+        '''
+        Logs the given exception.
+        '''
+        log.error(exception)
+
+    def found_terminator(self):
+        '''
+        Handles a received request and schedules a response to it.
+        '''
+        request, response = self.onRequest(self._get_data())
+        response.id = request.id
+        self._schedule(response)
+
+    def _schedule(self, response):
+        '''
+        Schedules sending of the given response after a latency and a time
+        of its transfer at the bandwidth of the daemon.
+        '''
+        data = ''.join([response.marshal(), self.get_terminator()])
+        due = max(time.time() + self.daemon.latency(), self._busy)
+        if self.daemon.bandwidth:
+            due += float(len(data)) / self.daemon.bandwidth
+        self._busy = due
+        self._sequence += 1
+        heapq.heappush(self._pending, (due, self._sequence, data))
+
+    def flush(self, now):
+        '''
+        Sends responses due at the given time and returns a due time of
+        the next response or None.
+        '''
+        while self._pending and self._pending[0][0] <= now:
+            self.push(heapq.heappop(self._pending)[2])
+        return self._pending[0][0] if self._pending else None
+
+
+class SimulatedDaemon(Server):
+    '''
+    A class of simulated daemons serving an accessible tree to clients with
+    injected latency, jitter, bandwidth limit and failure rate. A daemon runs
+    its own loop in a thread, so it can be used together with devices in
+    the same process.
+    '''
+    handlerClass = SimulatedHandler
+
+    #: A version reported by simulated daemons
+    version = u"simulated"
+
+    def __init__(self, address, tree=None, latency=0.0, jitter=0.0,
+                 bandwidth=0, failures=0.0, locale=u'', seed=None):
+        '''
+        Starts listening of a simulated daemon.
+
+        :param address: An address of the daemon as ("ip", port), if the port
+            is 0 then a free one is chosen
+        :type address: tuple
+        :param tree: A simulated tree, a root accessible or a path to a dump
+            file, if None then a synthetic tree is served
+        :type tree: SimulatedTree or Accessible or string
+        :param latency: A mean latency of responses in seconds
+        :type latency: float
+        :param jitter: A maximum deviation of latencies in seconds
+        :type jitter: float
+        :param bandwidth: A number of bytes sent per second to each client,
+            0 for unlimited
+        :type bandwidth: integer
+        :param failures: A probability of failure of a request
+        :type failures: float
+        :param locale: A locale reported by the daemon
+        :type locale: string
+        :param seed: A seed of the random generator of latencies and failures
+        :type seed: integer
+        '''
+        if tree is None:
+            tree = SimulatedTree(syntheticTree())
+        elif isinstance(tree, Accessible):
+            tree = SimulatedTree(tree)
+        elif not isinstance(tree, SimulatedTree):
+            file, tree = tree, SimulatedTree()
+            tree.connect(file)
+            if not tree.isConnected():
+                raise tree.error()
+        self.tree = tree
+        self.locale = locale
+        self.bandwidth = bandwidth
+        self._latency = latency
+        self._jitter = jitter
+        self._failures = failures
+        self._random = random.Random(seed)
+        self._thread = None
+        self._running = False
+        Server.__init__(self, address, map={})
+        self.listen(64)
+        self.address = self.socket.getsockname()
+
+    def latency(self):
+        '''
+        Returns a latency of a next response.
+
+        :return: A latency in seconds
+        :rtype: float
+        '''
+        if not self._jitter:
+            return self._latency
+        return max(0.0, self._latency
+                        + self._random.uniform(-self._jitter, self._jitter))
+
+    def fail(self):
+        '''
+        Decides if a next request fails.
+
+        :return: True if the request fails, False otherwise
+        :rtype: boolean
+        '''
+        return self._failures > 0 and self._random.random() < self._failures
+
+    def handle_accept(self):
+        '''
+        Accepts a new client connection.
+        '''
+        channel, addr = self.accept()
+        return self.handlerClass(channel, addr, self)
+
+    def onError(self, exception):
+        '''
+        Logs the given exception.
+        '''
+        log.error(exception)
+
+    def serve(self, timeout=0.05):
+        '''
+        Runs a loop of the daemon till it is stopped.
+
+        :param timeout: A maximum time of waiting for socket events in seconds
+        :type timeout: float
+        '''
+        self._running = True
+        map = self._map
+        while self._running and map:
+            now = time.time()
+            wait = timeout
+            for channel in map.values():
+                if isinstance(channel, SimulatedHandler):
+                    due = channel.flush(now)
+                    if due is not None:
+                        wait = min(wait, max(0.0, due - now))
+            try:
+                asyncore.loop(wait, map=map, count=1)
+            except select.error:
+                pass
+
+    def start(self):
+        '''
+        Starts the loop of the daemon in a thread.
+        '''
+        self._thread = threading.Thread(target=self.serve,
+                                        name="Simulated Daemon Thread")
+        self._thread.setDaemon(True)
+        self._thread.start()
+
+    def stop(self):
+        '''
+        Stops the loop of the daemon and closes all connections.
+        '''
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for channel in self._map.values():
+            if channel is not self:
+                channel.close()
+        self.disconnect()
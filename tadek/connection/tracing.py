@@ -0,0 +1,272 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import math
+import time
+import itertools
+
+__all__ = ["STAGES", "Span", "Histogram", "Tracer"]
+
+#: A time of creating a request
+STAGE_CREATED = "created"
+#: A time of marshaling a request
+STAGE_MARSHALLED = "marshalled"
+#: A time of pushing a request to a client channel
+STAGE_PUSHED = "pushed"
+#: A time of sending the last byte of a request
+STAGE_SENT = "sent"
+#: A time of receiving a whole response
+STAGE_FRAMED = "framed"
+#: A time of parsing a response
+STAGE_PARSED = "parsed"
+#: A time of getting a response from a client queue
+STAGE_DEQUEUED = "dequeued"
+
+#: Stages of requests in order
+STAGES = (
+    STAGE_CREATED,
+    STAGE_MARSHALLED,
+    STAGE_PUSHED,
+    STAGE_SENT,
+    STAGE_FRAMED,
+    STAGE_PARSED,
+    STAGE_DEQUEUED
+)
+
+_STAGE_INDEXES = dict([(stage, i) for i, stage in enumerate(STAGES)])
+
+class Span(object):
+    '''
+    A class of timing spans of requests. Times of stages not reached are
+    None.
+    '''
+    __slots__ = ("id", "target", "name", "stamps")
+
+    def __init__(self, id, target, name):
+        self.id = id
+        self.target = target
+        self.name = name
+        self.stamps = [None] * len(STAGES)
+
+    def stamp(self, stage):
+        '''
+        Returns a time of the given stage.
+
+        :param stage: A name of the stage
+        :type stage: string
+        :return: A time or None
+        :rtype: float
+        '''
+        return self.stamps[_STAGE_INDEXES[stage]]
+
+    def durations(self):
+        '''
+        Returns a dictionary of durations of reached stages since a previous
+        reached ones and the total duration of the request.
+
+        :return: A dictionary of durations in seconds by stage names
+        :rtype: dictionary
+        '''
+        durations = {}
+        previous = None
+        for stage, stamp in zip(STAGES, self.stamps):
+            if stamp is None:
+                continue
+            if previous is not None:
+                durations[stage] = stamp - previous
+            previous = stamp
+        first = [s for s in self.stamps if s is not None]
+        if first:
+            durations["total"] = previous - first[0]
+        return durations
+
+
+class Histogram(object):
+    '''
+    A class of histograms of durations with buckets of powers of two
+    microseconds.
+    '''
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = {}
+
+    def add(self, value):
+        '''
+        Adds the given duration.
+
+        :param value: A duration in seconds
+        :type value: float
+        '''
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        us = value * 1000000
+        bucket = int(math.ceil(math.log(us, 2))) if us > 1 else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def mean(self):
+        '''
+        Returns the mean duration.
+        '''
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent):
+        '''
+        Returns an upper bound of the given percentile of durations.
+
+        :param percent: A percentile from 0 to 100
+        :type percent: float
+        :return: A duration in seconds
+        :rtype: float
+        '''
+        rank = int(math.ceil(percent / 100.0 * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(2 ** bucket / 1000000.0, self.max)
+        return self.max
+
+
+class Tracer(object):
+    '''
+    A class of tracers of requests of a client. Spans of finished requests
+    are stored in a ring buffer of a fixed size. Writing to the buffer takes
+    no locks, a slot is chosen by an atomic counter and reading it takes
+    a snapshot.
+    '''
+    def __init__(self, size=1024, hook=None):
+        '''
+        Initializes the tracer.
+
+        :param size: A number of the latest spans kept
+        :type size: integer
+        :param hook: A function called with each finished span, e.g. to
+            export it
+        :type hook: function
+        '''
+        self.size = size
+        self.hook = hook
+        self._ring = [None] * size
+        self._counter = itertools.count()
+        # Spans of requests in progress by ids
+        self._active = {}
+        # Ids of requests pushed, but not sent entirely
+        self._unsent = []
+
+    def begin(self, request, stamp=None):
+        '''
+        Starts a span of the given request, unless it is started already.
+
+        :param request: A created request
+        :type request: tadek.connection.protocol.Request
+        :param stamp: A time of creating the request, now if None
+        :type stamp: float
+        '''
+        if request.id in self._active:
+            return
+        if len(self._active) >= self.size:
+            # Drop the oldest span of a request that has never been answered
+            self._active.pop(min(self._active.keys()), None)
+        span = Span(request.id, request.target, request.name)
+        span.stamps[0] = time.time() if stamp is None else stamp
+        self._active[request.id] = span
+
+    def mark(self, id, stage, stamp=None):
+        '''
+        Marks the given stage of a request of the specified id. A span of
+        the request is finished when its response is dequeued.
+
+        :param id: An id of the request
+        :type id: integer
+        :param stage: A name of the stage
+        :type stage: string
+        :param stamp: A time of the stage, now if None
+        :type stamp: float
+        '''
+        span = self._active.get(id)
+        if span is None:
+            return
+        span.stamps[_STAGE_INDEXES[stage]] = (time.time() if stamp is None
+                                                            else stamp)
+        if stage == STAGE_DEQUEUED:
+            self._active.pop(id, None)
+            self._ring[self._counter.next() % self.size] = span
+            if self.hook is not None:
+                self.hook(span)
+
+    def unsent(self, id):
+        '''
+        Notes the request of the given id is not sent entirely yet.
+        '''
+        self._unsent.append(id)
+
+    def sent(self):
+        '''
+        Marks all requests noted as not sent entirely as sent.
+        '''
+        stamp = time.time()
+        while self._unsent:
+            self.mark(self._unsent.pop(0), STAGE_SENT, stamp)
+
+    def spans(self):
+        '''
+        Returns a snapshot of spans of the latest finished requests.
+
+        :return: A list of spans
+        :rtype: list
+        '''
+        return [span for span in list(self._ring) if span is not None]
+
+    def histograms(self):
+        '''
+        Aggregates durations of stages of the latest finished requests by
+        their targets and names.
+
+        :return: A dictionary of dictionaries of histograms by stage names
+            by (target, name) tuples
+        :rtype: dictionary
+        '''
+        histograms = {}
+        for span in self.spans():
+            stages = histograms.setdefault((span.target, span.name), {})
+            for stage, duration in span.durations().iteritems():
+                if stage not in stages:
+                    stages[stage] = Histogram()
+                stages[stage].add(duration)
+        return histograms
@@ -35,7 +35,10 @@
 ################################################################################
 
 import os
+import time
+import atexit
 import shutil
+import itertools
 import ConfigParser
 
 #import tadek
@@ -83,6 +86,10 @@ _CONF_FILE_EXT = ".conf"
 _CONF_COMMON_NAME = "common"
 # A root directory for user configuration
 _USER_CONF_DIR = os.path.join(USER_DIR, "config")
+# A minimal interval in seconds between checks of configuration files changes
+_MTIME_CHECK_INTERVAL = 1.0
+# A source of configuration versions
+_versions = itertools.count()
 
 # A current run program name
 _programName = None
@@ -134,12 +141,55 @@ class Config(object):
     _LIST_ITEM_SEPARATOR = ','
 
     def __init__(self, filename, dirname):
+        self.filename = filename
+        self.dirname = dirname
         self.file = os.path.join(_USER_CONF_DIR, dirname, filename)
+        self._files = (os.path.join(CONF_DIR, dirname, filename), self.file)
         self._readbuf = ConfigParser.ConfigParser()
-        self._readbuf.read([os.path.join(CONF_DIR, dirname, filename),
-                            self.file])
+        self._readbuf.read(self._files)
         self._writebuf = ConfigParser.ConfigParser()
         self._writebuf.read(self.file)
+        # A version that changes with every change of the configuration
+        self.version = _versions.next()
+        # Indicates if the configuration has changes not written to the file
+        self.dirty = False
+        self._stamps = self._fileStamps()
+        self._checked = time.time()
+
+    def _fileStamps(self):
+        '''
+        Returns modification times and sizes of the configuration files.
+        '''
+        stamps = []
+        for file in self._files:
+            try:
+                st = os.stat(file)
+                stamps.append((st.st_mtime, st.st_size))
+            except OSError:
+                stamps.append(None)
+        return stamps
+
+    def _changed(self):
+        '''
+        Marks the configuration as changed in memory.
+        '''
+        self.version = _versions.next()
+        self.dirty = True
+
+    def isModified(self):
+        '''
+        Checks if the configuration files were modified on disk since they
+        were read or written. Files are checked at most once in the interval
+        of _MTIME_CHECK_INTERVAL seconds.
+
+        :return: True if the configuration files were modified, False otherwise
+        :rtype: boolean
+        '''
+        now = time.time()
+        if now - self._checked < _MTIME_CHECK_INTERVAL:
+            return False
+        self._checked = now
+        return self._fileStamps() != self._stamps
 
     def update(self, file):
         '''
@@ -151,6 +201,7 @@ class Config(object):
         #self.file = file
         self._readbuf.read(file)
         self._writebuf.read(file)
+        self.version = _versions.next()
 
     def hasSection(self, section):
         '''
@@ -183,6 +234,7 @@ class Config(object):
         if not self.hasSection(section):
             self._readbuf.add_section(section)
             self._writebuf.add_section(section)
+            self._changed()
 
     def removeSection(self, section):
         '''
@@ -196,6 +248,7 @@ class Config(object):
             self._readbuf.remove_section(section)
             if self._writebuf.has_section(section):
                 self._writebuf.remove_section(section)
+            self._changed()
 
     def hasOption(self, section, option):
         '''
@@ -251,6 +304,7 @@ class Config(object):
             self._readbuf.remove_option(section, option)
             if self._writebuf.has_option(section, option):
                 self._writebuf.remove_option(section, option)
+            self._changed()
 
     def getValue(self, section, option):
         '''
@@ -346,6 +400,7 @@ class Config(object):
         if not self._writebuf.has_section(section):
             self._writebuf.add_section(section)
         self._writebuf.set(section, option, str(value))
+        self._changed()
 
     def write(self):
         '''
@@ -358,6 +413,8 @@ class Config(object):
         finally:
             if fd:
                 fd.close()
+        self.dirty = False
+        self._stamps = self._fileStamps()
 
 
 # A list of all available configuration directories
@@ -413,6 +470,8 @@ def _getConfigCache():
 def _getConfig(name, force=True):
     '''
     Returns configuration cached in a dictionary of the given name.
+    The configuration is read again if its files were modified on disk
+    and it has no changes that are not written yet.
     '''
     configs = _getConfigCache()
     if name not in configs:
@@ -420,7 +479,10 @@ def _getConfig(name, force=True):
             return None
         configs[name] = Config(name + _CONF_FILE_EXT,
                                getProgramName() or _CONF_COMMON_NAME)
-    return configs[name]
+    config = configs[name]
+    if not config.dirty and config.isModified():
+        config = configs[name] = Config(config.filename, config.dirname)
+    return config
 
 def update(name, file):
     '''
@@ -537,7 +599,7 @@ def getList(name, section, option, default=None):
         value = config.getListValue(section, option)
     return value if value is not None else default
 
-def set(name, section=None, option=None, value=None):
+def set(name, section=None, option=None, value=None, write=True):
     '''
     Sets different values depending on number of given arguments:
       - if configuration name, section, option and value are given then sets
@@ -557,6 +619,9 @@ def set(name, section=None, option=None, value=None):
     :type option: string
     :param value: The new value of the specific option
     :type value: string or integer or boolean
+    :param write: If False then writing of the configuration file is deferred
+        till the next write or flush() call
+    :type write: boolean
     '''
     config = _getConfig(name)
     if value is not None:
@@ -565,7 +630,8 @@ def set(name, section=None, option=None, value=None):
         config.addOption(section, option)
     elif section:
         config.addSection(section)
-    config.write()
+    if write:
+        config.write()
 
 def remove(name, section=None, option=None):
     '''
@@ -602,6 +668,33 @@ def remove(name, section=None, option=None):
     if config:
         config.write()
 
+def version(name):
+    '''
+    Returns a version of configuration of the given name that changes every
+    time the configuration is changed or read again.
+
+    :param name: A name of configuration
+    :type name: string
+    :return: A version of the configuration or None if it does not exist
+    :rtype: integer
+    '''
+    config = _getConfig(name, force=False)
+    if config is None:
+        return None
+    return config.version
+
+def flush():
+    '''
+    Writes all configurations that have changes not written yet.
+    '''
+    if _configCache is None:
+        return
+    for config in _configCache.values():
+        if config.dirty:
+            config.write()
+
+atexit.register(flush)
+
 def reset():
     '''
     Resets (removes recursively) user configuration.
@@ -0,0 +1,328 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+import mmap
+import struct
+from xml.etree import cElementTree as etree
+
+from tadek.connection import protocol
+from tadek.core import search
+from tadek.core.accessible import Path, Accessible
+
+__all__ = ["DumpIndex", "convert", "isDump", "loadXml", "openIndex"]
+
+# A magic string that starts dump files
+MAGIC = "TADEKDMP"
+# A version of the dump file format
+VERSION = 1
+
+# A header: the magic string, a format version and a number of nodes
+_HEADER = struct.Struct(">8sII")
+# A node entry: an offset and a length of marshaled accessible, a number of
+# the first child entry, a number of children and an index of the accessible
+_ENTRY = struct.Struct(">QIIIi")
+
+# A maximum number of decoded accessibles kept in a cache
+_MAX_CACHE = 4096
+
+def isDump(file):
+    '''
+    Checks if the given file is an accessible tree dump of the compact format.
+
+    :param file: A path to the file
+    :type file: string
+    :return: True if the file is a compact dump, False otherwise
+    :rtype: boolean
+    '''
+    fd = open(file, "rb")
+    try:
+        return fd.read(len(MAGIC)) == MAGIC
+    finally:
+        fd.close()
+
+def loadXml(file):
+    '''
+    Loads an accessible tree dumped to the given XML file. If the dumped
+    accessible is not a root one then it becomes the first child of a fake
+    root accessible.
+
+    :param file: A path to the XML file
+    :type file: string
+    :return: A root accessible of the loaded tree
+    :rtype: tadek.core.accessible.Accessible
+    '''
+    def setPath(acc, parentPath=None):
+        if parentPath is None:
+            acc.path = Path()
+        else:
+            acc.path = parentPath.child(acc.index)
+        for child in acc.children(force=False):
+            setPath(child, acc.path)
+
+    element = etree.ElementTree(file=file).getroot()
+    acc = Accessible.unmarshal(element)
+    if not acc.path.tuple:
+        root = acc
+    else:
+        root = Accessible(Path(), children=(acc,))
+    acc.index = 0
+    setPath(root)
+    return root
+
+def openIndex(file):
+    '''
+    Opens an index of an accessible tree dumped to the given file of
+    the compact or XML format.
+
+    :param file: A path to the dump file
+    :type file: string
+    :return: An index of the dumped tree
+    :rtype: DumpIndex or tadek.core.search.AccessibleIndex
+    '''
+    if isDump(file):
+        return DumpIndex(file)
+    return search.AccessibleIndex(loadXml(file))
+
+def _strip(element):
+    '''
+    Returns the given marshaled accessible as a string without its children
+    and a list of the children elements.
+    '''
+    children = element.find("children")
+    elements = list(children)
+    for child in elements:
+        children.remove(child)
+    data = etree.tostring(element, "utf-8")
+    children.extend(elements)
+    return data, elements
+
+def convert(src, dst):
+    '''
+    Converts an accessible tree dumped to the given XML file to a dump file
+    of the compact format.
+
+    Nodes are stored level by level, so children of each node are stored
+    in consecutive entries of a table of fixed size entries, that is followed
+    by marshaled accessibles without their children.
+
+    :param src: A path to the XML file
+    :type src: string
+    :param dst: A path to the compact dump file to write
+    :type dst: string
+    '''
+    element = etree.ElementTree(file=src).getroot()
+    if Path.unmarshal(element.find("path")).tuple:
+        # The dumped accessible becomes the first child of a fake root
+        path = element.find("path")
+        path.clear()
+        Path(0).marshal(path)
+        root = Accessible(Path())
+        root.count = 1
+        fake = root.marshal()
+        fake.find("children").append(element)
+        element = fake
+    entries = []
+    records = []
+    offset = 0
+    queue = [(element, -1)]
+    while queue:
+        element, index = queue.pop(0)
+        data, children = _strip(element)
+        entries.append([offset, len(data), 0, len(children), index])
+        records.append(data)
+        offset += len(data)
+        for i, child in enumerate(children):
+            path = Path.unmarshal(child.find("path")).tuple
+            queue.append((child, path[-1] if path else i))
+    # Children of each node follow children of nodes preceding it
+    first = 1
+    for entry in entries:
+        entry[2] = first
+        first += entry[3]
+    base = _HEADER.size + _ENTRY.size * len(entries)
+    fd = open(dst, "wb")
+    try:
+        fd.write(_HEADER.pack(MAGIC, VERSION, len(entries)))
+        for offset, length, first, count, index in entries:
+            fd.write(_ENTRY.pack(base + offset, length, first, count, index))
+        for data in records:
+            fd.write(data)
+    finally:
+        fd.close()
+
+
+class DumpIndex(object):
+    '''
+    A class of indexes of accessible trees dumped to files of the compact
+    format. A dump file is memory-mapped and accessibles are decoded on demand
+    when they are got by paths or iterated by searches.
+    '''
+    def __init__(self, file):
+        '''
+        Opens the given dump file.
+
+        :param file: A path to the dump file
+        :type file: string
+        '''
+        fd = open(file, "rb")
+        try:
+            self._map = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            fd.close()
+        magic, version, self._count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError("Invalid dump file: %s" % file)
+        # Decoded accessibles and numbers of their entries by path tuples
+        self._cache = {}
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        '''
+        Closes the dump file.
+        '''
+        self._cache = {}
+        self._map.close()
+
+    def _entry(self, n):
+        '''
+        Returns the entry of the given number.
+        '''
+        return _ENTRY.unpack_from(self._map, _HEADER.size + _ENTRY.size * n)
+
+    def _node(self, n, path):
+        '''
+        Returns a decoded accessible of the given entry number and path, and
+        the entry.
+        '''
+        cached = self._cache.get(path.tuple)
+        if cached is not None:
+            return cached
+        entry = self._entry(n)
+        offset, length = entry[:2]
+        accessible = Accessible.unmarshal(
+                        etree.fromstring(self._map[offset:offset+length]))
+        accessible.path = path
+        accessible.index = path.index()
+        accessible.parent = path.parent()
+        if len(self._cache) >= _MAX_CACHE:
+            self._cache.clear()
+        cached = self._cache[path.tuple] = (accessible, entry)
+        return cached
+
+    def _children(self, accessible):
+        '''
+        Returns a list of numbers and paths of entries of children of
+        the given decoded accessible.
+        '''
+        cached = self._cache.get(accessible.path.tuple)
+        if cached is None or cached[0] is not accessible:
+            cached = self._find(accessible.path)
+            if cached is None:
+                return []
+        first, count = cached[1][2:4]
+        children = []
+        for n in xrange(first, first + count):
+            index = self._entry(n)[4]
+            children.append((n, accessible.path.child(index)))
+        return children
+
+    def _find(self, path):
+        '''
+        Finds a decoded accessible of the given path and its entry.
+        '''
+        cached = self._cache.get(path.tuple)
+        if cached is not None:
+            return cached
+        if not self._count:
+            return None
+        n = 0
+        entry = self._entry(n)
+        for idx in path.tuple:
+            first, count = entry[2:4]
+            # Indexes of children are usually their positions
+            candidates = [first + idx] if idx < count else []
+            candidates.extend(xrange(first, first + count))
+            for n in candidates:
+                entry = self._entry(n)
+                if entry[4] == idx:
+                    break
+            else:
+                return None
+        return self._node(n, Path(*path.tuple))
+
+    def get(self, path):
+        '''
+        Gets an accessible of the given path. The accessible has no children
+        fetched, they can be got by their paths.
+
+        :param path: A path of the accessible
+        :type path: tadek.core.accessible.Path
+        :return: An accessible or None if there is no accessible of the path
+        :rtype: tadek.core.accessible.Accessible
+        '''
+        found = self._find(path)
+        return found[0] if found is not None else None
+
+    def iterate(self, accessible, method, predicates):
+        '''
+        An iterator that yields one decoded accessible to check according to
+        the given search method per iteration.
+
+        :param accessible: The starting point accessible
+        :type accessible: tadek.core.accessible.Accessible
+        :param method: A search method
+        :type method: string
+        :param predicates: A dictionary of search predicates
+        :type predicates: dictionary
+        '''
+        if method == protocol.MHD_SEARCH_SIMPLE:
+            for n, path in self._children(accessible):
+                yield self._node(n, path)[0]
+        elif method == protocol.MHD_SEARCH_BACKWARDS:
+            children = self._children(accessible)
+            children.reverse()
+            for n, path in children:
+                yield self._node(n, path)[0]
+        elif method == protocol.MHD_SEARCH_DEEP:
+            # Level by level
+            queue = [accessible]
+            while queue:
+                for n, path in self._children(queue.pop(0)):
+                    child = self._node(n, path)[0]
+                    yield child
+                    queue.append(child)
@@ -39,33 +39,58 @@ import gettext as gt
 
 from tadek.core import config
 from tadek.core import constants
+from tadek.core import timing
 from tadek.core import utils
 
 __all__ = ["gettext", "gettext__", "ngettext", "ngettext__", "escape"]
 
-def add(path):
+def _add(path):
     '''
-    Adds the given path locale.
+    Adds the given path locale without refreshing merged catalogs.
     '''
+    global _changes
     if os.path.isdir(path) and path not in _cache:
         _cache[path] = {}
+        _changes += 1
+        return True
+    return False
+
+def add(path):
+    '''
+    Adds the given path locale.
+    '''
+    if _add(path):
+        _refresh()
 
 def remove(path):
     '''
     Removes the given path locale.
     '''
+    global _changes
     if path in _cache:
         del _cache[path]
+        _changes += 1
+        _refresh()
 
 def reset():
     '''
     Resets all cached translations.
     '''
+    global _changes
     paths = _cache.keys()
     _cache.clear()
     for path in paths:
-        add(path)
+        _add(path)
     _default.clear()
+    _changes += 1
+    _refresh()
+
+def changes():
+    '''
+    Returns a number of changes of locale paths and cached translations. It
+    can be used to invalidate translations cached outside the module.
+    '''
+    return _changes
 
 
 # TODO: Add support for any domain (*.mo)
@@ -76,6 +101,14 @@ _DEFAULT_PATH = os.path.join(config.DATA_DIR, "locale")
 # A translations caches
 _cache = {}
 _default = {}
+# Merged catalogs of translations of all locale paths by languages
+_catalogs = {}
+# A memo of plural translations by languages and messages
+_memo = {}
+# A maximum size of the memo of plural translations
+_MAX_MEMO = 4096
+# A number of changes of locale paths and translations caches
+_changes = 0
 
 def _language(path, mofile):
     '''
@@ -110,17 +143,51 @@ def _translation(path, lang, cache=None):
         trans = gt.NullTranslations()
     return cache.setdefault(lang, trans)
 
-def _translations(device):
+def _translations(lang):
     '''
-    An iterator that yields one translation for the given device per iteration.
+    An iterator that yields one translation for the given language per
+    iteration.
     '''
-    lang = device.locale
     if lang and lang.upper() != 'C':
         for path in _cache:
             yield _translation(path, lang)
         if os.path.isdir(_DEFAULT_PATH):
             yield _translation(_DEFAULT_PATH, lang, _default)
 
+def _catalog(lang):
+    '''
+    Returns a catalog of translations of messages for the given language
+    merged from translations of all locale paths and their fallbacks in
+    order of lookup. Messages translated to themselves are omitted.
+    '''
+    catalog = _catalogs.get(lang)
+    if catalog is not None:
+        return catalog
+    catalog = {}
+    for trans in _translations(lang):
+        merged = {}
+        while trans is not None:
+            for msgid, tmsg in getattr(trans, "_catalog", {}).iteritems():
+                # Skip plural forms stored by (msgid, index) keys
+                if not isinstance(msgid, tuple):
+                    merged.setdefault(msgid, tmsg)
+            trans = getattr(trans, "_fallback", None)
+        for msgid, tmsg in merged.iteritems():
+            if tmsg != msgid:
+                catalog.setdefault(msgid, tmsg)
+    return _catalogs.setdefault(lang, catalog)
+
+def _refresh():
+    '''
+    Rebuilds merged catalogs of already used languages and clears the memo
+    of plural translations.
+    '''
+    langs = _catalogs.keys()
+    _catalogs.clear()
+    _memo.clear()
+    for lang in langs:
+        _catalog(lang)
+
 def _nmessage(singular, plural, n):
     '''
     Returns the given singular or plural message depending on the n value.
@@ -132,13 +199,19 @@ def gettext(message, device):
     '''
     Gets a translation for the given message using locale of the device.
     '''
-    if isinstance(message, MessageProxy):
-        return message(device)
-    for trans in _translations(device):
-        tmsg = trans.ugettext(message)
-        if tmsg != message:
-            return tmsg
-    return message
+    profile = timing.current()
+    if profile is not None:
+        stamp = profile.enter(timing.CATEGORY_TRANSLATION)
+    try:
+        if isinstance(message, MessageProxy):
+            return message(device)
+        lang = device.locale
+        if not lang or lang.upper() == 'C':
+            return message
+        return _catalog(lang).get(message, message)
+    finally:
+        if profile is not None:
+            profile.leave(timing.CATEGORY_TRANSLATION, stamp)
 
 def gettext__(message):
     '''
@@ -151,11 +224,27 @@ def ngettext(singular, plural, n, device):
     Gets a translation for the given singular message if n is equals to 1,
     otherwise for the specified plural message using locale of the device.
     '''
-    for trans in _translations(device):
-        tmsg = trans.ungettext(singular, plural, n)
-        if tmsg not in (singular, plural):
+    profile = timing.current()
+    if profile is not None:
+        stamp = profile.enter(timing.CATEGORY_TRANSLATION)
+    try:
+        key = (device.locale, singular, plural, n)
+        tmsg = _memo.get(key)
+        if tmsg is not None:
             return tmsg
-    return _nmessage(singular, plural, n)
+        for trans in _translations(device.locale):
+            tmsg = trans.ungettext(singular, plural, n)
+            if tmsg not in (singular, plural):
+                break
+        else:
+            tmsg = _nmessage(singular, plural, n)
+        if len(_memo) >= _MAX_MEMO:
+            _memo.clear()
+        _memo[key] = tmsg
+        return tmsg
+    finally:
+        if profile is not None:
+            profile.leave(timing.CATEGORY_TRANSLATION, stamp)
 
 def ngettext__(singular, plural, n):
     '''
@@ -168,7 +257,16 @@ def escape(message, device):
     '''
     Escapes the given lazy translated message if needed.
     '''
-    return message(device) if isinstance(message, MessageProxy) else message
+    if not isinstance(message, MessageProxy):
+        return message
+    profile = timing.current()
+    if profile is None:
+        return message(device)
+    stamp = profile.enter(timing.CATEGORY_TRANSLATION)
+    try:
+        return message(device)
+    finally:
+        profile.leave(timing.CATEGORY_TRANSLATION, stamp)
 
 
 class MessageProxy(object):
@@ -36,11 +36,15 @@
 
 import os
 import sys
+import json
+import time
+import atexit
 
 from tadek import models
 from tadek import teststeps
 from tadek import testcases
 from tadek import testsuites
+from tadek.core import config
 from tadek.core import locale
 from tadek.core.structs import ErrorBox
 
@@ -142,9 +146,74 @@ def clear():
     '''
     for module in _DIRS_MAP.itervalues():
         _clearModule(module)
+    _imported.clear()
+
+def refresh():
+    '''
+    Clears imported modules from all locations if any of them has changed or
+    has not been stamped by stampModules() since it was imported. Test suite
+    modules may import other test suite modules, so if only test suites have
+    changed, all test suite modules are cleared while models, test steps and
+    test cases are kept.
+    '''
+    changed = []
+    for name, path in _locationModules():
+        if name not in _imported or _imported[name] != _mtime(path):
+            changed.append(name)
+    if not changed:
+        return
+    prefix = testsuites.__name__ + '.'
+    if [name for name in changed if not name.startswith(prefix)]:
+        clear()
+        return
+    _clearModule(testsuites)
+    for name in _imported.keys():
+        if name.startswith(prefix):
+            del _imported[name]
+
+def stampModules():
+    '''
+    Notes modification times of source files of all imported modules from
+    locations, so refresh() clears only those changed since then.
+    '''
+    for name, path in _locationModules():
+        if name not in _imported:
+            _imported[name] = _mtime(path)
 
 # A locations cache
 _cache = {}
+# Modification times of source files of imported modules by their names
+_imported = {}
+
+def _mtime(path):
+    '''
+    Returns a modification time of the given path or None if it does not
+    exist.
+    '''
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+def _locationModules():
+    '''
+    Returns a list of names and source file paths of imported modules from
+    locations.
+    '''
+    modules = []
+    for package in _DIRS_MAP.itervalues():
+        prefix = package.__name__ + '.'
+        for name, module in sys.modules.items():
+            if module is None or not name.startswith(prefix):
+                continue
+            path = getattr(module, "__file__", None)
+            if not path:
+                continue
+            base, ext = os.path.splitext(path)
+            if ext in (".pyc", ".pyo") and os.path.exists(base + ".py"):
+                path = base + ".py"
+            modules.append((name, path))
+    return modules
 
 
 # Location directories oriented functions:
@@ -196,14 +265,169 @@ def getSuites():
     content.pop("__init__", None)
     return content
 
+def getSuiteNames(path):
+    '''
+    Gets names of test suites of a module of the given path from
+    the discovery index.
 
-_MODULE_EXTS = (".py", ".pyc", ".pyo")
+    :param path: A path to the module file
+    :type path: string
+    :return: A list of names or None if the module is not indexed or has
+        changed since it was indexed
+    :rtype: list
+    '''
+    return _index.suites(path)
+
+def setSuiteNames(path, names):
+    '''
+    Sets names of test suites of a module of the given path in the discovery
+    index.
 
-def _getDirContent(dir, package=None):
+    :param path: A path to the module file
+    :type path: string
+    :param names: A list of names of test suites
+    :type names: list
     '''
-    Gets content of the given directory.
+    _index.setSuites(path, names)
+
+
+_MODULE_EXTS = (".py", ".pyc", ".pyo")
+# A minimal age in seconds of directory modification times trusted by
+# the discovery index, younger ones may not reflect the latest changes
+_MTIME_RESOLUTION = 2.0
+
+class DiscoveryIndex(object):
+    '''
+    A class of persistent indexes of location directories. A content of
+    a directory is kept together with modification times of the directory
+    and all its listed subdirectories, so it is listed again only if
+    a module or a package is added or removed. Names of test suites of
+    modules are kept together with modification times of module files.
+    '''
+    #: A version of the index file format
+    version = 2
+
+    def __init__(self, file=None):
+        '''
+        Loads the index from the given file if any.
+
+        :param file: A path to the index file or None
+        :type file: string
+        '''
+        self.file = file
+        self.dirty = False
+        # Modification times of subdirectories and contents by directories
+        self._dirs = {}
+        # Modification times and names of test suites by module files
+        self._modules = {}
+        if file is not None:
+            self.load()
+
+    def load(self):
+        '''
+        Loads the index from its file, a missing or an invalid file is
+        ignored.
+        '''
+        try:
+            fd = open(self.file)
+            try:
+                data = json.load(fd)
+            finally:
+                fd.close()
+            if data.get("version") == self.version:
+                self._dirs = data["dirs"]
+                self._modules = data["modules"]
+        except (IOError, ValueError, KeyError, AttributeError):
+            pass
+
+    def save(self):
+        '''
+        Saves the index to its file if it has changed.
+        '''
+        if self.file is None or not self.dirty:
+            return
+        try:
+            dirname = os.path.dirname(self.file)
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            fd = open(self.file, 'w')
+            try:
+                json.dump({"version": self.version, "dirs": self._dirs,
+                           "modules": self._modules}, fd)
+            finally:
+                fd.close()
+            self.dirty = False
+        except (IOError, OSError):
+            pass
+
+    def content(self, dir):
+        '''
+        Gets content of the given directory as a dictionary of module names
+        and paths.
+
+        :param dir: A path to the directory
+        :type dir: string
+        :return: A dictionary of paths by module names
+        :rtype: dictionary
+        '''
+        entry = self._dirs.get(dir)
+        if entry is not None:
+            stamps, content = entry
+            for path, mtime in stamps.iteritems():
+                if mtime is None or _mtime(path) != mtime:
+                    break
+            else:
+                return dict(content)
+        stamps = {}
+        content = _getDirContent(dir, stamps=stamps)
+        now = time.time()
+        for path, mtime in stamps.items():
+            if mtime is not None and now - mtime < _MTIME_RESOLUTION:
+                stamps[path] = None
+        self._dirs[dir] = (stamps, content)
+        self.dirty = True
+        return dict(content)
+
+    def suites(self, path):
+        '''
+        Gets names of test suites of a module of the given path.
+
+        :param path: A path to the module file
+        :type path: string
+        :return: A list of names or None if the module is not indexed or has
+            changed since it was indexed
+        :rtype: list
+        '''
+        entry = self._modules.get(path)
+        if entry is None or entry[0] is None or entry[0] != _mtime(path):
+            return None
+        return list(entry[1])
+
+    def setSuites(self, path, names):
+        '''
+        Sets names of test suites of a module of the given path.
+
+        :param path: A path to the module file
+        :type path: string
+        :param names: A list of names of test suites
+        :type names: list
+        '''
+        mtime = _mtime(path)
+        if mtime is not None and time.time() - mtime < _MTIME_RESOLUTION:
+            mtime = None
+        self._modules[path] = (mtime, list(names))
+        self.dirty = True
+
+
+def _getDirContent(dir, package=None, stamps=None):
+    '''
+    Gets content of the given directory. If a dictionary of stamps is given,
+    modification times of the directory, of all its subdirectories, either
+    packages or not, and of subdirectories of its packages are put to it.
     '''
     content = {}
+    if stamps is not None:
+        stamps[dir] = _mtime(dir)
     for file in sorted(os.listdir(dir)):
         name = None
         path = os.path.join(dir, file)
@@ -219,9 +443,12 @@ def _getDirContent(dir, package=None):
                     pkg = True
                     break
             if not pkg:
+                # It may become a package by adding an '__init__' module
+                if stamps is not None:
+                    stamps[path] = _mtime(path)
                 continue
             name = '.'.join([package, file]) if package else file
-            content.update(_getDirContent(path, name))
+            content.update(_getDirContent(path, name, stamps))
             path = os.path.join(path, "__init__" + ext)
         if name and name not in content:
             content[name] = path
@@ -233,7 +460,7 @@ def _getModuleContent(module):
     '''
     content = {}
     for path in module.__path__:
-        for name, path in _getDirContent(path).iteritems():
+        for name, path in _index.content(path).iteritems():
             if name not in content:
                 content[name] = path
     return content
@@ -246,7 +473,7 @@ def _addModuleDir(module, path):
     if not os.path.isdir(path) or path is module.__path__:
         return errors
     content = _getModuleContent(module)
-    for name in _getDirContent(path):
+    for name in _index.content(path):
         try:
             if name in content:
                 raise NameConflictError(module, name)
@@ -264,7 +491,7 @@ def _clearModule(module, path=None):
     if not path:
         patterns.append(module.__name__ + '.')
     elif path in module.__path__:
-        for name in _getDirContent(path):
+        for name in _index.content(path):
             patterns.append('.'.join([module.__name__, name]))
     for name in sys.modules.keys():
         for pattern in patterns:
@@ -281,3 +508,10 @@ def _removeModuleDir(module, path):
     _clearModule(module, path)
     module.__path__.remove(path)
 
+
+# A path to the file of the discovery index
+_INDEX_FILE = os.path.join(config.USER_DIR, "cache", "discovery.json")
+# A discovery index of location directories
+_index = DiscoveryIndex(_INDEX_FILE)
+
+atexit.register(_index.save)
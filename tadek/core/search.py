@@ -0,0 +1,300 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import re
+
+from tadek.connection import protocol
+
+__all__ = ["compilePattern", "matchValue", "match", "search", "searchAll",
+           "AccessibleIndex"]
+
+# A cache of compiled regular expressions of predicate values
+_patterns = {}
+# A maximum size of the cache of regular expressions
+_MAX_PATTERNS = 512
+
+def compilePattern(pattern):
+    '''
+    Returns a compiled regular expression of the given predicate pattern if
+    it starts with '&' character, otherwise None. Compiled regular expressions
+    are cached.
+
+    :param pattern: A predicate pattern
+    :type pattern: string
+    :return: A compiled regular expression or None
+    :rtype: re.RegexObject
+    '''
+    if not isinstance(pattern, basestring) or not pattern or pattern[0] != '&':
+        return None
+    regexp = _patterns.get(pattern)
+    if regexp is None:
+        if len(_patterns) >= _MAX_PATTERNS:
+            _patterns.clear()
+        regexp = _patterns[pattern] = re.compile(pattern[1:], re.DOTALL)
+    return regexp
+
+def matchValue(pattern, value):
+    '''
+    Checks if the given value matches the specified predicate pattern. If
+    the pattern starts with '&' character then it is a regular expression
+    that has to match the whole value.
+
+    :param pattern: A predicate pattern
+    :type pattern: string
+    :param value: A value to check
+    :type value: string
+    :return: True if the value matches the pattern, False otherwise
+    :rtype: boolean
+    '''
+    if value is None:
+        return False
+    regexp = compilePattern(pattern)
+    if regexp is not None:
+        match = regexp.match(value)
+        return bool(match) and match.span() == (0, len(value))
+    return value == pattern
+
+def match(accessible, predicates):
+    '''
+    Checks if the given accessible satisfies all the specified predicates
+    (except the 'nth' one).
+
+    :param accessible: An accessible to check
+    :type accessible: tadek.core.accessible.Accessible
+    :param predicates: A dictionary of search predicates
+    :type predicates: dictionary
+    :return: True if the accessible satisfies the predicates, False otherwise
+    :rtype: boolean
+    '''
+    for name, value in predicates.iteritems():
+        if name == "nth":
+            continue
+        elif name in ("name", "description", "text"):
+            if not matchValue(value, getattr(accessible, name)):
+                return False
+        elif name in ("role", "index", "count"):
+            if getattr(accessible, name) != value:
+                return False
+        elif name == "action":
+            if value not in accessible.actions:
+                return False
+        elif name == "relation":
+            if value not in [r.type for r in accessible.relations]:
+                return False
+        elif name == "state":
+            if value not in accessible.states:
+                return False
+        elif not matchValue(value, accessible.attributes.get(name)):
+            return False
+    return True
+
+def _iterate(accessible, method, force=True):
+    '''
+    An iterator that yields one accessible to check according to the given
+    search method per iteration.
+    '''
+    if method == protocol.MHD_SEARCH_SIMPLE:
+        for child in accessible.children(force):
+            yield child
+    elif method == protocol.MHD_SEARCH_BACKWARDS:
+        children = list(accessible.children(force))
+        children.reverse()
+        for child in children:
+            yield child
+    elif method == protocol.MHD_SEARCH_DEEP:
+        # Level by level
+        queue = [accessible]
+        while queue:
+            for child in queue.pop(0).children(force):
+                yield child
+                if child.count:
+                    queue.append(child)
+
+
+class AccessibleIndex(object):
+    '''
+    A class of indexes of accessible trees those are fully fetched, e.g.
+    loaded from dumps. Accessibles are indexed by paths, roles and names,
+    so they are got in constant time and deep searches of a role or a name
+    check only accessibles of that role or name.
+    '''
+    def __init__(self, root):
+        '''
+        Indexes the accessible tree of the given root.
+
+        :param root: A root accessible of the tree
+        :type root: tadek.core.accessible.Accessible
+        '''
+        self._paths = {}
+        self._roles = {}
+        self._names = {}
+        queue = [root]
+        while queue:
+            acc = queue.pop(0)
+            self._paths[acc.path.tuple] = acc
+            if acc is not root:
+                self._roles.setdefault(acc.role, []).append(acc)
+                if acc.name is not None:
+                    self._names.setdefault(acc.name, []).append(acc)
+            queue.extend(acc.children(force=False))
+        # Level by level order of deep searching
+        order = lambda acc: (len(acc.path.tuple), acc.path.tuple)
+        for accs in self._roles.values() + self._names.values():
+            accs.sort(key=order)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def get(self, path):
+        '''
+        Gets an accessible of the given path.
+
+        :param path: A path of the accessible
+        :type path: tadek.core.accessible.Path
+        :return: An accessible or None if there is no accessible of the path
+        :rtype: tadek.core.accessible.Accessible
+        '''
+        return self._paths.get(path.tuple)
+
+    def iterate(self, accessible, method, predicates):
+        '''
+        An iterator that yields one accessible to check according to the given
+        search method and predicates per iteration.
+
+        :param accessible: The starting point accessible
+        :type accessible: tadek.core.accessible.Accessible
+        :param method: A search method
+        :type method: string
+        :param predicates: A dictionary of search predicates
+        :type predicates: dictionary
+        '''
+        if method == protocol.MHD_SEARCH_SIMPLE:
+            for child in accessible.children(force=False):
+                yield child
+        elif method == protocol.MHD_SEARCH_BACKWARDS:
+            children = list(accessible.children(force=False))
+            children.reverse()
+            for child in children:
+                yield child
+        elif method == protocol.MHD_SEARCH_DEEP:
+            candidates = None
+            if "role" in predicates:
+                candidates = self._roles.get(predicates["role"], ())
+            name = predicates.get("name")
+            if name is not None and compilePattern(name) is None:
+                named = self._names.get(name, ())
+                if candidates is None or len(named) < len(candidates):
+                    candidates = named
+            if candidates is None:
+                for acc in _iterate(accessible, method, force=False):
+                    yield acc
+                return
+            path = accessible.path.tuple
+            n = len(path)
+            for acc in candidates:
+                if len(acc.path.tuple) > n and acc.path.tuple[:n] == path:
+                    yield acc
+
+
+def _matches(accessible, method, predicates, searchers, index=None):
+    '''
+    An iterator that yields one accessible matching the given predicates and
+    containing a structure defined by the specified searchers per iteration.
+    '''
+    if index is None:
+        accs = _iterate(accessible, method)
+    else:
+        accs = index.iterate(accessible, method, predicates)
+    for acc in accs:
+        if not match(acc, predicates):
+            continue
+        for s in searchers:
+            if search(acc, s["method"], s["predicates"],
+                      s.get("searchers", ()), index) is None:
+                break
+        else:
+            yield acc
+
+def search(accessible, method, predicates, searchers=(), index=None):
+    '''
+    Searches an accessible starting from the given one and using
+    the specified search method. If searchers are given, the searched
+    accessible is the nth root of a structure of accessibles defined by them.
+
+    :param accessible: The starting point accessible
+    :type accessible: tadek.core.accessible.Accessible
+    :param method: A search method
+    :type method: string
+    :param predicates: A dictionary of search predicates
+    :type predicates: dictionary
+    :param searchers: A list of searchers as dictionaries of a search method,
+        predicates and searchers, those define a structure
+    :type searchers: tuple
+    :param index: An index of the accessible tree to search in or None
+    :type index: AccessibleIndex
+    :return: A found accessible or None
+    :rtype: tadek.core.accessible.Accessible
+    '''
+    nth = predicates.get("nth", 0)
+    for acc in _matches(accessible, method, predicates, searchers, index):
+        if not nth:
+            return acc
+        nth -= 1
+    return None
+
+def searchAll(accessible, method, predicates, searchers=(), index=None):
+    '''
+    Searches all accessibles starting from the given one and using
+    the specified search method, and returns the nth found one and all
+    found after it.
+
+    :param accessible: The starting point accessible
+    :type accessible: tadek.core.accessible.Accessible
+    :param method: A search method
+    :type method: string
+    :param predicates: A dictionary of search predicates
+    :type predicates: dictionary
+    :param searchers: A list of searchers as dictionaries of a search method,
+        predicates and searchers, those define a structure
+    :type searchers: tuple
+    :param index: An index of the accessible tree to search in or None
+    :type index: AccessibleIndex
+    :return: A list of found accessibles
+    :rtype: list
+    '''
+    nth = predicates.get("nth", 0)
+    found = list(_matches(accessible, method, predicates, searchers, index))
+    return found[nth:]
@@ -237,6 +237,108 @@ class SettingsOption:
         config.remove(self._name, self._section, self._option)
 
 
+class SettingsSnapshot:
+    '''
+    An immutable snapshot of settings sections of a configuration.
+    '''
+    __slots__ = ("_name", "_version", "_sections")
+
+    def __init__(self, name, version, sections):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_version", version)
+        object.__setattr__(self, "_sections", sections)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SettingsSnapshot object is immutable")
+
+    def __contains__(self, section):
+        '''
+        Checks if the given section is a settings section of the snapshot.
+        '''
+        return section in self._sections
+
+    def __iter__(self):
+        '''
+        Iterates over names of settings sections of the snapshot.
+        '''
+        return iter(sorted(self._sections))
+
+    def name(self):
+        '''
+        Returns a name of the configuration.
+
+        :return: A name of the configuration
+        :rtype: string
+        '''
+        return self._name
+
+    def version(self):
+        '''
+        Returns a version of the configuration the snapshot was taken of.
+
+        :return: A configuration version
+        :rtype: integer
+        '''
+        return self._version
+
+    def options(self, section):
+        '''
+        Returns a list of option names of the given settings section.
+
+        :param section: A name of the section
+        :type section: string
+        :return: A list of option names
+        :rtype: list
+        '''
+        return sorted(self._sections.get(section, ()))
+
+    def get(self, section, option, default=None):
+        '''
+        Returns a value of the given settings option.
+
+        :param section: A name of the section
+        :type section: string
+        :param option: A name of the option
+        :type option: string
+        :param default: A value returned if the option does not exist
+        :type default: string
+        :return: A value of the option
+        :rtype: string
+        '''
+        value = self._sections.get(section, {}).get(option)
+        return value if value is not None else default
+
+
+# A cache of settings snapshots by configuration names
+_snapshots = {}
+
+def snapshot(name):
+    '''
+    Returns an immutable snapshot of settings sections of the configuration
+    of the given name. Snapshots are cached till the configuration changes.
+
+    :param name: A name of configuration
+    :type name: string
+    :return: A snapshot of settings
+    :rtype: SettingsSnapshot
+    '''
+    version = config.version(name)
+    snap = _snapshots.get(name)
+    if snap is not None and snap.version() == version:
+        return snap
+    sections = {}
+    if version is not None:
+        for section in config.get(name):
+            if (config.get(name, section, _META_OPTION_NAME)
+                == _META_OPTION_VALUE):
+                options = {}
+                for option in config.get(name, section):
+                    if option != _META_OPTION_NAME:
+                        options[option] = config.get(name, section, option)
+                sections[section] = options
+    snap = _snapshots[name] = SettingsSnapshot(name, version, sections)
+    return snap
+
 def _isSettings(name, section=None, option=None):
     '''
     Checks if the given configuration or section, or option is a settings.
@@ -244,17 +346,18 @@ def _isSettings(name, section=None, option=None):
     if option and option == _META_OPTION_NAME:
         return False
     if section:
-        return config.get(name, section, _META_OPTION_NAME)== _META_OPTION_VALUE
-    for section in config.get(name):
-        if _isSettings(name, section):
-            return True
-    return False
+        return section in snapshot(name)
+    return bool(list(snapshot(name)))
 
 def _setSettings(name, section):
     '''
     Sets the settings meta option in the given configuration section.
+    Writing of the configuration file is deferred till the next write
+    or flush.
     '''
-    config.set(name, section, _META_OPTION_NAME, _META_OPTION_VALUE)
+    if not _isSettings(name, section):
+        config.set(name, section, _META_OPTION_NAME, _META_OPTION_VALUE,
+                   write=False)
 
 
 def get(name=None, section=None, option=None, default=None, force=False):
@@ -336,4 +439,5 @@ def set(name, section, option=None, value=None, force=False):
 remove = config.remove
 reset = config.reset
 reload = config.reload
+flush = config.flush
 
@@ -0,0 +1,208 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import time
+import threading
+
+__all__ = ["CATEGORY_LOCAL", "CATEGORY_SLEEP", "CATEGORY_TRANSLATION",
+           "CATEGORY_REMOTE", "StepProfile", "start", "stop", "current",
+           "sleep"]
+
+#: A category of time spent in local Python code
+CATEGORY_LOCAL = "local"
+#: A category of time spent sleeping, e.g. in delays
+CATEGORY_SLEEP = "sleep"
+#: A category of time spent translating messages
+CATEGORY_TRANSLATION = "translation"
+#: A prefix of categories of time spent in remote calls followed by
+#: a target and a name of a request, e.g. "remote:a11y/get"
+CATEGORY_REMOTE = "remote:"
+
+# Profiles of steps run by threads
+_local = threading.local()
+
+class StepProfile(object):
+    '''
+    A class of profiles that break a wall time of a test step down into
+    categories. Time of nested measurements is attributed to the outermost
+    one only.
+    '''
+    def __init__(self):
+        self.started = time.time()
+        self.stopped = None
+        self.times = {}
+        self._active = None
+        # Categories and times of sending of pending requests by ids
+        self._requests = {}
+
+    def add(self, category, seconds):
+        '''
+        Adds the given time to the specified category.
+
+        :param category: A name of the category
+        :type category: string
+        :param seconds: A time in seconds
+        :type seconds: float
+        '''
+        self.times[category] = self.times.get(category, 0.0) + seconds
+
+    def enter(self, category):
+        '''
+        Starts measuring of time of the given category and returns a start
+        time, or None if another measurement is in progress.
+
+        :param category: A name of the category
+        :type category: string
+        :return: A start time or None
+        :rtype: float
+        '''
+        if self._active is not None:
+            return None
+        self._active = category
+        return time.time()
+
+    def leave(self, category, stamp):
+        '''
+        Stops measuring of time of the given category started at the specified
+        time returned by enter().
+
+        :param category: A name of the category
+        :type category: string
+        :param stamp: A start time or None
+        :type stamp: float
+        '''
+        if stamp is None:
+            return
+        self._active = None
+        self.add(category, time.time() - stamp)
+
+    def request(self, id, target, name, stamp=None):
+        '''
+        Notes a request of the given id, target and name sent to a device.
+
+        :param id: An id of the request
+        :type id: integer
+        :param target: A target of the request
+        :type target: string
+        :param name: A name of the request
+        :type name: string
+        :param stamp: A time of creating the request, now if None
+        :type stamp: float
+        '''
+        self._requests[id] = (CATEGORY_REMOTE + "%s/%s" % (target, name),
+                              time.time() if stamp is None else stamp)
+
+    def response(self, id):
+        '''
+        Notes a response to a request of the given id is got, the time since
+        the request creation is attributed to a remote category of it.
+
+        :param id: An id of the request
+        :type id: integer
+        '''
+        category, stamp = self._requests.pop(id, (None, None))
+        if category is not None:
+            self.add(category, time.time() - stamp)
+
+    def stop(self):
+        '''
+        Stops the profile.
+        '''
+        self.stopped = time.time()
+
+    def breakdown(self):
+        '''
+        Returns a breakdown of the wall time of the profile into categories,
+        where the local category is the time not attributed to any other one.
+
+        :return: A dictionary of times in seconds by categories
+        :rtype: dictionary
+        '''
+        total = (self.stopped or time.time()) - self.started
+        breakdown = dict(self.times)
+        breakdown[CATEGORY_LOCAL] = max(0.0, total - sum(self.times.values()))
+        return breakdown
+
+
+def start():
+    '''
+    Starts a step profile for the current thread.
+
+    :return: The started profile
+    :rtype: StepProfile
+    '''
+    profile = _local.profile = StepProfile()
+    return profile
+
+def stop():
+    '''
+    Stops a step profile of the current thread.
+
+    :return: The stopped profile or None
+    :rtype: StepProfile
+    '''
+    profile = current()
+    if profile is not None:
+        profile.stop()
+        _local.profile = None
+    return profile
+
+def current():
+    '''
+    Returns a step profile of the current thread.
+
+    :return: A profile or None if the thread is not profiled
+    :rtype: StepProfile
+    '''
+    return getattr(_local, "profile", None)
+
+def sleep(seconds):
+    '''
+    Suspends the current thread for the given number of seconds and
+    attributes the time to the sleep category of its step profile.
+
+    :param seconds: A time of sleeping
+    :type seconds: float
+    '''
+    profile = current()
+    if profile is None:
+        time.sleep(seconds)
+        return
+    stamp = profile.enter(CATEGORY_SLEEP)
+    try:
+        time.sleep(seconds)
+    finally:
+        profile.leave(CATEGORY_SLEEP, stamp)
@@ -36,15 +36,29 @@
 
 import os
 import sys
+import threading
 
 from tadek.core import settings
 from tadek.core import utils
 
 __all__ = ["TestResultChannel", "TestResultFileChannel",
-           "TestResultChannelError", "register", "add", "remove", "get"]
+           "TestResultChannelError", "register", "add", "remove", "get",
+           "DISPATCH_SYNC", "DISPATCH_BLOCK", "DISPATCH_DROP"]
 
 CONFIG_NAME = "channels"
 
+#: Test results are passed to a channel directly by device threads
+DISPATCH_SYNC = "sync"
+#: Test results are queued and device threads wait if the queue is full
+DISPATCH_BLOCK = "block"
+#: Test results are queued and dropped if the queue is full
+DISPATCH_DROP = "drop"
+
+DISPATCH_POLICIES = (DISPATCH_SYNC, DISPATCH_BLOCK, DISPATCH_DROP)
+
+#: A default maximum number of test results queued for a channel
+DEFAULT_QUEUE_SIZE = 1000
+
 # All classes defined herein are 'new-style' classes
 __metaclass__ = type
 
@@ -63,10 +77,16 @@ class TestResultChannel:
     #: A flag for determining if a channel is active
     _active = False
 
-    def __init__(self, name, enabled=True, verbose=False, **params):
+    def __init__(self, name, enabled=True, verbose=False,
+                 dispatch=DISPATCH_SYNC, queue=DEFAULT_QUEUE_SIZE, **params):
         self.name = name
         self._enabled = enabled
         self._verbose = verbose
+        self._dispatch = str(dispatch).lower()
+        if self._dispatch not in DISPATCH_POLICIES:
+            raise TestResultChannelError("Invalid dispatch policy: %s"
+                                         % self._dispatch)
+        self._queueSize = int(queue)
 
     def isEnabled(self):
         '''
@@ -105,6 +125,28 @@ class TestResultChannel:
         '''
         self._verbose = verbose
 
+    def dispatchPolicy(self):
+        '''
+        Returns a policy of passing test results to the channel. Test results
+        are passed directly by device threads (DISPATCH_SYNC) or queued and
+        passed by a dispatcher thread. If the queue is full then device
+        threads wait (DISPATCH_BLOCK) or test results are dropped
+        (DISPATCH_DROP).
+
+        :return: A dispatch policy of the channel
+        :rtype: string
+        '''
+        return self._dispatch
+
+    def queueSize(self):
+        '''
+        Returns a maximum number of test results queued for the channel.
+
+        :return: A size of the queue
+        :rtype: integer
+        '''
+        return self._queueSize
+
     def isActive(self):
         '''
         Returns True if the channel is active (its startTest() or stopTest()
@@ -261,6 +303,24 @@ class CoreDumpsChannel:
     '''
     name = "coredumps"
 
+    class _DeviceCache:
+        '''
+        A class of core dumps caches of devices. Core dumps are stored by
+        their (path, mtime, size) keys.
+        '''
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.cores = None
+            self.taken = set()
+            self.cursors = {}
+
+        def untaken(self):
+            '''
+            Returns a list of core dumps that are not taken yet.
+            '''
+            return [core for key, core in self.cores.iteritems()
+                         if key not in self.taken]
+
     def __init__(self):
         section = settings.get(CONFIG_NAME, self.name, force=True)
         self._enabled = section["enabled"]
@@ -268,6 +328,9 @@ class CoreDumpsChannel:
         self._pattern = section["pattern"]
         self._recursive = section["recursive"]
         self._links = section["links"]
+        self._steps = section.get("steps", True)
+        self._caches = {}
+        self._mutex = threading.Lock()
 
     def isEnabled(self):
         '''
@@ -287,76 +350,132 @@ class CoreDumpsChannel:
         '''
         self._enabled = enabled
 
+    def isScanningSteps(self):
+        '''
+        Returns True if core dumps are scanned at boundaries of test steps,
+        False if only at boundaries of test cases and test suites.
+
+        :return: True if core dumps are scanned for test steps
+        :rtype: boolean
+        '''
+        return bool(self._steps)
+
+    def setScanningSteps(self, steps):
+        '''
+        Sets if core dumps should be scanned at boundaries of test steps.
+
+        :param steps: True if core dumps should be scanned for test steps
+        :type steps: boolean
+        '''
+        self._steps = steps
+
     def _cache(self, device):
         '''
         Gets a core dumps cache for the given device.
         '''
-        cache = self._caches.get(id(device))
-        if cache is None:
-            self._caches[id(device)] = cache = {}
-            self._update(device, cache, take=True)
-        return cache
+        self._mutex.acquire()
+        try:
+            cache = self._caches.get(id(device))
+            if cache is None:
+                self._caches[id(device)] = cache = self._DeviceCache()
+            return cache
+        finally:
+            self._mutex.release()
 
-    def _update(self, device, cache, take=False):
+    def _update(self, device, cache):
         '''
-        Updates the given core dumps cache using the specified device.
+        Updates the given core dumps cache using the specified device. Core
+        dumps found by the first update are taken.
         '''
-        coreDumps = []
+        take = cache.cores is None
+        if take:
+            cache.cores = {}
+        changes = "dirchanges" in device.extensions
         for dirpath in set(self._dirs):
-            status, cores = device.extension("dirfiles",
-                                           path=str(dirpath),
-                                           pattern=str(self._pattern),
-                                           recursive=bool(self._recursive),
-                                           links=bool(self._links))
-            if status:
-                coreDumps.extend(cores)
-        cores = cache.keys()
-        for core in coreDumps:
-            found = False
-            while core in cores:
-                c = cores.pop(cores.index(core))
-                if core.mtime == c.mtime and core.size == c.size:
-                    found = True
-                    break
-            if not found:
-                cache[core] = take
+            params = {
+                "path": str(dirpath),
+                "pattern": str(self._pattern),
+                "recursive": bool(self._recursive),
+                "links": bool(self._links)
+            }
+            if changes:
+                # Get only core dumps changed since the previous update
+                key = tuple(sorted(params.items()))
+                status, cursor, cores = device.extension("dirchanges",
+                                            cursor=cache.cursors.get(key, u''),
+                                            **params)
+                if status:
+                    cache.cursors[key] = cursor
+            else:
+                status, cores = device.extension("dirfiles", **params)
+            if not status:
+                continue
+            for core in cores:
+                key = (core.path, core.mtime, core.size)
+                if key not in cache.cores:
+                    cache.cores[key] = core
+                    if take:
+                        cache.taken.add(key)
 
     def start(self, result):
         '''
         Intializes the core dumps caching.
         '''
-        self._caches = {}
+        self._mutex.acquire()
+        try:
+            self._caches = {}
+        finally:
+            self._mutex.release()
 
     def stop(self):
         '''
         Closes the internal core dumps caches.
         '''
-        for cache in self._caches.itervalues():
-            for core in cache:
-                cache[core] = True
+        self._mutex.acquire()
+        try:
+            caches = self._caches.values()
+        finally:
+            self._mutex.release()
+        for cache in caches:
+            cache.lock.acquire()
+            try:
+                if cache.cores is not None:
+                    cache.taken.update(cache.cores)
+            finally:
+                cache.lock.release()
 
     def startTest(self, result, device):
         '''
         Gets a list of all not taken yet cores dumped on the given device.
         '''
         cache = self._cache(device)
-        self._update(device, cache)
-        result.cores = [core for core, taken in cache.iteritems() if not taken]
+        cache.lock.acquire()
+        try:
+            self._update(device, cache)
+            result.cores = cache.untaken()
+        finally:
+            cache.lock.release()
 
     def stopTest(self, result, device):
         '''
         Takes a list of all available (not taken yet) core dumps stored
         in a cache associated with the device excluding the given list.
         '''
-        exclude = [id(core) for core in result.cores]
-        result.cores = []
+        exclude = set([(core.path, core.mtime, core.size)
+                       for core in result.cores])
         cache = self._cache(device)
-        self._update(device, cache)
-        for core, taken in cache.iteritems():
-            if taken or id(core) in exclude:
-                continue
-            cache[core] = True
-            result.cores.append(core)
+        cache.lock.acquire()
+        try:
+            self._update(device, cache)
+            cores = []
+            for key, core in cache.cores.iteritems():
+                if key in cache.taken or key in exclude:
+                    continue
+                cache.taken.add(key)
+                cores.append(core)
+            result.cores = cores
+        finally:
+            cache.lock.release()
 
 
 # A cache for registered channel classes
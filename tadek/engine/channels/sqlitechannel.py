@@ -0,0 +1,277 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import time
+import sqlite3
+import threading
+
+from tadek.engine import channels
+
+__all__ = ["SqliteChannel", "ResultStore"]
+
+# A schema of result stores
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    run INTEGER PRIMARY KEY AUTOINCREMENT,
+    date REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run INTEGER NOT NULL REFERENCES runs(run),
+    id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    path TEXT,
+    device TEXT NOT NULL,
+    address TEXT,
+    status TEXT NOT NULL,
+    date REAL,
+    time REAL,
+    errors INTEGER,
+    cores INTEGER
+);
+CREATE INDEX IF NOT EXISTS results_id ON results (id, run);
+CREATE INDEX IF NOT EXISTS results_device ON results (device);
+CREATE INDEX IF NOT EXISTS results_status ON results (status);
+CREATE INDEX IF NOT EXISTS results_time ON results (type, time);
+'''
+
+def _timeStamp(dt):
+    '''
+    Converts the given date to a time stamp.
+    '''
+    if dt is None:
+        return None
+    return time.mktime(dt.timetuple()) + dt.microsecond / 10.0**6
+
+
+class ResultStore(object):
+    '''
+    A class of append-only SQLite stores of test results indexed by ids of
+    tests, names of devices and statuses.
+    '''
+    def __init__(self, path):
+        '''
+        Opens a store of the given path, it is created if it does not exist.
+
+        :param path: A path to the store file
+        :type path: string
+        '''
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._connection.executescript(_SCHEMA)
+
+    def _execute(self, query, params=()):
+        '''
+        Executes the given query and returns all rows of its result.
+        '''
+        self._lock.acquire()
+        try:
+            return self._connection.execute(query, params).fetchall()
+        finally:
+            self._lock.release()
+
+    def close(self):
+        '''
+        Commits pending results and closes the store.
+        '''
+        self._lock.acquire()
+        try:
+            self._connection.commit()
+            self._connection.close()
+        finally:
+            self._lock.release()
+
+    def commit(self):
+        '''
+        Commits pending results to the store.
+        '''
+        self._lock.acquire()
+        try:
+            self._connection.commit()
+        finally:
+            self._lock.release()
+
+    def addRun(self, date=None):
+        '''
+        Adds a new test run to the store.
+
+        :param date: A time stamp of the run, current time if None
+        :type date: float
+        :return: An id of the run
+        :rtype: integer
+        '''
+        self._lock.acquire()
+        try:
+            cursor = self._connection.execute(
+                "INSERT INTO runs (date) VALUES (?)",
+                (time.time() if date is None else date,))
+            return cursor.lastrowid
+        finally:
+            self._lock.release()
+
+    def add(self, run, result, device):
+        '''
+        Appends the given test result of a device execution to the store.
+
+        :param run: An id of the test run
+        :type run: integer
+        :param result: A test result
+        :type result: TestResultBase
+        :param device: A related device execution result
+        :type device: DeviceExecResult
+        '''
+        self._execute("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, "
+                      "?, ?)",
+                      (run, result.id, result.__class__.__name__[4:-6].lower(),
+                       result.path, device.name,
+                       ':'.join([str(device.address), str(device.port)]),
+                       device.status, _timeStamp(device.date), device.time,
+                       len(device.errors), len(device.cores or ())))
+
+    def runs(self):
+        '''
+        Returns a list of test runs as (run, date) tuples.
+
+        :return: A list of test runs
+        :rtype: list
+        '''
+        return self._execute("SELECT run, date FROM runs ORDER BY run")
+
+    def statusHistory(self, id, device=None):
+        '''
+        Returns a status history of a test of the given id as a list of
+        (run, device, status, date, time) tuples ordered by runs.
+
+        :param id: An id of the test
+        :type id: string
+        :param device: A name of a device to limit the history to or None
+        :type device: string
+        :return: A status history of the test
+        :rtype: list
+        '''
+        query = ("SELECT run, device, status, date, time FROM results "
+                 "WHERE id = ?")
+        params = [id]
+        if device is not None:
+            query += " AND device = ?"
+            params.append(device)
+        return self._execute(query + " ORDER BY run, date", params)
+
+    def slowestSteps(self, limit=10, device=None):
+        '''
+        Returns the slowest test steps across all runs as a list of
+        (id, run, device, status, time) tuples ordered by execution times.
+
+        :param limit: A maximum number of returned steps
+        :type limit: integer
+        :param device: A name of a device to limit the steps to or None
+        :type device: string
+        :return: A list of the slowest test steps
+        :rtype: list
+        '''
+        query = ("SELECT id, run, device, status, time FROM results "
+                 "WHERE type = 'step'")
+        params = []
+        if device is not None:
+            query += " AND device = ?"
+            params.append(device)
+        params.append(limit)
+        return self._execute(query + " ORDER BY time DESC LIMIT ?", params)
+
+
+class SqliteChannel(channels.TestResultFileChannel):
+    '''
+    A channel class for appending test results to SQLite result stores.
+    '''
+    #: Extension of a result store file
+    _fileExt = ".db"
+
+    #: A number of results appended to the store between commits
+    _COMMIT_RESULTS = 100
+
+    def __init__(self, name, unique=False, **params):
+        channels.TestResultFileChannel.__init__(self, name, unique=unique,
+                                                **params)
+        self._store = None
+        self._run = None
+        self._pending = 0
+
+    def store(self):
+        '''
+        Gets the result store of the channel, it is opened at the first
+        processed test result.
+
+        :return: The result store or None
+        :rtype: ResultStore
+        '''
+        return self._store
+
+    def stop(self):
+        '''
+        Commits all the results and closes the result store.
+        '''
+        channels.TestResultFileChannel.stop(self)
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+        self._pending = 0
+
+    def stopTest(self, result, device):
+        '''
+        Processes a test stop execution for the SQLite channel.
+        '''
+        channels.TestResultFileChannel.stopTest(self, result, device)
+        if self._store is None:
+            self._store = ResultStore(self.filePath())
+            self._run = self._store.addRun()
+        self._store.add(self._run, result, device)
+        self._pending += 1
+        if self._pending >= self._COMMIT_RESULTS:
+            self._store.commit()
+            self._pending = 0
+
+    def read(self, file):
+        '''
+        Opens the given result store file for queries.
+
+        :param file: A path to the result store file
+        :type file: string
+        :return: The result store
+        :rtype: ResultStore
+        '''
+        channels.TestResultFileChannel.read(self, file)
+        return ResultStore(self.filePath())
+
+channels.register(SqliteChannel)
@@ -37,6 +37,7 @@
 import re
 import sys
 import datetime
+import threading
 
 from tadek.core import utils
 from tadek.engine.testresult import TestStepResult, TestCaseResult
@@ -80,25 +81,45 @@ def _placeHolders(formatter):
     '''
     return re.findall("%\((#?\w+?|device\.\w+?)\)([a-zA-Z])", formatter)
 
-def _placeHoldersNames(formatter):
+class _Template(object):
     '''
-    Returns a set of unique names of place holders in the given formatter.
+    A class of formatters compiled once, so that rendering output data does
+    not need any regular expression work.
     '''
-    return set([n for n, t in _placeHolders(formatter)])
+    __slots__ = ("text", "names", "converters")
+
+    def __init__(self, formatter, conversions):
+        '''
+        Compiles the given formatter using the specified conversion types.
+        Place holders of extra conversion types are replaced by place holders
+        of their converted values.
+        '''
+        holders = set(_placeHolders(formatter))
+        converters = []
+        for name, type in holders:
+            if type not in conversions:
+                continue
+            key = u"%s#%s" % (name, type)
+            formatter = formatter.replace(u"%%(%s)%s" % (name, type),
+                                          u"%%(%s)s" % key)
+            converters.append((key, name, conversions[type]))
+        #: A formatter with standard place holders only
+        self.text = formatter
+        #: A set of unique names of place holders
+        self.names = frozenset([n for n, t in holders])
+        #: A list of (key, name, converter) tuples of converted place holders
+        self.converters = tuple(converters)
+
+    def render(self, attrs):
+        '''
+        Formats output data from the given attributes.
+        '''
+        if self.converters:
+            attrs = dict(attrs)
+            for key, name, converter in self.converters:
+                attrs[key] = converter(attrs[name])
+        return self.text % attrs
 
-def _formatData(formatter, attrs, extras):
-    '''
-    Formats output data from the given formatter and attributes using the extra
-    conversion types.
-    '''
-    extras.update(_CONVERSION_TYPES)
-    for name, type in _placeHolders(formatter):
-        if type not in extras:
-            continue
-        formatter = formatter.replace(u"%%(%s)%s" % (name, type),
-                                      extras[type](attrs[name]))
-    return formatter % attrs
-    
 
 class StreamChannel(TestResultChannel):
     '''
@@ -170,12 +191,37 @@ class StreamChannel(TestResultChannel):
         # Errors (required)
         #         (error, separator, prefix, suffix)
         "errors": (u"%s", u'\n', u'', u'\n'),
+        # Test step profile
+        #         (category time, separator, prefix, suffix)
+        "profile": (u"%s", u", ", u"\tProfile: ", u'\n'),
     }
 
-    def __init__(self, name, stream=None, encoding=None, **params):
+    def __init__(self, name, stream=None, encoding=None, buffer=0,
+                 interval=1.0, **params):
         TestResultChannel.__init__(self, name, **params)
         self._stream = stream or sys.stderr
         self._encoding = encoding or getattr(self._stream, "encoding", None)
+        self._templates = {}
+        # A size of the output buffer in bytes, 0 for unbuffered output
+        self._bufferSize = int(buffer)
+        # A maximum time in seconds that data stays in the output buffer
+        self._interval = float(interval)
+        self._buffer = []
+        self._buffered = 0
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def _template(self, formatter):
+        '''
+        Returns a compiled template of the given formatter.
+        '''
+        template = self._templates.get(formatter)
+        if template is None:
+            conversions = dict(self._conversionTypes)
+            conversions.update(_CONVERSION_TYPES)
+            template = _Template(formatter, conversions)
+            self._templates[formatter] = template
+        return template
 
     def _basicAttrs(self, device):
         '''
@@ -215,8 +261,9 @@ class StreamChannel(TestResultChannel):
         if isinstance(formatter, (tuple, list)):
             items = []
             formatter, separator, prefix, suffix = formatter
-            holders = _placeHoldersNames(formatter)
-            if MAPPING_KEY_SYMBOL in holders or MAPPING_VALUE_SYMBOL in holders:
+            template = self._template(formatter)
+            if (MAPPING_KEY_SYMBOL in template.names
+                or MAPPING_VALUE_SYMBOL in template.names):
                 # Mapping (dict like sequence)
                 for key in source:
                     attrs = {
@@ -224,8 +271,7 @@ class StreamChannel(TestResultChannel):
                         MAPPING_VALUE_SYMBOL: source[key],
                     }
                     attrs.update(kwargs)
-                    items.append(_formatData(formatter, attrs,
-                                             self._conversionTypes))
+                    items.append(template.render(attrs))
             else:
                 for item in source:
                     items.append(self._format(item, formatter,
@@ -233,12 +279,12 @@ class StreamChannel(TestResultChannel):
             if not items:
                 return ''
             return prefix + separator.join(items) + suffix
-        holders = _placeHoldersNames(formatter)
-        if not holders:
+        template = self._template(formatter)
+        if not template.names:
             # There is no any named place holder
-            return formatter % utils.decode(source)
+            return template.text % utils.decode(source)
         attrs = {}
-        for name in holders:
+        for name in template.names:
             if hasattr(source, name):
                 value = getattr(source, name)
                 if name in formatters:
@@ -249,7 +295,16 @@ class StreamChannel(TestResultChannel):
                 # Unknown place holder
                 attrs[name] = ''
         attrs.update(kwargs)
-        return _formatData(formatter, attrs, self._conversionTypes)
+        return template.render(attrs)
+
+    def _profile(self, device):
+        '''
+        Returns a list of texts of category times of the given device result
+        of a test step.
+        '''
+        if not device.profile:
+            return []
+        return [u"%s=%.3fs" % item for item in sorted(device.profile.items())]
 
     def _formatResult(self, result, formatters, attrs):
         '''
@@ -265,10 +320,10 @@ class StreamChannel(TestResultChannel):
         TestResultChannel.startTest(self, result, device)
         formatters = (self._verboseFormats if self.isVerbose()
                                            else self._simpleFormats)
+        attrs = self._deviceAttrs(device)
         self.write(self._format(result, formatters["start"], formatters,
-                                self._deviceAttrs(device)))
-        self.write(self._formatResult(result, formatters,
-                                      self._deviceAttrs(device)))
+                                attrs)
+                   + self._formatResult(result, formatters, attrs))
 
     def stopTest(self, result, device):
         '''
@@ -277,21 +332,77 @@ class StreamChannel(TestResultChannel):
         TestResultChannel.stopTest(self, result, device)
         formatters = (self._verboseFormats if self.isVerbose()
                                            else self._simpleFormats)
+        attrs = self._deviceAttrs(device)
+        basicAttrs = self._basicAttrs(device)
         self.write(self._format(result, formatters["stop"], formatters,
-                                self._deviceAttrs(device)))
-        self.write(self._formatResult(result, formatters,
-                                      self._deviceAttrs(device)))
-        self.write(self._format(device.cores, formatters["cores"],
-                                formatters, self._basicAttrs(device)))
-        self.write(self._format(device.errors, formatters["errors"],
-                                formatters, self._basicAttrs(device)))
+                                attrs)
+                   + self._formatResult(result, formatters, attrs)
+                   + self._format(device.cores, formatters["cores"],
+                                  formatters, basicAttrs)
+                   + self._format(device.errors, formatters["errors"],
+                                  formatters, basicAttrs)
+                   + self._format(self._profile(device),
+                                  formatters.get("profile"), formatters,
+                                  basicAttrs))
+
+    def stop(self):
+        '''
+        Flushes the output buffer at the end of tests execution.
+        '''
+        TestResultChannel.stop(self)
+        self.flush()
 
     def write(self, data):
         '''
-        Writes the given data to the stream.
+        Writes the given data to the stream. The data is written at once,
+        so data of concurrent devices is not interleaved. In the buffered mode
+        the data is written when the buffer is full, when the flush interval
+        elapses or at the end of tests execution.
+        '''
+        if not data:
+            return
+        data = utils.encode(data, self._encoding)
+        self._lock.acquire()
+        try:
+            if not self._bufferSize:
+                self._stream.write(data)
+                return
+            self._buffer.append(data)
+            self._buffered += len(data)
+            if self._buffered >= self._bufferSize:
+                self._flush()
+            elif self._timer is None and self._interval > 0:
+                self._timer = threading.Timer(self._interval, self.flush)
+                self._timer.setDaemon(True)
+                self._timer.start()
+        finally:
+            self._lock.release()
+
+    def _flush(self):
+        '''
+        Writes the buffered data to the stream.
+        '''
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        data = ''.join(self._buffer)
+        self._buffer = []
+        self._buffered = 0
+        self._stream.write(data)
+        if hasattr(self._stream, "flush"):
+            self._stream.flush()
+
+    def flush(self):
+        '''
+        Writes the buffered data to the stream.
         '''
-        if data:
-            self._stream.write(utils.encode(data, self._encoding))
+        self._lock.acquire()
+        try:
+            self._flush()
+        finally:
+            self._lock.release()
 
 register(StreamChannel)
 
@@ -34,21 +34,36 @@
 ##                                                                            ##
 ################################################################################
 
+import math
 import time
+import threading
 
 from tadek.core import utils
 from tadek.engine.testresult import TestCaseResult
 from tadek.engine.channels import register, TestResultChannel
 from tadek.engine.testexec import *
 
-__all__ = ["SummaryChannel", "COUNTER_N_TESTS", "COUNTER_TESTS_RUN",
-           "COUNTER_CORE_DUMPS", "COUNTER_RUN_TIME"]
+__all__ = ["SummaryChannel", "QuantileSketch", "RateMeter", "COUNTER_N_TESTS",
+           "COUNTER_TESTS_RUN", "COUNTER_CORE_DUMPS", "COUNTER_RUN_TIME",
+           "COUNTER_DURATION", "COUNTER_DEVICE_DURATIONS", "COUNTER_RATE",
+           "COUNTER_ETA", "QUANTILES"]
 
 # Counters names
 COUNTER_N_TESTS = "ntests"
 COUNTER_TESTS_RUN = "testsRun"
 COUNTER_CORE_DUMPS = "coreDumps"
 COUNTER_RUN_TIME = "runTime"
+COUNTER_DURATION = "duration"
+COUNTER_DEVICE_DURATIONS = "deviceDurations"
+COUNTER_RATE = "rate"
+COUNTER_ETA = "eta"
+
+# Quantiles of test case durations reported in summaries
+QUANTILES = (
+    ("p50", 0.50),
+    ("p95", 0.95),
+    ("p99", 0.99)
+)
 
 # A list of status counters
 STATUS_COUNTERS = (
@@ -67,20 +82,164 @@ def _countCaseResults(result):
     '''
     Counts all test case results in the given test result tree.
     '''
-    if isinstance(result, TestCaseResult):
-        return 1
     count = 0
-    for child in result.children:
-        count += _countCaseResults(child)
+    results = [result]
+    while results:
+        result = results.pop()
+        if isinstance(result, TestCaseResult):
+            count += 1
+        else:
+            results.extend(result.children)
     return count
 
+class QuantileSketch:
+    '''
+    A streaming sketch of a distribution of non-negative values.
+
+    Values are counted in logarithmic buckets, so memory depends on a range
+    of values instead of their number and each estimated quantile differs
+    from the exact one by at most the given relative error.
+    '''
+    def __init__(self, error=0.01):
+        self._gamma = (1.0 + error) / (1.0 - error)
+        self._logGamma = math.log(self._gamma)
+        self._buckets = {}
+        self._zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        '''
+        Adds the given value to the sketch.
+
+        :param value: A non-negative value
+        :type value: float
+        '''
+        if value <= 0.0:
+            value = 0.0
+            self._zeros += 1
+        else:
+            index = int(math.ceil(math.log(value) / self._logGamma))
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        '''
+        Returns an estimated value of the given quantile.
+
+        :param q: A quantile in range from 0 to 1
+        :type q: float
+        :return: An estimated value or None if the sketch is empty
+        :rtype: float
+        '''
+        if not self.count:
+            return None
+        # The nearest rank method
+        rank = max(int(math.ceil(q * self.count)) - 1, 0)
+        seen = self._zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                value = 2.0 * self._gamma**index / (self._gamma + 1.0)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self):
+        '''
+        Returns a dictionary of the sketch count, mean and quantiles.
+
+        :return: A dictionary of statistics
+        :rtype: dictionary
+        '''
+        summary = {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "max": self.max
+        }
+        for name, q in QUANTILES:
+            summary[name] = self.quantile(q)
+        return summary
+
+
+class RateMeter:
+    '''
+    An estimator of a rate of events in a rolling time window.
+
+    Events are counted in one second slots and only slots of the window
+    are kept.
+    '''
+    def __init__(self, window=60.0):
+        self._window = window
+        self._slots = []
+        self._start = None
+
+    def _expire(self, stamp):
+        '''
+        Removes slots older than the window.
+        '''
+        limit = int(stamp - self._window)
+        while self._slots and self._slots[0][0] <= limit:
+            self._slots.pop(0)
+
+    def add(self, stamp=None, count=1):
+        '''
+        Counts the given number of events at the given time stamp.
+        '''
+        if stamp is None:
+            stamp = time.time()
+        if self._start is None:
+            self._start = stamp
+        self._expire(stamp)
+        slot = int(stamp)
+        if self._slots and self._slots[-1][0] == slot:
+            self._slots[-1][1] += count
+        else:
+            self._slots.append([slot, count])
+
+    def rate(self, stamp=None):
+        '''
+        Returns a number of events per second in the window.
+
+        :return: A rate of events or None if no event has been counted
+        :rtype: float
+        '''
+        if self._start is None:
+            return None
+        if stamp is None:
+            stamp = time.time()
+        self._expire(stamp)
+        elapsed = min(self._window, stamp - self._start)
+        count = sum(count for slot, count in self._slots)
+        # Events counted within the first second give the lowest rate bound
+        return count / max(elapsed, 1.0)
+
+
 class SummaryChannel(TestResultChannel):
     '''
     Channel used to gain summary of tests.
+
+    Besides counters the channel keeps duration sketches of test cases per
+    whole run and per device, and estimates a rate of completed test cases
+    in a rolling window of the given number of seconds.
     '''
-    def __init__(self, name, enabled=True, verbose=False, **params):
+    def __init__(self, name, enabled=True, verbose=False, window=60.0,
+                 **params):
         TestResultChannel.__init__(self, name, enabled, verbose, **params)
+        self._window = float(window)
+        self._lock = threading.Lock()
         self._counters = {}
+        self._durations = QuantileSketch()
+        self._deviceDurations = {}
+        self._rate = RateMeter(self._window)
 
     def start(self, result):
         '''
@@ -97,6 +256,9 @@ class SummaryChannel(TestResultChannel):
         }
         for status in STATUS_COUNTERS:
             self._counters[status] = 0
+        self._durations = QuantileSketch()
+        self._deviceDurations = {}
+        self._rate = RateMeter(self._window)
 
     def startTest(self, result, device):
         '''
@@ -104,35 +266,77 @@ class SummaryChannel(TestResultChannel):
         '''
         TestResultChannel.startTest(self, result, device)
         if isinstance(result, TestCaseResult):
-            self._counters[STATUS_NOT_COMPLETED] += 1
-            self._counters[COUNTER_TESTS_RUN] += 1
+            self._lock.acquire()
+            try:
+                self._counters[STATUS_NOT_COMPLETED] += 1
+                self._counters[COUNTER_TESTS_RUN] += 1
+            finally:
+                self._lock.release()
 
     def stopTest(self, result, device):
         '''
         Processes a test stop execution for the summary channel.
         '''
         TestResultChannel.stopTest(self, result, device)
-        if isinstance(result, TestCaseResult):
-            self._counters[STATUS_NOT_COMPLETED] -= 1
-            self._counters[device.status] += 1
-            self._counters[_STOP_STAMP] = time.time()
-        if device.cores:
-            self._counters[COUNTER_CORE_DUMPS] += len(device.cores)
+        self._lock.acquire()
+        try:
+            if isinstance(result, TestCaseResult):
+                stamp = time.time()
+                self._counters[STATUS_NOT_COMPLETED] -= 1
+                self._counters[device.status] += 1
+                self._counters[_STOP_STAMP] = stamp
+                self._durations.add(device.time)
+                sketch = self._deviceDurations.get(device.name)
+                if sketch is None:
+                    sketch = self._deviceDurations[device.name] = \
+                        QuantileSketch()
+                sketch.add(device.time)
+                self._rate.add(stamp)
+            if device.cores:
+                self._counters[COUNTER_CORE_DUMPS] += len(device.cores)
+        finally:
+            self._lock.release()
 
     def getSummary(self):
         '''
         Gets a summary of test results.
+
+        Durations are dictionaries of a count, mean, maximum and quantiles
+        of test case execution times in seconds. The rate is a number of
+        completed test cases per minute and the ETA is a number of seconds
+        left to complete remaining test cases at that rate.
         '''
-        runTime = self._counters[_STOP_STAMP] - self._counters[_START_STAMP]
-        summary = {
-            COUNTER_RUN_TIME: utils.runTimeToString(runTime),
-            COUNTER_N_TESTS: self._counters[COUNTER_N_TESTS],
-            COUNTER_TESTS_RUN: self._counters[COUNTER_TESTS_RUN],
-            COUNTER_CORE_DUMPS: self._counters[COUNTER_CORE_DUMPS]
-        }
-        # Copy all status counters except STATUS_NO_RUN
-        for status in STATUS_COUNTERS[1:]:
-            summary[status] = self._counters[status]
+        self._lock.acquire()
+        try:
+            runTime = (self._counters[_STOP_STAMP]
+                       - self._counters[_START_STAMP])
+            summary = {
+                COUNTER_RUN_TIME: utils.runTimeToString(runTime),
+                COUNTER_N_TESTS: self._counters[COUNTER_N_TESTS],
+                COUNTER_TESTS_RUN: self._counters[COUNTER_TESTS_RUN],
+                COUNTER_CORE_DUMPS: self._counters[COUNTER_CORE_DUMPS]
+            }
+            # Copy all status counters except STATUS_NO_RUN
+            completed = 0
+            for status in STATUS_COUNTERS[1:]:
+                summary[status] = self._counters[status]
+                if status != STATUS_NOT_COMPLETED:
+                    completed += self._counters[status]
+            summary[COUNTER_DURATION] = self._durations.summary()
+            summary[COUNTER_DEVICE_DURATIONS] = dict(
+                [(name, sketch.summary())
+                 for name, sketch in self._deviceDurations.iteritems()])
+            rate = self._rate.rate()
+            summary[COUNTER_RATE] = rate * 60.0 if rate is not None else None
+            remaining = max(self._counters[COUNTER_N_TESTS] - completed, 0)
+            if not remaining:
+                summary[COUNTER_ETA] = 0.0
+            elif rate:
+                summary[COUNTER_ETA] = remaining / rate
+            else:
+                summary[COUNTER_ETA] = None
+        finally:
+            self._lock.release()
         return summary
 
 register(SummaryChannel)
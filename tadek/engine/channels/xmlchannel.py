@@ -256,6 +256,10 @@ class XmlChannel(channels.TestResultFileChannel):
                     _subElement(elem, "date",
                                 ' '.join(utils.localTime(core.mtime)))
                     _subElement(elem, "size", core.size)
+        if device.profile:
+            profile = _subElement(element, "profile")
+            for category, seconds in sorted(device.profile.iteritems()):
+                _subElement(profile, "category", seconds).set("name", category)
         self.write()
 
     def write(self):
@@ -304,6 +308,10 @@ class XmlChannel(channels.TestResultFileChannel):
                 mtime = mtime and utils.timeStampFromString(mtime)
                 size = long(core.findtext("size") or 0)
                 device.cores.append(FileDetails(path, mtime=mtime, size=size))
+        profile = element.find("profile")
+        if profile is not None:
+            device.profile = dict([(category.get("name"), float(category.text))
+                                   for category in profile.findall("category")])
         return d
 
     def _readResultElement(self, element, parent):
@@ -376,23 +384,80 @@ class XmlChannel(channels.TestResultFileChannel):
                 raise XmlInvalidTagError(element.tag, child.tag)
         return result
 
-    def read(self, file):
+    #: Result tags reading tree element methods mapping
+    _readMethodMaps = {
+        "step": "_readStepElement",
+        "case": "_readCaseElement",
+        "suite": "_readSuiteElement"
+    }
+
+    def iterRead(self, file, prefix=None):
         '''
-        Reads the XML file with test results.
+        Reads the XML file with test results incrementally. Processed tree
+        elements are cleared, so the whole file is never loaded into memory.
+        If no prefix is given then top-level test suite results are yielded
+        one at a time, otherwise the topmost test results of ids starting with
+        the prefix are yielded without parents.
+
+        :param file: A path to the XML file
+        :type file: string
+        :param prefix: A prefix of ids of test results to read or None
+        :type prefix: string
+        :return: An iterator of test results
+        :rtype: iterator
         '''
         channels.TestResultFileChannel.read(self, file)
         fd = open(self.filePath())
         try:
-            self._root = etree.ElementTree(file=fd).getroot()
-            if self._root.tag != ROOT_ELEMENT:
-                raise XmlInvalidTagError(self._root.tag)
-            container = testresult.TestResultContainer()
-            for suite in self._root.findall("suite"):
-                container.children.append(self._readSuiteElement(suite, None))
-            return container
+            stack = []
+            for event, element in etree.iterparse(fd, ("start", "end")):
+                if event == "start":
+                    if not stack and element.tag != ROOT_ELEMENT:
+                        raise XmlInvalidTagError(element.tag)
+                    stack.append(element)
+                    continue
+                stack.pop()
+                if len(stack) < 1:
+                    continue
+                parent = stack[-1]
+                if element.tag not in self._readMethodMaps:
+                    if parent.tag == ROOT_ELEMENT:
+                        parent.remove(element)
+                    continue
+                read = getattr(self, self._readMethodMaps[element.tag])
+                if prefix is None:
+                    # Only top-level suites are read
+                    if parent.tag != ROOT_ELEMENT:
+                        continue
+                    parent.remove(element)
+                    if element.tag == "suite":
+                        yield read(element, None)
+                    element.clear()
+                    continue
+                id = element.findtext("id")
+                if id is None:
+                    raise XmlMissingTagError(element.tag, "id")
+                if id.startswith(prefix):
+                    # Matching results are read as a part of matching parents
+                    if (parent.tag != ROOT_ELEMENT and len(stack) > 1 and
+                        (stack[-2].findtext("id") or '').startswith(prefix)):
+                        continue
+                    parent.remove(element)
+                    yield read(element, None)
+                else:
+                    # Subtrees of not matching results are not needed
+                    parent.remove(element)
+                element.clear()
         finally:
-            self._root = None
             fd.close()
 
+    def read(self, file):
+        '''
+        Reads the XML file with test results.
+        '''
+        container = testresult.TestResultContainer()
+        container.children.extend(self.iterRead(file))
+        return container
+
 channels.register(XmlChannel)
 
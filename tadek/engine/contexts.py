@@ -34,6 +34,8 @@
 ##                                                                            ##
 ################################################################################
 
+from tadek.core import timing
+
 import testexec
 
 __all__ = ["CaseContext", "SuiteContext", "DeviceContext"]
@@ -91,6 +93,10 @@ class CaseContext(TaskContext):
     '''
     A class of test case contexts.
     '''
+    #: If True then wall times of test steps are broken down into remote
+    #: calls, sleeps, translations and local code in step results
+    profiling = False
+
     def _runTask(self, test, device, result):
         '''
         Runs a related test case task within the context.
@@ -106,6 +112,8 @@ class CaseContext(TaskContext):
                                         self.task.result.children):
                 result.startTest(stepResult, device)
                 execResult = stepResult.device(device)
+                if self.profiling:
+                    timing.start()
                 try:
                     try:
                         step.run(test, device)
@@ -124,6 +132,9 @@ class CaseContext(TaskContext):
                     else:
                         execResult.status = testexec.STATUS_PASSED
                 finally:
+                    profile = timing.stop()
+                    if profile is not None:
+                        execResult.profile = profile.breakdown()
                     result.stopTest(stepResult, device)
         finally:
             if self.task.parent:
@@ -34,7 +34,7 @@
 ##                                                                            ##
 ################################################################################
 
-import time
+from tadek.core import timing
 
 class Delay(object):
     '''
@@ -77,7 +77,7 @@ class Delay(object):
             if ((result and not expectedFailure) or
                 (not result and expectedFailure)):
                 break
-            time.sleep(self._interval)
+            timing.sleep(self._interval)
             attempt += 1
         return result
 
@@ -109,7 +109,7 @@ class Delay(object):
         '''
         Waits for number of attempts * interval seconds idly.
         '''
-        time.sleep(self._attempts * self._interval)
+        timing.sleep(self._attempts * self._interval)
 
 
 #: A default delay for actions
@@ -35,12 +35,58 @@
 ################################################################################
 
 import sys
+import multiprocessing
 
 from tadek import testsuites
 from tadek.core import location
 from tadek.core.structs import ErrorBox
 
-from testdefs import TestSuite
+from testdefs import TestCase, TestSuite
+
+def _countCases(suite):
+    '''
+    Counts test cases of the given test suite and all its sub-suites.
+    '''
+    n = 0
+    for id, case in suite:
+        if isinstance(case, TestSuite):
+            n += _countCases(case)
+        elif isinstance(case, TestCase):
+            n += 1
+    return n
+
+def _collectModule(args):
+    '''
+    Collects metadata of test suites of a module of the given name. It is
+    run in worker processes of TestLoader.collect().
+    '''
+    locations, mdl = args
+    for path in locations:
+        if path not in location.get():
+            location.add(path)
+    suites = {}
+    errors = []
+    module = '.'.join([testsuites.__name__, mdl])
+    try:
+        __import__(module)
+    except:
+        errors.append(ErrorBox(name=module))
+        return mdl, suites, errors
+    module = sys.modules[module]
+    loader = TestLoader()
+    for name, obj in vars(module).iteritems():
+        if not loader._isTestSuite(module, obj):
+            continue
+        try:
+            suite = obj()
+            suites[name] = {
+                "attrs": suite.attrs,
+                "cases": _countCases(suite),
+                "devices": suite.count()
+            }
+        except:
+            errors.append(ErrorBox(name='.'.join([module.__name__, name])))
+    return mdl, suites, errors
 
 class TestLoader(object):
     '''
@@ -101,7 +147,7 @@ class TestLoader(object):
         '''
         Loads tests of the given names.
         '''
-        location.clear()
+        location.refresh()
         # Make sure that all names are not related
         tests = []
         errors = []
@@ -145,6 +191,7 @@ class TestLoader(object):
             mtests, merrs = self.loadFromModule(mdl, nms)
             tests.extend(mtests)
             errors.extend(merrs)
+        location.stampModules()
         return tests, errors
 
     def loadTree(self, name=None):
@@ -154,7 +201,7 @@ class TestLoader(object):
         tree = {}
         errors = []
         loaded = False
-        location.clear()
+        location.refresh()
         for mdl in sorted(location.getSuites(), reverse=True):
             if name:
                 if (name != mdl and not name.startswith(mdl + '.')
@@ -174,5 +221,74 @@ class TestLoader(object):
                 break
         if name and not loaded:
             errors = self.loadFromModule(name)[1]
+        location.stampModules()
         return tree, errors
 
+    def listSuites(self):
+        '''
+        Lists names of test suites of all modules from locations. Names are
+        got from the discovery index and only modules those have changed
+        since they were indexed are imported.
+
+        :return: A dictionary of lists of test suite names by module names
+            and a list of errors
+        :rtype: tuple
+        '''
+        suites = {}
+        errors = []
+        location.refresh()
+        for mdl, path in location.getSuites().iteritems():
+            names = location.getSuiteNames(path)
+            if names is None:
+                module = '.'.join([testsuites.__name__, mdl])
+                try:
+                    __import__(module)
+                except:
+                    errors.append(ErrorBox(name=module))
+                    continue
+                module = sys.modules[module]
+                names = sorted([name for name, obj in vars(module).iteritems()
+                                if self._isTestSuite(module, obj)])
+                location.setSuiteNames(path, names)
+            suites[mdl] = names
+        location.stampModules()
+        return suites, errors
+
+    def collect(self, processes=None):
+        '''
+        Collects metadata of test suites of all modules from locations in
+        a pool of worker processes, so test modules are validated without
+        being imported into the current interpreter. Only modules selected
+        for execution are imported later by loadFromNames(). Names of
+        collected test suites are put to the discovery index.
+
+        :param processes: A number of worker processes or None to use
+            the number of CPUs
+        :type processes: integer
+        :return: A dictionary of dictionaries of test suite metadata, those
+            are attributes, numbers of test cases and required devices, by
+            test suite names by module names and a list of errors
+        :rtype: tuple
+        '''
+        suites = {}
+        errors = []
+        modules = location.getSuites()
+        if not modules:
+            return suites, errors
+        # Forked workers inherit imported modules, so changed ones have to
+        # be cleared not to index stale suites under new modification times
+        location.refresh()
+        locations = location.get(enabled=True)
+        pool = multiprocessing.Pool(processes)
+        try:
+            results = pool.map(_collectModule,
+                               [(locations, mdl) for mdl in sorted(modules)])
+        finally:
+            pool.close()
+            pool.join()
+        for mdl, msuites, merrs in results:
+            errors.extend(merrs)
+            if not merrs:
+                location.setSuiteNames(modules[mdl], sorted(msuites))
+            suites[mdl] = msuites
+        return suites, errors
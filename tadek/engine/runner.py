@@ -126,7 +126,8 @@ class TestRunner(object):
         for te in self._execs:
             te.device.stop()
         self.join(STOP_TIMEOUT)
-        # Stop the test result anyway
+        # Wait for queued test results and stop the test result anyway
+        self.result.flush(STOP_TIMEOUT)
         self.result.stop()
         self._running = False
 
@@ -178,27 +179,46 @@ class DeviceLock(object):
     '''
     A simple class that allows locking an access to wrapped devices.
     '''
+    #: Names of device attributes that are never changed by a remote call, so
+    #: they are accessed directly without locking
+    staticAttrs = frozenset(("name", "address", "description", "params",
+                             "version", "locale", "extensions"))
+
+    class _Call(object):
+        '''
+        A class of device method wrappers that check a device lock state once
+        per a remote call.
+        '''
+        def __init__(self, lock, method):
+            self._lock = lock
+            self._method = method
+
+        def __call__(self, *args, **kwargs):
+            self._lock.check()
+            return self._method(*args, **kwargs)
+
     def __init__(self, device, test):
         self.device = device
         self._test = test
-        self._lock = threading.Condition()
-        self._locked = False
-        self._shouldAbort = False
+        # Set if the device is not locked (paused)
+        self._resumed = threading.Event()
+        self._resumed.set()
+        # Set if an execution on the device should be stopped
+        self._stopped = threading.Event()
+        self._calls = {}
 
     def __getattr__(self, name):
-        # TODO: Access to some of device attributes like name, address, etc.
-        # shouldn't be locked here
-        self._lock.acquire()
-        try:
-            while self._locked:
-                self._lock.wait()
-            self._test.abort(self.device.isConnected(), "Device disconnected")
-            if self._shouldAbort:
-                self._shouldAbort = False
-                self._test.abortIf(True, "Execution stopped")
+        if name in self.staticAttrs:
             return getattr(self.device, name)
-        finally:
-            self._lock.release()
+        call = self._calls.get(name)
+        if call is not None:
+            return call
+        attr = getattr(self.device, name)
+        if callable(attr):
+            call = self._calls[name] = self._Call(self, attr)
+            return call
+        self.check()
+        return attr
 
     def __eq__(self, device):
         return self.id() == (device.id() if hasattr(device, "id")
@@ -207,42 +227,46 @@ class DeviceLock(object):
     def __ne__(self, device):
         return not (self == device)
 
+    @property
+    def _locked(self):
+        return not self._resumed.isSet()
+
+    @property
+    def _shouldAbort(self):
+        return self._stopped.isSet()
+
     def id(self):
         '''
         Returns the id of a corresponding device.
         '''
         return id(self.device)
 
+    def check(self):
+        '''
+        Blocks while a corresponding device is locked and next aborts a test
+        execution if the device is disconnected or the execution was stopped.
+        '''
+        self._resumed.wait()
+        self._test.abort(self.device.isConnected(), "Device disconnected")
+        if self._stopped.isSet():
+            self._stopped.clear()
+            self._test.abortIf(True, "Execution stopped")
+
     def lock(self):
         '''
         Locks a corresponding device.
         '''
-        self._lock.acquire()
-        try:
-            self._locked = True
-        finally:
-            self._lock.release()
+        self._resumed.clear()
 
     def unlock(self):
         '''
         Unlocks a corresponding device.
         '''
-        self._lock.acquire()
-        try:
-            self._locked = False
-            self._lock.notify()
-        finally:
-            self._lock.release()
+        self._resumed.set()
 
     def stop(self):
         '''
         Stops a test execution on a corresponding device.
         '''
-        self._lock.acquire()
-        try:
-            self._locked = False
-            self._shouldAbort = True
-            self._lock.notify()
-        finally:
-            self._lock.release()
-
+        self._stopped.set()
+        self._resumed.set()
@@ -35,9 +35,146 @@
 ################################################################################
 
 from tadek.connection import protocol
+from tadek.core import locale
+from tadek.core import search
+
+__all__ = ["Predicates", "searcher", "searcher_back", "searcher__",
+           "structure", "structure_back", "structure__", "bound"]
+
+class Predicates(object):
+    '''
+    A class of immutable compiled predicates of searchers. Values of
+    the predicates are escaped (translated) once per a device locale and
+    regular expressions of them are compiled once.
+    '''
+    __slots__ = ("_items", "_lazy", "_cache")
+
+    def __init__(self, **predicates):
+        '''
+        Stores the given predicates omitting those of None value.
+
+        :param predicates: A dictionary of predicates
+        :type predicates: dictionary
+        '''
+        items = tuple(sorted([(name, value)
+                              for name, value in predicates.iteritems()
+                              if value is not None]))
+        object.__setattr__(self, "_items", items)
+        object.__setattr__(self, "_lazy",
+                           [isinstance(value, locale.MessageProxy)
+                            for name, value in items].count(True) > 0)
+        object.__setattr__(self, "_cache", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Predicates are immutable")
+
+    def __iter__(self):
+        '''
+        Returns an iterator that yields one pair of a predicate name and
+        a value per iteration.
+        '''
+        return iter(self._items)
+
+    def get(self, name, default=None):
+        '''
+        Gets a raw value of the predicate of the given name.
+
+        :param name: A name of the predicate
+        :type name: string
+        :param default: A value returned if there is no such predicate
+        :type default: object
+        :return: A value of the predicate
+        :rtype: object
+        '''
+        for nm, value in self._items:
+            if nm == name:
+                return value
+        return default
+
+    def _compiled(self, device):
+        '''
+        Gets escaped predicates and compiled regular expressions of them for
+        a locale of the given device.
+        '''
+        key = (device.locale, locale.changes()) if self._lazy else None
+        compiled = self._cache.get(key)
+        if compiled is None:
+            values = {}
+            patterns = {}
+            for name, value in self._items:
+                if self._lazy:
+                    value = locale.escape(value, device)
+                values[name] = value
+                regexp = search.compilePattern(value)
+                if regexp is not None:
+                    patterns[name] = regexp
+            if len(self._cache) > 8:
+                self._cache.clear()
+            compiled = self._cache[key] = (values, patterns, {})
+        return compiled
+
+    def escaped(self, device):
+        '''
+        Returns a dictionary of the predicates with values escaped using
+        a locale of the given device.
+
+        :param device: A device to escape the predicates for
+        :type device: tadek.connection.device.Device
+        :return: A dictionary of the escaped predicates
+        :rtype: dictionary
+        '''
+        return dict(self._compiled(device)[0])
+
+    def request(self, device, nth=0):
+        '''
+        Returns a dictionary of the predicates escaped using a locale of
+        the given device together with the specified 'nth' predicate, as it
+        is sent in search requests. The dictionary is cached, so it must not
+        be changed.
+
+        :param device: A device to escape the predicates for
+        :type device: tadek.connection.device.Device
+        :param nth: A value of the 'nth' predicate
+        :type nth: integer
+        :return: A dictionary of the escaped predicates
+        :rtype: dictionary
+        '''
+        values, patterns, requests = self._compiled(device)
+        request = requests.get(nth)
+        if request is None:
+            if len(requests) > 16:
+                requests.clear()
+            request = requests[nth] = dict(values)
+            request["nth"] = nth
+        return request
+
+    def pattern(self, name, device):
+        '''
+        Returns a compiled regular expression of the predicate of the given
+        name escaped using a locale of the specified device.
+
+        :param name: A name of the predicate
+        :type name: string
+        :param device: A device to escape the predicate for
+        :type device: tadek.connection.device.Device
+        :return: A compiled regular expression or None if the predicate is
+            not a regular expression
+        :rtype: re.RegexObject
+        '''
+        return self._compiled(device)[1].get(name)
+
+    def match(self, accessible):
+        '''
+        Checks if the given accessible satisfies the predicates escaped using
+        a locale of its device.
+
+        :param accessible: An accessible to check
+        :type accessible: tadek.core.accessible.Accessible
+        :return: True if the accessible satisfies the predicates
+        :rtype: boolean
+        '''
+        return search.match(accessible, self._compiled(accessible.device)[0])
 
-__all__ = ["searcher", "searcher_back", "searcher__",
-           "structure", "structure_back", "structure__"]
 
 class BaseSearcher(object):
     '''
@@ -84,18 +221,58 @@ class BaseSearcher(object):
         '''
         if self.method is None:
             raise NotImplementedError
-        self._name = name
-        self._description = description
-        self._role = role
-        self._index = index
-        self._count = count
-        self._action = action
-        self._relation = relation
-        self._state = state
-        self._text = text
-        self._attrs = attrs
+        self._predicates = Predicates(name=name, description=description,
+                                      role=role, index=index, count=count,
+                                      action=action, relation=relation,
+                                      state=state, text=text, **attrs)
         self._nth = nth
 
+    def predicates(self, device=None):
+        '''
+        Returns features of searched widget as a dictionary of predicates.
+        If a device is given then values of the predicates are escaped using
+        its locale.
+
+        :param device: A device to escape the predicates for or None
+        :type device: tadek.connection.device.Device
+        :return: A dictionary of predicates
+        :rtype: dictionary
+        '''
+        if device is None:
+            predicates = dict(self._predicates)
+        else:
+            predicates = self._predicates.escaped(device)
+        predicates["nth"] = self._nth
+        return predicates
+
+    def definition(self, device=None):
+        '''
+        Returns a definition of the searcher as a dictionary of a search
+        method, predicates and a list of searchers of a structure. If a device
+        is given then values of the predicates are escaped using its locale.
+
+        :param device: A device to escape the predicates for or None
+        :type device: tadek.connection.device.Device
+        :return: A definition of the searcher
+        :rtype: dictionary
+        '''
+        return {
+            "method": self.method,
+            "predicates": self.predicates(device),
+            "searchers": ()
+        }
+
+    def _request(self, device):
+        '''
+        Returns a definition of the searcher as it is sent in search requests
+        to the given device, with cached predicates escaped using its locale.
+        '''
+        return {
+            "method": self.method,
+            "predicates": self._predicates.request(device, self._nth),
+            "searchers": ()
+        }
+
     def find(self, accessible):
         '''
         Returns a child widget of the specified widget given as accessible
@@ -107,14 +284,29 @@ class BaseSearcher(object):
         :rtype: tadek.core.accessible.Accessible or NoneType
         '''
         device = accessible.device
-        path = accessible.path
-        return device.searchAccessible(path, self.method, name=self._name,
-                                       description=self._description,
-                                       role=self._role, index=self._index,
-                                       count=self._count, action=self._action,
-                                       relation=self._relation, text=self._text,
-                                       state=self._state, nth=self._nth,
-                                       **self._attrs)
+        return device.searchEscaped(accessible.path, self.method,
+                                    self._predicates.request(device,
+                                                             self._nth))
+
+    def findAll(self, accessible, include=()):
+        '''
+        Returns all child widgets of the specified widget given as accessible
+        that have features specified in the searcher, starting from the nth
+        one, using a single device request.
+
+        :param accessible: The starting point widget as accessible
+        :type accessible: tadek.core.accessible.Accessible
+        :param include: Names of accessible fields to fetch for found widgets
+        :type include: tuple
+        :return: A list of found child widgets as accessibles or None if
+            the device does not support such searching
+        :rtype: list or NoneType
+        '''
+        device = accessible.device
+        return device.searchAllEscaped(accessible.path, self.method,
+                                       self._predicates.request(device,
+                                                                self._nth),
+                                       include=include)
 
 
 class searcher(BaseSearcher):
@@ -209,6 +401,14 @@ class structure(BaseSearcher):
         :return: A found root widget of the structure as accessible
         :rtype: tadek.core.accessible.Accessible or NoneType
         '''
+        request = self._request(accessible.device)
+        found = accessible.device.searchStructureEscaped(accessible.path,
+                                                         request["method"],
+                                                         request["searchers"],
+                                                         request["predicates"])
+        if found is not None:
+            return found[0] if found else None
+        # The device does not support searching of structures at once
         i = self._nth = 0
         struct = BaseSearcher.find(self, accessible)
         while struct:
@@ -225,6 +425,45 @@ class structure(BaseSearcher):
             struct = BaseSearcher.find(self, accessible)
         return None
 
+    def definition(self, device=None):
+        '''
+        Returns a definition of the structure searcher as a dictionary of
+        a search method, predicates and a list of searchers of the structure.
+        If a device is given then values of the predicates are escaped using
+        its locale.
+
+        :param device: A device to escape the predicates for or None
+        :type device: tadek.connection.device.Device
+        :return: A definition of the structure searcher
+        :rtype: dictionary
+        '''
+        definition = BaseSearcher.definition(self, device)
+        definition["predicates"]["nth"] = self._istruct
+        definition["searchers"] = [s.definition(device)
+                                   for s in self._searchers]
+        return definition
+
+    def _request(self, device):
+        '''
+        Returns a definition of the structure searcher as it is sent in search
+        requests to the given device, with cached predicates escaped using
+        its locale.
+        '''
+        return {
+            "method": self.method,
+            "predicates": self._predicates.request(device, self._istruct),
+            "searchers": [s._request(device) for s in self._searchers]
+        }
+
+    def findAll(self, accessible, include=()):
+        '''
+        Structures of widgets cannot be searched using a single device request.
+
+        :return: None
+        :rtype: NoneType
+        '''
+        return None
+
 
 class structure_back(structure):
     '''
@@ -248,6 +487,75 @@ class structure__(structure):
     method = protocol.MHD_SEARCH_DEEP
 
 
+# Names of accessible fields to request for checking predicates
+_PREDICATE_FIELDS = {
+    "name": "name",
+    "description": "description",
+    "role": "role",
+    "count": "count",
+    "action": "actions",
+    "relation": "relations",
+    "state": "states",
+    "text": "text"
+}
+
+class bound(BaseSearcher):
+    '''
+    A class of searchers bound to a path of an already found widget, e.g.
+    one of widgets found using a single findAll() request. A bound searcher
+    does not search, it gets the widget of its path in one request and checks
+    if the widget still has specified features.
+    '''
+    #: A search method
+    method = protocol.MHD_SEARCH_SIMPLE
+
+    def __init__(self, path, **predicates):
+        '''
+        Stores a path and features of the bound widget.
+
+        :param path: A path to the bound widget
+        :type path: tadek.core.accessible.Path
+        :param predicates: Features of the bound widget, the same as in
+            BaseSearcher
+        :type predicates: dictionary
+        '''
+        BaseSearcher.__init__(self, **predicates)
+        self._path = path
+
+    def find(self, accessible):
+        '''
+        Returns the bound widget if it is a descendant of the specified widget
+        given as accessible and it still has features specified in
+        the searcher.
+
+        :param accessible: The starting point widget as accessible
+        :type accessible: tadek.core.accessible.Accessible
+        :return: The bound widget as accessible
+        :rtype: tadek.core.accessible.Accessible or NoneType
+        '''
+        parent = accessible.path.tuple
+        if (len(self._path.tuple) <= len(parent) or
+            self._path.tuple[:len(parent)] != parent):
+            return None
+        fields = {}
+        for name, value in self._predicates:
+            if name != "index":
+                fields[_PREDICATE_FIELDS.get(name, "attributes")] = True
+        acc = accessible.device.getAccessible(self._path, **fields)
+        if acc is None or not self._predicates.match(acc):
+            return None
+        return acc
+
+    def findAll(self, accessible, include=()):
+        '''
+        Bound widgets are got by their paths instead of searching.
+
+        :return: None
+        :rtype: NoneType
+        '''
+        return None
+
+
 def roleSearcher(name, role):
     '''
     Creates new role searcher and deep role searcher (with suffix: `__`)
@@ -34,20 +34,107 @@
 ##                                                                            ##
 ################################################################################
 
+import copy
+import Queue
 import threading
 from datetime import datetime
 
 from tadek.core import log
 from tadek.engine import channels
+from tadek.engine.channels import DISPATCH_SYNC, DISPATCH_DROP
 
 import testexec
 
-__all__ = ["TestResult", "TestStepResult", "TestCaseResult",
-           "TestSuiteResult", "TestResultContainer"]
+__all__ = ["TestResult", "ChannelDispatcher", "TestStepResult",
+           "TestCaseResult", "TestSuiteResult", "TestResultContainer"]
 
 # All classes defined herein are 'new-style' classes
 __metaclass__ = type
 
+# A name of the event that signals flushing of a channel queue
+_FLUSH_EVENT = "flush"
+
+class ChannelDispatcher(threading.Thread):
+    '''
+    A thread class that passes queued test results to a result channel.
+    '''
+    def __init__(self, channel):
+        threading.Thread.__init__(self, name="Channel Dispatcher: %s"
+                                             % channel.name)
+        self.setDaemon(True)
+        self.channel = channel
+        self._policy = channel.dispatchPolicy()
+        self._queue = Queue.Queue(channel.queueSize())
+        #: A number of test results dropped because of the full queue
+        self.dropped = 0
+
+    def put(self, name, result, device):
+        '''
+        Queues an event of the given name with snapshots of a test result and
+        of the related device execution result.
+
+        :param name: A name of the channel method to call
+        :type name: string
+        :param result: A snapshot of a test result to pass through the channel
+        :type result: TestResultBase
+        :param device: A snapshot of a related device execution result
+        :type device: DeviceExecResult
+        '''
+        event = (name, result, device)
+        if self._policy == DISPATCH_DROP:
+            try:
+                self._queue.put_nowait(event)
+            except Queue.Full:
+                self.dropped += 1
+        else:
+            self._queue.put(event)
+
+    def flush(self, timeout=None):
+        '''
+        Waits until all the queued test results are passed to the channel or
+        the given timeout occurs.
+
+        :param timeout: A timeout in seconds or None
+        :type timeout: float
+        :return: True if all the test results were passed, False otherwise
+        :rtype: boolean
+        '''
+        done = threading.Event()
+        self._queue.put((_FLUSH_EVENT, done))
+        done.wait(timeout)
+        return done.isSet()
+
+    def close(self, timeout=None):
+        '''
+        Stops the dispatcher after all the queued test results are passed.
+
+        :param timeout: A timeout in seconds or None
+        :type timeout: float
+        '''
+        self._queue.put(None)
+        self.join(timeout)
+
+    def run(self):
+        '''
+        Passes queued test results to the channel.
+        '''
+        while True:
+            event = self._queue.get()
+            if event is None:
+                break
+            if event[0] == _FLUSH_EVENT:
+                event[1].set()
+                continue
+            if not self.channel.isEnabled():
+                continue
+            name, result, device = event
+            try:
+                getattr(self.channel, name)(result, device)
+            except Exception, err:
+                log.exception(err)
+                self.channel.setEnabled(False)
+
+
 class TestResult:
     '''
     A class to forward test results to result channels.
@@ -56,6 +143,40 @@ class TestResult:
         self._channels = channels.get()
         self._coreDumps = channels.CoreDumpsChannel()
         self._mutex = threading.RLock()
+        self._dispatchers = {}
+
+    def _dispatch(self, name, result, device):
+        '''
+        Passes the given test result through all enabled synchronous channels
+        and returns a list of events with snapshots of the results for
+        dispatchers of other channels. It is called with the mutex acquired,
+        while the events are queued by _queue() after releasing it, so a full
+        queue does not stall other device threads.
+        '''
+        dispatchers = []
+        for channel in self.get():
+            dispatcher = self._dispatchers.get(id(channel))
+            if dispatcher is not None:
+                dispatchers.append(dispatcher)
+            elif channel.isEnabled():
+                try:
+                    getattr(channel, name)(result, device)
+                except Exception, err:
+                    log.exception(err)
+                    channel.setEnabled(False)
+        if not dispatchers:
+            return []
+        result = result.snapshot()
+        device = result.device(device)
+        return [(dispatcher, name, result, device)
+                for dispatcher in dispatchers]
+
+    def _queue(self, events):
+        '''
+        Queues the given events returned by _dispatch() in their dispatchers.
+        '''
+        for dispatcher, name, result, device in events:
+            dispatcher.put(name, result, device)
 
     def get(self, cls=None, name=None):
         '''
@@ -76,6 +197,14 @@ class TestResult:
                 channels.append(channel)
         return channels
 
+    def _isScanned(self, result):
+        '''
+        Checks if core dumps should be scanned at boundaries of the given
+        test result.
+        '''
+        return (self._coreDumps.isScanningSteps()
+                or not isinstance(result, TestStepResult))
+
     def start(self, result):
         '''
         Sends the start result through all enabled channels.
@@ -92,11 +221,35 @@ class TestResult:
                 except Exception, err:
                     log.exception(err)
                     self._channels.remove(channel)
+                    continue
+                policy = getattr(channel, "dispatchPolicy", None)
+                if (policy is None or policy() == DISPATCH_SYNC
+                    or id(channel) in self._dispatchers):
+                    continue
+                dispatcher = ChannelDispatcher(channel)
+                self._dispatchers[id(channel)] = dispatcher
+                dispatcher.start()
             # Core dumps channel
             self._coreDumps.start(result)
         finally:
             self._mutex.release()
 
+    def flush(self, timeout=None):
+        '''
+        Waits until test results queued for all the channels are passed to
+        them or the given timeout occurs.
+
+        :param timeout: A timeout in seconds or None
+        :type timeout: float
+        :return: True if all the test results were passed, False otherwise
+        :rtype: boolean
+        '''
+        done = True
+        for dispatcher in self._dispatchers.values():
+            if not dispatcher.flush(timeout):
+                done = False
+        return done
+
     def stop(self):
         '''
         Sends the stop result through all enabled channels.
@@ -106,6 +259,14 @@ class TestResult:
             # Core dumps channel
             self._coreDumps.stop()
             self._coreDumps.setEnabled(False)
+            # Channel dispatchers
+            for dispatcher in self._dispatchers.itervalues():
+                dispatcher.close()
+                if dispatcher.dropped:
+                    log.warning("Channel '%s' dropped %d test results"
+                                % (dispatcher.channel.name,
+                                   dispatcher.dropped))
+            self._dispatchers.clear()
             # Result channels
             for channel in self.get():
                 try:
@@ -132,25 +293,20 @@ class TestResult:
             execResult.status = testexec.STATUS_NOT_COMPLETED
             execResult.date = datetime.now()
             # Result channels
-            for channel in self.get():
-                if channel.isEnabled():
-                    try:
-                        channel.startTest(result, execResult)
-                    except Exception, err:
-                        log.exception(err)
-                        channel.setEnabled(False)
-            # Core dumps channel
-            if self._coreDumps.isEnabled():
-                try:
-                    self._coreDumps.startTest(execResult, device)
-                except Exception, err:
-                    if isinstance(err, testexec.TestAbortError):
-                        execResult.errors.append(testexec.errorInfo(err))
-                        raise
-                    log.exception(err)
-                    self._coreDumps.setEnabled(False)
+            events = self._dispatch("startTest", result, execResult)
         finally:
             self._mutex.release()
+        self._queue(events)
+        # Core dumps channel scans devices concurrently outside the lock
+        if self._coreDumps.isEnabled() and self._isScanned(result):
+            try:
+                self._coreDumps.startTest(execResult, device)
+            except Exception, err:
+                if isinstance(err, testexec.TestAbortError):
+                    execResult.errors.append(testexec.errorInfo(err))
+                    raise
+                log.exception(err)
+                self._coreDumps.setEnabled(False)
 
     def stopTest(self, result, device):
         '''
@@ -167,38 +323,51 @@ class TestResult:
             dt = datetime.now() - execResult.date
             execResult.time = (dt.days*24*3600 + dt.seconds
                                + dt.microseconds/10.0**6)
-            # Core dumps channel
-            if self._coreDumps.isEnabled() and execResult.cores is not None:
-                try:
-                    self._coreDumps.stopTest(execResult, device)
-                except Exception, err:
-                    execResult.cores = []
-                    if isinstance(err, testexec.TestAbortError):
-                        execResult.errors.append(testexec.errorInfo(err))
-                        execResult.status = err.status
-                        raise
-                    log.exception(err)
-                    self._coreDumps.setEnabled(False)
-            else:
+        finally:
+            self._mutex.release()
+        # Core dumps channel scans devices concurrently outside the lock
+        if self._coreDumps.isEnabled() and execResult.cores is not None:
+            try:
+                self._coreDumps.stopTest(execResult, device)
+            except Exception, err:
                 execResult.cores = []
+                if isinstance(err, testexec.TestAbortError):
+                    execResult.errors.append(testexec.errorInfo(err))
+                    execResult.status = err.status
+                    raise
+                log.exception(err)
+                self._coreDumps.setEnabled(False)
+        else:
+            execResult.cores = []
+        self._mutex.acquire()
+        try:
             # Result channels
-            for channel in self.get():
-                if channel.isEnabled():
-                    try:
-                        channel.stopTest(result, execResult)
-                    except Exception, err:
-                        log.exception(err)
-                        channel.setEnabled(False)
+            events = self._dispatch("stopTest", result, execResult)
         finally:
             self._mutex.release()
+        self._queue(events)
+
+def _deviceId(device):
+    '''
+    Returns an id of the given device or device execution result.
+    '''
+    return device.id() if hasattr(device, "id") else id(device)
+
+def _count(counts, status, delta):
+    '''
+    Adds the given delta to a number of the status in the counts dictionary.
+    '''
+    number = counts.get(status, 0) + delta
+    if number:
+        counts[status] = number
+    else:
+        counts.pop(status, None)
 
 
 class DeviceExecResult:
     '''
     A class to represent test results of device executions.
     '''
-    #: An execution status of a test
-    status = testexec.STATUS_NO_RUN
     #: An execution date of a test
     date = None
     #: An execution time of a test
@@ -207,17 +376,23 @@ class DeviceExecResult:
     result = None
     #: A list of core dumps
     cores = None
+    #: A breakdown of an execution time of a test step into categories
+    #: of tadek.core.timing as a dictionary of times by categories
+    profile = None
+
+    _status = testexec.STATUS_NO_RUN
 
     def __init__(self, device):
-        self._id = device.id() if hasattr(device, "id") else id(device)
+        self._id = _deviceId(device)
         self.name = device.name
         self.description = device.description
         self.address, self.port = device.address
         self.errors = []
+        # Test results that count the status of the device execution
+        self._owners = []
 
     def __eq__(self, device):
-        return self.id() == (device.id() if hasattr(device, "id")
-                                         else id(device))
+        return self.id() == _deviceId(device)
 
     def id(self):
         '''
@@ -225,6 +400,42 @@ class DeviceExecResult:
         '''
         return self._id
 
+    def _getStatus(self):
+        '''
+        Returns an execution status of a test.
+        '''
+        return self._status
+
+    def _setStatus(self, status):
+        '''
+        Sets an execution status of a test and updates status counts of
+        test results the device execution result belongs to.
+        '''
+        previous = self._status
+        self._status = status
+        if previous != status:
+            for owner in self._owners:
+                owner._countStatus(previous, -1)
+                owner._countStatus(status, 1)
+
+    #: An execution status of a test
+    status = property(_getStatus, _setStatus)
+
+    def snapshot(self):
+        '''
+        Returns a copy of the device execution result that is not affected by
+        further changes of the result.
+
+        :return: A copy of the device execution result
+        :rtype: DeviceExecResult
+        '''
+        snapshot = copy.copy(self)
+        snapshot.errors = list(self.errors)
+        if self.cores is not None:
+            snapshot.cores = list(self.cores)
+        snapshot._owners = []
+        return snapshot
+
 
 class TestResultBase:
     '''
@@ -234,12 +445,17 @@ class TestResultBase:
     id = None
     #: A system path to the test suite
     path = None
-    #: A parent result
-    parent = None
+
+    _parent = None
 
     def __init__(self, id=None, path=None, parent=None, attrs=None):
         self.attrs = attrs or {}
         self.children = []
+        self._devices = []
+        self._devicesById = {}
+        # Status counts of own device results and of the whole result tree
+        self._counts = {}
+        self._treeCounts = {}
         if parent:
             self.parent = parent
             parent.children.append(self)
@@ -249,29 +465,147 @@ class TestResultBase:
                 path = parent.path
         self.id = id
         self.path = path
-        self.devices = []
+
+    def _getParent(self):
+        '''
+        Returns a parent result.
+        '''
+        return self._parent
+
+    def _setParent(self, parent):
+        '''
+        Sets a parent result and moves status counts of the result tree
+        from the previous parent to the new one.
+        '''
+        if self._parent is not None:
+            self._parent._rollUp(self._treeCounts, -1)
+        self._parent = parent
+        if parent is not None:
+            parent._rollUp(self._treeCounts, 1)
+
+    #: A parent result
+    parent = property(_getParent, _setParent)
+
+    def _getDevices(self):
+        '''
+        Returns a list of device execution results.
+        '''
+        return self._devices
+
+    def _setDevices(self, devices):
+        '''
+        Replaces device execution results and recounts their statuses.
+        '''
+        for device in self._devices:
+            device._owners.remove(self)
+            self._countStatus(device.status, -1)
+        self._devices = []
+        self._devicesById = {}
+        for device in devices:
+            self._addDevice(device)
+
+    #: A list of device execution results
+    devices = property(_getDevices, _setDevices)
+
+    def _addDevice(self, device):
+        '''
+        Adds the given device execution result to the result.
+        '''
+        self._devices.append(device)
+        self._devicesById[device.id()] = device
+        device._owners.append(self)
+        self._countStatus(device.status, 1)
+
+    def _countStatus(self, status, delta):
+        '''
+        Updates a number of device execution results of the given status
+        in the result and in all its ancestors.
+        '''
+        _count(self._counts, status, delta)
+        self._rollUp({status: delta}, 1)
+
+    def _rollUp(self, counts, sign):
+        '''
+        Adds or subtracts the given status counts to tree status counts
+        of the result and all its ancestors.
+        '''
+        result = self
+        while result is not None:
+            for status, number in counts.iteritems():
+                _count(result._treeCounts, status, sign*number)
+            result = result._parent
 
     def device(self, device):
         '''
         Returns the test execution result related the given device.
         '''
-        if device not in self.devices:
-            self.devices.append(DeviceExecResult(device))
-        return self.devices[self.devices.index(device)]
+        execResult = self._devicesById.get(_deviceId(device))
+        if execResult is None:
+            execResult = DeviceExecResult(device)
+            self._addDevice(execResult)
+        return execResult
+
+    def statusCounts(self, recursive=False):
+        '''
+        Returns numbers of device execution results per status.
+
+        :param recursive: If True then device execution results of all
+            descendant results are counted too
+        :type recursive: boolean
+        :return: A dictionary of statuses and their numbers
+        :rtype: dictionary
+        '''
+        return dict(self._treeCounts if recursive else self._counts)
 
     @property
     def status(self):
         '''
         Returns a summarized status for the test execution result.
         '''
-        statuses = [d.status for d in self.devices]
-        if not statuses:
+        if not self._devices:
             return testexec.STATUS_NO_RUN
         for s in (testexec.STATUS_ERROR, testexec.STATUS_NOT_COMPLETED,
                   testexec.STATUS_FAILED, testexec.STATUS_PASSED):
-            if s in statuses:
+            if s in self._counts:
                 return s
 
+    def _copy(self, parent):
+        '''
+        Returns a copy of the result with the given parent and without
+        children, which does not share any mutable data with the result.
+        '''
+        copied = copy.copy(self)
+        copied.attrs = dict(self.attrs)
+        copied.children = []
+        copied._parent = parent
+        copied._counts = dict(self._counts)
+        copied._treeCounts = dict(self._treeCounts)
+        copied._devices = [device.snapshot() for device in self._devices]
+        copied._devicesById = dict([(device.id(), device)
+                                    for device in copied._devices])
+        return copied
+
+    def snapshot(self):
+        '''
+        Returns a frozen copy of the test result that is not affected by
+        further changes of the result tree. Ancestors and children of
+        the result are copied too, the latter without their own children.
+
+        :return: A copy of the test result
+        :rtype: TestResultBase
+        '''
+        parent = self._parent and self._parent._ancestors()
+        snapshot = self._copy(parent)
+        snapshot.children = [child._copy(snapshot) for child in self.children]
+        return snapshot
+
+    def _ancestors(self):
+        '''
+        Returns a copy of the result and of all its ancestors without
+        children.
+        '''
+        return self._copy(self._parent and self._parent._ancestors())
+
 
 class TestStepResult(TestResultBase):
     '''
@@ -282,6 +616,15 @@ class TestStepResult(TestResultBase):
         self.func = func
         self.args = args or {}
 
+    def _copy(self, parent):
+        '''
+        Returns a copy of the step result with the given parent and without
+        children, which does not share any mutable data with the result.
+        '''
+        copied = TestResultBase._copy(self, parent)
+        copied.args = dict(self.args)
+        return copied
+
 
 class TestCaseResult(TestResultBase):
     '''
@@ -38,15 +38,49 @@ import re
 
 from tadek.core import accessible
 from tadek.core import childiters
+from tadek.core import search
 from tadek.core.locale import escape
+from tadek.connection.device import FIELDS
 from tadek.core.utils import decode
 
 import delay
 import path
 import searchers
 
-__all__ = ["Widget", "App", "Dialog", "Button", "Menu", "PopupMenu", "MenuItem",
-           "Entry", "Valuator", "Link", "Container"]
+__all__ = ["WidgetSnapshot", "Widget", "App", "Dialog", "Button", "Menu",
+           "PopupMenu", "MenuItem", "Entry", "Valuator", "Link", "Container"]
+
+class WidgetSnapshot(object):
+    '''
+    A class of immutable snapshots of widget properties fetched at once.
+    Properties that were not requested are not available in a snapshot.
+    '''
+    __slots__ = ("path", "index", "fields") + tuple(str(f) for f in FIELDS)
+
+    def __init__(self, accessible, fields):
+        '''
+        Copies the given fields of the specified accessible.
+
+        :param accessible: An accessible to take the snapshot of
+        :type accessible: tadek.core.accessible.Accessible
+        :param fields: A list of names of the fields to copy
+        :type fields: list
+        '''
+        setattr = super(WidgetSnapshot, self).__setattr__
+        setattr("path", accessible.path)
+        setattr("index", accessible.index)
+        setattr("fields", tuple(fields))
+        for field in fields:
+            value = getattr(accessible, field)
+            if isinstance(value, list):
+                value = tuple(value)
+            elif isinstance(value, dict):
+                value = dict(value)
+            setattr(str(field), value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Widget snapshots are immutable")
+
 
 class Widget(path.Object):
     '''
@@ -98,12 +132,9 @@ class Widget(path.Object):
         def check(self, accessible, text):
             accessible = accessible.device.getAccessible(accessible.path,
                                                          text=True)
-            if accessible is None or accessible.text is None:
+            if accessible is None:
                 return False
-            if isinstance(text, basestring) and text and text[0] == '&':
-                match = re.compile(text[1:], re.DOTALL).match(accessible.text)
-                return bool(match) and match.span() == (0, len(text))
-            return accessible.text == text
+            return search.matchValue(text, accessible.text)
 
     def addPath(self, *path):
         '''
@@ -133,6 +164,42 @@ class Widget(path.Object):
         '''
         return self.getPath()(device, delay, expectedFailure)
 
+    def snapshot(self, device, fields=None):
+        '''
+        Takes a snapshot of properties of the represented widget. The widget
+        is searched once and all the requested fields are fetched using one
+        request.
+
+        :param device: A device to perform the operation on
+        :type device: tadek.connection.device.Device
+        :param fields: A list of names of the fields to fetch, all if None
+        :type fields: list
+        :return: A snapshot of the widget or None if it is not found
+        :rtype: WidgetSnapshot
+        '''
+        if fields is None:
+            fields = FIELDS
+        for field in fields:
+            if field not in FIELDS:
+                raise ValueError("Invalid widget field: %s" % field)
+        widget = self.getWidget(device)
+        if widget is None:
+            return None
+        kwargs = dict([(str(field), field in fields) for field in FIELDS])
+        widget = device.getAccessible(widget.path, **kwargs)
+        if widget is None:
+            return None
+        return WidgetSnapshot(widget, fields)
+
+    def _getWidget(self, device, snapshot):
+        '''
+        Returns the given snapshot or gets the represented widget if it is
+        None.
+        '''
+        if snapshot is not None:
+            return snapshot
+        return self.getWidget(device)
+
     def getImmediate(self, device):
         '''
         Gets immediate (without waiting) the represented widget or returns None.
@@ -144,91 +211,109 @@ class Widget(path.Object):
         '''
         return self.getPath()(device, delay.immediate, True)
 
-    def getIndex(self, device):
+    def getIndex(self, device, snapshot=None):
         '''
         Gets an index in parent of the represented widget.
 
         :param device: A device to perform the operation on
         :type device: tadek.connection.device.Device
+        :param snapshot: A snapshot of the widget to use instead of
+            fetching it
+        :type snapshot: WidgetSnapshot
         :return: Index of the represented widget
         :rtype: integer
         '''
-        widget = self.getWidget(device)
+        widget = self._getWidget(device, snapshot)
         if widget is None:
             return None
         return widget.index
 
-    def getName(self, device):
+    def getName(self, device, snapshot=None):
         '''
         Gets a name of the represented widget.
 
         :param device: A device to perform the operation on
         :type device: tadek.connection.device.Device
+        :param snapshot: A snapshot of the widget to use instead of
+            fetching it
+        :type snapshot: WidgetSnapshot
         :return: A name of the widget
         :rtype: string
         '''
-        widget = self.getWidget(device)
+        widget = self._getWidget(device, snapshot)
         if widget is None:
             return None
         return widget.name
 
-    def getDescription(self, device):
+    def getDescription(self, device, snapshot=None):
         '''
         Gets a description of the represented widget.
 
         :param device: A device to perform the operation on
         :type device: tadek.connection.device.Device
+        :param snapshot: A snapshot of the widget to use instead of
+            fetching it
+        :type snapshot: WidgetSnapshot
         :return: A description of the widget
         :rtype: string
         '''
-        widget = self.getWidget(device)
+        widget = self._getWidget(device, snapshot)
         if widget is None:
             return None
         return widget.description
 
-    def getRoleName(self, device):
+    def getRoleName(self, device, snapshot=None):
         '''
         Gets a role name of the represented widget.
 
         :param device: A device to perform the operation on
         :type device: tadek.connection.device.Device
+        :param snapshot: A snapshot of the widget to use instead of
+            fetching it
+        :type snapshot: WidgetSnapshot
         :return: A role name of the widget
         :rtype: string
         '''
-        widget = self.getWidget(device)
+        widget = self._getWidget(device, snapshot)
         if widget is None:
             return None
         return widget.role
 
-    def getPosition(self, device):
+    def getPosition(self, device, snapshot=None):
         '''
         Gets a position of the represented widget.
 
         :param device: A device to perform the operation on
         :type device: tadek.connection.device.Device
+        :param snapshot: A snapshot of the widget to use instead of
+            fetching it
+        :type snapshot: WidgetSnapshot
         :return: A position of the widget as (x, y)
         :rtype: tuple
         '''
-        widget = self.getWidget(device)
+        widget = self._getWidget(device, snapshot)
         if widget is None:
             return None
         return widget.position
 
-    def getSize(self, device):
+    def getSize(self, device, snapshot=None):
         '''
         Gets a size of the represented widget.
 
         :param device: A device to perform the operation on
         :type device: tadek.connection.device.Device
+        :param snapshot: A snapshot of the widget to use instead of
+            fetching it
+        :type snapshot: WidgetSnapshot
         :return: A size of the widget as (width, height)
         :rtype: tuple
         '''
-        widget = self.getWidget(device)
+        widget = self._getWidget(device, snapshot)
         if widget is None:
             return None
         return widget.size
 
-    def getAttribute(self, device, attribute=None):
+    def getAttribute(self, device, attribute=None, snapshot=None):
         '''
         Gets a value of the given attribute of the represented widget. If no
         attribute is given then a dictionary containing names and values of
@@ -238,26 +323,32 @@ class Widget(path.Object):
         :type device: tadek.connection.device.Device
         :param attribute: An attribute to return value
         :type attribute: string
+        :param snapshot: A snapshot of the widget to use instead of
+            fetching it
+        :type snapshot: WidgetSnapshot
         :return: A value of the specified attribute
         :rtype: string or dictionary
         '''
-        widget = self.getWidget(device)
+        widget = self._getWidget(device, snapshot)
         if widget is None:
             return None
         if attribute is None:
             return widget.attributes or None
         return widget.attributes.get(attribute, None)
 
-    def getText(self, device):
+    def getText(self, device, snapshot=None):
         '''
         Gets text contained in the represented widget.
 
         :param device: A device to perform the operation on
         :type device: tadek.connection.device.Device
+        :param snapshot: A snapshot of the widget to use instead of
+            fetching it
+        :type snapshot: WidgetSnapshot
         :return: The contained text
         :rtype: string
         '''
-        widget = self.getWidget(device)
+        widget = self._getWidget(device, snapshot)
         if widget is None:
             return None
         return widget.text
@@ -297,7 +388,7 @@ class Widget(path.Object):
         return self.getWidget(device,
                               expectedFailure=expectedFailure) is not None
 
-    def inState(self, device, state, expectedFailure):
+    def inState(self, device, state, expectedFailure, snapshot=None):
         '''
         Checks if the represented widget is in the specified state.
 
@@ -308,15 +399,20 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of polling
+            the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is in the state, False otherwise
         :rtype: boolean
         '''
+        if snapshot is not None:
+            return state in snapshot.states
         widget = self.getWidget(device)
         if widget is None:
             return False
         return delay.state(self._WidgetState(widget, state), expectedFailure)
 
-    def isActive(self, device, expectedFailure=False):
+    def isActive(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'active' state.
 
@@ -325,12 +421,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'active' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is active, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "ACTIVE", expectedFailure)
+        return self.inState(device, "ACTIVE", expectedFailure, snapshot)
 
-    def isChecked(self, device, expectedFailure=False):
+    def isChecked(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'checked' state.
 
@@ -339,12 +438,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'checked' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is checked, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "CHECKED", expectedFailure)
+        return self.inState(device, "CHECKED", expectedFailure, snapshot)
 
-    def isCollapsed(self, device, expectedFailure=False):
+    def isCollapsed(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'collapsed' state.
 
@@ -353,12 +455,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'collapsed' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is collapsed, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "COLLAPSED", expectedFailure)
+        return self.inState(device, "COLLAPSED", expectedFailure, snapshot)
 
-    def isEditable(self, device, expectedFailure=False):
+    def isEditable(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'editable' state.
 
@@ -367,12 +472,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'editable' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is editable, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "EDITABLE", expectedFailure)
+        return self.inState(device, "EDITABLE", expectedFailure, snapshot)
 
-    def isEnabled(self, device, expectedFailure=False):
+    def isEnabled(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'enabled' state.
 
@@ -381,12 +489,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'enabled' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is enabled, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "ENABLED", expectedFailure)
+        return self.inState(device, "ENABLED", expectedFailure, snapshot)
 
-    def isExpandable(self, device, expectedFailure=False):
+    def isExpandable(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'expandable' state.
 
@@ -395,12 +506,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'expandable' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is expandable, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "EXPANDABLE", expectedFailure)
+        return self.inState(device, "EXPANDABLE", expectedFailure, snapshot)
 
-    def isExpanded(self, device, expectedFailure=False):
+    def isExpanded(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'expanded' state.
 
@@ -409,12 +523,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'expanded' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is expanded, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "EXPANDED", expectedFailure)
+        return self.inState(device, "EXPANDED", expectedFailure, snapshot)
 
-    def isFocusable(self, device, expectedFailure=False):
+    def isFocusable(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'focusable' state.
 
@@ -423,12 +540,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'focusable' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is focusable, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "FOCUSABLE", expectedFailure)
+        return self.inState(device, "FOCUSABLE", expectedFailure, snapshot)
 
-    def isFocused(self, device, expectedFailure=False):
+    def isFocused(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'focused' state.
 
@@ -437,12 +557,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'focused' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is focused, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "FOCUSED", expectedFailure)
+        return self.inState(device, "FOCUSED", expectedFailure, snapshot)
 
-    def isMultiselectable(self, device, expectedFailure=False):
+    def isMultiselectable(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'multiselectable' state.
 
@@ -451,12 +574,16 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'multiselectable' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is multiselectable, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "MULTISELECTABLE", expectedFailure)
+        return self.inState(device, "MULTISELECTABLE", expectedFailure,
+                            snapshot)
 
-    def isMultiline(self, device, expectedFailure=False):
+    def isMultiline(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'multiline' state.
 
@@ -465,12 +592,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'multiline' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is multiline, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "MULTILINE", expectedFailure)
+        return self.inState(device, "MULTILINE", expectedFailure, snapshot)
 
-    def isSelectable(self, device, expectedFailure=False):
+    def isSelectable(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'selectable' state.
 
@@ -479,12 +609,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'selectable' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is selectable, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "SELECTABLE", expectedFailure)
+        return self.inState(device, "SELECTABLE", expectedFailure, snapshot)
 
-    def isSelected(self, device, expectedFailure=False):
+    def isSelected(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'selected' state.
 
@@ -493,12 +626,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'selected' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is selected, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "SELECTED", expectedFailure)
+        return self.inState(device, "SELECTED", expectedFailure, snapshot)
 
-    def isSensitive(self, device, expectedFailure=False):
+    def isSensitive(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'sensitive' state.
 
@@ -507,12 +643,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'sensitive' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is sensitive, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "SENSITIVE", expectedFailure)
+        return self.inState(device, "SENSITIVE", expectedFailure, snapshot)
 
-    def isShowing(self, device, expectedFailure=False):
+    def isShowing(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'showing' state.
 
@@ -521,12 +660,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'showing' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is showing, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "SHOWING", expectedFailure)
+        return self.inState(device, "SHOWING", expectedFailure, snapshot)
 
-    def isVisible(self, device, expectedFailure=False):
+    def isVisible(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'visible' state.
 
@@ -535,12 +677,15 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'visible' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is visible, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "VISIBLE", expectedFailure)
+        return self.inState(device, "VISIBLE", expectedFailure, snapshot)
 
-    def isVisited(self, device, expectedFailure=False):
+    def isVisited(self, device, expectedFailure=False, snapshot=None):
         '''
         Checks if the represented widget is in 'visited' state.
 
@@ -549,10 +694,13 @@ class Widget(path.Object):
         :param expectedFailure: It specifies if the widget is not expected to be
             in the 'visited' state
         :type expectedFailure: boolean
+        :param snapshot: A snapshot of the widget to check instead of
+            polling the widget
+        :type snapshot: WidgetSnapshot
         :return: True if the widget is visited, False otherwise
         :rtype: boolean
         '''
-        return self.inState(device, "VISITED", expectedFailure)
+        return self.inState(device, "VISITED", expectedFailure, snapshot)
 
     def doAction(self, device, action):
         '''
@@ -1024,6 +1172,40 @@ class Container(Widget):
     #: A state of a 'current' child (e.g. selected)
     state_of_current = "SELECTED"
 
+    class _Children(Widget._Func):
+        '''
+        A class to search all children of a given widget using a specified
+        searcher. Found children are stored and a positive result is also
+        returned if the device does not support such searching.
+        '''
+        def __init__(self, searcher, accessible):
+            Widget._Func.__init__(self, self.search, searcher, accessible)
+            self.children = None
+
+        def search(self, searcher, accessible):
+            self.children = searcher.findAll(accessible, include=("name",))
+            return self.children is None or bool(self.children)
+
+    def _namePattern(self):
+        '''
+        Returns a name of children as a regular expression or None.
+        '''
+        return (None if self.pattern_of_children is None
+                     else ('&' + self.pattern_of_children))
+
+    def _boundChild(self, accessible, **predicates):
+        '''
+        Returns a Widget instance of the container's child widget bound to
+        a path and a name of the given found accessible and to the specified
+        predicates.
+        '''
+        name = accessible.name
+        if name is not None:
+            name = '&' + re.escape(name)
+        return self.class_of_children(self,
+                                      searchers.bound(accessible.path,
+                                                      name=name, **predicates))
+
     def childIter(self, device):
         '''
         An iterator that yields one Widget instance representing a child widget
@@ -1036,8 +1218,14 @@ class Container(Widget):
         '''
         widget = self.getWidget(device)
         if widget is not None:
-            name = (None if self.pattern_of_children is None
-                         else ('&' + self.pattern_of_children))
+            name = self._namePattern()
+            children = self.searcher_of_children(name=name).findAll(widget,
+                                                            include=("name",))
+            if children is not None:
+                for child in children:
+                    yield self._boundChild(child)
+                return
+            # The device does not support searching of all children at once
             i = 0
             iterator = childiters.getByMethod(self.searcher_of_children.method)
             for child in iterator(widget):
@@ -1047,6 +1235,19 @@ class Container(Widget):
                     i += 1
                     yield child
 
+    def _childSearcher(self, child):
+        '''
+        Returns a searcher of the container's child widget according to
+        the given child argument.
+        '''
+        if isinstance(child, basestring):
+            return self.searcher_of_children(name=child)
+        elif isinstance(child, (int, long)):
+            return self.searcher_of_children(nth=child)
+        elif isinstance(child, searchers.BaseSearcher):
+            return child
+        raise TypeError("Type integer or string or searcher")
+
     def getChild(self, child):
         '''
         Gets a Widget instance representing the container's child widget
@@ -1059,15 +1260,7 @@ class Container(Widget):
             argument was passed
         :rtype: Widget or NoneType
         '''
-        if isinstance(child, basestring):
-            return self.class_of_children(self,
-                                          self.searcher_of_children(name=child))
-        elif isinstance(child, (int, long)):
-            return self.class_of_children(self,
-                                          self.searcher_of_children(nth=child))
-        elif isinstance(child, searchers.BaseSearcher):
-            return self.class_of_children(self, child)
-        raise TypeError("Type integer or string or searcher")
+        return self.class_of_children(self, self._childSearcher(child))
 
     __getitem__ = getChild
 
@@ -1084,8 +1277,17 @@ class Container(Widget):
         :return: True if the container contains the child, False otherwise
         :rtype: boolean
         '''
-        child = self.getChild(child)
-        return child.getWidget(device) is not None
+        searcher = self._childSearcher(child)
+        widget = self.getWidget(device)
+        if widget is None:
+            return False
+        children = self._Children(searcher, widget)
+        delay.default(children)
+        if children.children is None:
+            # The device does not support searching of all children at once
+            child = self.class_of_children(self, searcher)
+            return child.getWidget(device) is not None
+        return bool(children.children)
 
     def notin(self, device, child):
         '''
@@ -1104,16 +1306,31 @@ class Container(Widget):
         child = self.getChild(child)
         return child.getWidget(device, expectedFailure=True) is None
 
-    def getCurrent(self):
+    def getCurrent(self, device=None):
         '''
         Gets a Widget instance representing 'current' child widget (e.g. the
-        selected one) of the represented container widget.
+        selected one) of the represented container widget. If a device is
+        given then the 'current' child widget is checked to exist on it using
+        a single request and the returned widget is bound to it.
 
-        :return: The 'current' child widget
-        :rtype: Widget
+        :param device: A device to check the 'current' child widget on or None
+        :type device: tadek.connection.device.Device
+        :return: The 'current' child widget or None if it does not exist on
+            the given device
+        :rtype: Widget or NoneType
         '''
-        name = (None if self.pattern_of_children is None
-                     else ('&' + self.pattern_of_children))
-        return self.class_of_children(self, self.searcher_of_children(name=name,
-                                                   state=self.state_of_current))
-
+        searcher = self.searcher_of_children(name=self._namePattern(),
+                                             state=self.state_of_current)
+        current = self.class_of_children(self, searcher)
+        if device is None:
+            return current
+        widget = self.getWidget(device)
+        if widget is None:
+            return None
+        children = searcher.findAll(widget, include=("name",))
+        if children is None:
+            # The device does not support searching of all children at once
+            return current if current.getImmediate(device) else None
+        if not children:
+            return None
+        return self._boundChild(children[0], state=self.state_of_current)
@@ -0,0 +1,229 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import sys
+import json
+import time
+import platform
+
+__all__ = ["DEFAULT_SCALES", "DEFAULT_REPEAT", "DEFAULT_TOLERANCE",
+           "Benchmark", "benchmark", "getBenchmarks", "run", "compare",
+           "load", "save"]
+
+#: Scales of workloads run by default
+DEFAULT_SCALES = (100, 1000, 10000, 100000)
+#: A default number of repeats of each workload
+DEFAULT_REPEAT = 5
+#: A default relative slowdown that is reported as a regression
+DEFAULT_TOLERANCE = 0.25
+
+if sys.platform == "win32":
+    _timer = time.clock
+else:
+    _timer = time.time
+
+# A list of registered benchmarks
+_benchmarks = []
+
+class Benchmark(object):
+    '''
+    A class of benchmarks of synthetic workloads.
+    '''
+    def __init__(self, name, setup, maxScale=None):
+        self.name = name
+        self.setup = setup
+        self.maxScale = maxScale
+
+    def measure(self, scale, repeat=DEFAULT_REPEAT):
+        '''
+        Prepares and runs the workload of the given scale the specified number
+        of times and returns the sorted times of the runs.
+
+        :param scale: A number of nodes, tasks, messages, etc. to process
+        :type scale: integer
+        :param repeat: A number of runs
+        :type repeat: integer
+        :return: A sorted list of times of the runs in seconds
+        :rtype: list
+        '''
+        times = []
+        for i in xrange(max(repeat, 1)):
+            work = self.setup(scale)
+            start = _timer()
+            work()
+            times.append(_timer() - start)
+        times.sort()
+        return times
+
+
+def benchmark(name, maxScale=None):
+    '''
+    A decorator that registers a benchmark of the given name. The decorated
+    function gets a scale, prepares a workload and returns a function that
+    processes it, only the latter is timed.
+
+    :param name: A name of the benchmark
+    :type name: string
+    :param maxScale: The biggest scale run by the benchmark or None
+    :type maxScale: integer
+    '''
+    def register(setup):
+        _benchmarks.append(Benchmark(name, setup, maxScale))
+        return setup
+    return register
+
+def getBenchmarks(names=()):
+    '''
+    Returns a list of registered benchmarks, only those of names starting
+    with one of the given ones if any.
+
+    :param names: Prefixes of names of benchmarks
+    :type names: list
+    :return: A list of benchmarks
+    :rtype: list
+    '''
+    return [bench for bench in _benchmarks
+            if not names or [n for n in names if bench.name.startswith(n)]]
+
+def run(benchmarks, scales=DEFAULT_SCALES, repeat=DEFAULT_REPEAT, out=None):
+    '''
+    Runs the given benchmarks at the specified scales and returns a report
+    of the results.
+
+    :param benchmarks: A list of benchmarks to run
+    :type benchmarks: list
+    :param scales: A list of scales
+    :type scales: list
+    :param repeat: A number of runs of each workload
+    :type repeat: integer
+    :param out: A stream to print progress to or None
+    :type out: file
+    :return: A report as a dictionary
+    :rtype: dictionary
+    '''
+    results = {}
+    for bench in benchmarks:
+        results[bench.name] = {}
+        for scale in scales:
+            if bench.maxScale and scale > bench.maxScale:
+                continue
+            times = bench.measure(scale, repeat)
+            elapsed = times[0]
+            results[bench.name][str(scale)] = {
+                "time": elapsed,
+                "median": _median(times),
+                "perOp": elapsed / scale
+            }
+            if out is not None:
+                out.write("%-24s %8d %12.6f s %12.3f us/op\n"
+                          % (bench.name, scale, elapsed,
+                             elapsed / scale * 1000000))
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results
+    }
+
+def _median(times):
+    '''
+    Returns a median of the given sorted list of times.
+    '''
+    middle = len(times) // 2
+    if len(times) % 2:
+        return times[middle]
+    return (times[middle - 1] + times[middle]) / 2.0
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    '''
+    Compares times of the given report with the specified baseline one and
+    returns a list of comparisons of workloads present in both of them as
+    tuples of a name, a scale, a baseline time, a time and a ratio of
+    the times. The minimum times of runs are compared and so are
+    the median ones, a ratio is the smaller one of both, so a single noisy
+    run does not make a regression. Comparisons of a ratio above
+    1 + tolerance are regressions.
+
+    :param report: A report of benchmarks
+    :type report: dictionary
+    :param baseline: A baseline report of benchmarks
+    :type baseline: dictionary
+    :param tolerance: A relative slowdown that is a regression
+    :type tolerance: float
+    :return: A list of comparisons and a list of regressions
+    :rtype: tuple
+    '''
+    comparisons = []
+    regressions = []
+    for name, scales in sorted(report["results"].iteritems()):
+        base = baseline["results"].get(name, {})
+        for scale, result in sorted(scales.iteritems(),
+                                    key=lambda item: int(item[0])):
+            if scale not in base or not base[scale]["time"]:
+                continue
+            ratio = result["time"] / base[scale]["time"]
+            if base[scale].get("median") and "median" in result:
+                ratio = min(ratio,
+                            result["median"] / base[scale]["median"])
+            comparison = (name, int(scale), base[scale]["time"],
+                          result["time"], ratio)
+            comparisons.append(comparison)
+            if ratio > 1 + tolerance:
+                regressions.append(comparison)
+    return comparisons, regressions
+
+def load(file):
+    '''
+    Loads a report of benchmarks from the given JSON file.
+    '''
+    fd = open(file)
+    try:
+        return json.load(fd)
+    finally:
+        fd.close()
+
+def save(report, file):
+    '''
+    Saves the given report of benchmarks to the specified JSON file or
+    writes it to the given stream.
+    '''
+    fd = open(file, 'w') if isinstance(file, basestring) else file
+    try:
+        json.dump(report, fd, indent=2, sort_keys=True)
+        fd.write('\n')
+    finally:
+        if fd is not file:
+            fd.close()
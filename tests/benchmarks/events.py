@@ -0,0 +1,117 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import time
+import atexit
+import shutil
+import datetime
+import tempfile
+import cStringIO
+
+from tadek.engine import testexec
+from tadek.engine import testresult
+from tadek.core.structs import FileDetails
+from tadek.engine.channels.xmlchannel import XmlChannel
+from tadek.engine.channels.streamchannel import StreamChannel
+
+from engine.commons import FakeDevice
+from benchmark import benchmark
+
+__all__ = []
+
+_tmpdir = []
+
+def _dirname():
+    '''
+    Returns a temporary directory for result files removed at exit.
+    '''
+    if not _tmpdir:
+        _tmpdir.append(tempfile.mkdtemp(prefix="tadek-bench-"))
+        atexit.register(shutil.rmtree, _tmpdir[0], True)
+    return _tmpdir[0]
+
+@benchmark("xmlchannel.events", maxScale=100)
+def events(n):
+    '''
+    Sends start and stop events of the given number of test cases to an XML
+    channel, which writes its result file on each event.
+    '''
+    suite = testresult.TestSuiteResult(id="Suite")
+    cases = [testresult.TestCaseResult(id="Case%d" % i, parent=suite)
+             for i in xrange(n)]
+    device = testresult.DeviceExecResult(FakeDevice())
+    device.date = datetime.datetime.now()
+    device.cores = []
+    channel = XmlChannel("Benchmark", dirname=_dirname(), verbose=False)
+    def work():
+        channel.start(None)
+        for case in cases:
+            device.status = testexec.STATUS_NOT_COMPLETED
+            channel.startTest(case, device)
+            device.status = testexec.STATUS_PASSED
+            device.time = 0.1
+            channel.stopTest(case, device)
+        channel.stop()
+    return work
+
+@benchmark("streamchannel.verbose")
+def verbose(n):
+    '''
+    Sends start and stop events of the given number of test results, cycling
+    through a suite, a case and a step with attributes, arguments, a core dump
+    and an error, to a verbose stream channel.
+    '''
+    suite = testresult.TestSuiteResult(id="Suite", attrs={"a": 1})
+    case = testresult.TestCaseResult(id="Case", parent=suite, attrs={"b": 2})
+    step = testresult.TestStepResult(id="Step", parent=case, func="step",
+                                     args={"c": 3}, attrs={"d": 4})
+    results = (suite, case, step)
+    device = testresult.DeviceExecResult(FakeDevice())
+    device.date = datetime.datetime.now()
+    device.time = 1.5
+    device.status = testexec.STATUS_PASSED
+    device.cores = [FileDetails("/tmp/core.1", mtime=time.time(), size=1024)]
+    device.errors = ["Error"]
+    channel = StreamChannel("Benchmark", stream=cStringIO.StringIO(),
+                            verbose=True)
+    def work():
+        channel.start(None)
+        for i in xrange(n):
+            result = results[i % len(results)]
+            channel.startTest(result, device)
+            channel.stopTest(result, device)
+        channel.stop()
+    return work
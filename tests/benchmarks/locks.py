@@ -0,0 +1,92 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+from tadek.engine.runner import DeviceLock
+
+from benchmark import benchmark
+
+__all__ = []
+
+class _Device(object):
+    name = "Benchmark"
+    box = None
+
+    def isConnected(self):
+        return True
+
+
+class _TestExec(object):
+    def abort(self, condition, message):
+        pass
+
+    def abortIf(self, condition, message):
+        pass
+
+
+@benchmark("devicelock.static")
+def static(n):
+    '''
+    Reads an attribute of a device that is never changed by a remote call,
+    so it is got without checking the lock state.
+    '''
+    lock = DeviceLock(_Device(), _TestExec())
+    def work():
+        for i in xrange(n):
+            lock.name
+    return work
+
+@benchmark("devicelock.dynamic")
+def dynamic(n):
+    '''
+    Reads an attribute of a device that checks the lock state every time.
+    '''
+    lock = DeviceLock(_Device(), _TestExec())
+    def work():
+        for i in xrange(n):
+            lock.box
+    return work
+
+@benchmark("devicelock.call")
+def call(n):
+    '''
+    Calls a method of a device through a cached wrapper that checks the lock
+    state once per call.
+    '''
+    lock = DeviceLock(_Device(), _TestExec())
+    def work():
+        for i in xrange(n):
+            lock.isConnected()
+    return work
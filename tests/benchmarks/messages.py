@@ -0,0 +1,79 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+from tadek.connection import protocol
+from tadek.core.accessible import Path
+
+from benchmark import benchmark
+
+__all__ = []
+
+_INCLUDE = [u"name", u"role", u"count"]
+
+def _requests(n):
+    '''
+    Creates the given number of accessible requests of different paths.
+    '''
+    return [protocol.create(protocol.MSG_TYPE_REQUEST,
+                            protocol.MSG_TARGET_ACCESSIBILITY,
+                            protocol.MSG_NAME_GET, path=Path(0, i % 10, i),
+                            depth=0, include=_INCLUDE) for i in xrange(n)]
+
+@benchmark("protocol.create")
+def create(n):
+    def work():
+        for i in xrange(n):
+            protocol.create(protocol.MSG_TYPE_REQUEST,
+                            protocol.MSG_TARGET_ACCESSIBILITY,
+                            protocol.MSG_NAME_GET, path=Path(0, i % 10, i),
+                            depth=0, include=_INCLUDE)
+    return work
+
+@benchmark("protocol.marshal")
+def marshal(n):
+    requests = _requests(n)
+    def work():
+        for request in requests:
+            request.marshal()
+    return work
+
+@benchmark("protocol.parse")
+def parse(n):
+    data = [request.marshal() for request in _requests(n)]
+    def work():
+        for item in data:
+            protocol.parse(item)
+    return work
@@ -0,0 +1,87 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import threading
+
+from tadek.core.queue import Queue, QueueItem
+
+from benchmark import benchmark
+
+__all__ = []
+
+#: A number of threads putting items to the queue
+PRODUCERS = 4
+#: A number of threads getting items of distinct ids from the queue
+CONSUMERS = 8
+
+@benchmark("queue.get", maxScale=10000)
+def get(n):
+    '''
+    Gets items by ids from a queue filled beforehand, every second one out
+    of order as responses to requests of many devices are.
+    '''
+    queue = Queue()
+    for i in xrange(n):
+        queue.put(QueueItem(i))
+    ids = range(1, n, 2) + range(0, n, 2)
+    def work():
+        for id in ids:
+            queue.get(id)
+    return work
+
+@benchmark("queue.contention", maxScale=10000)
+def contention(n):
+    '''
+    Producer threads put items of consumer ids to a queue, while consumer
+    threads concurrently block on getting items of their ids.
+    '''
+    queue = Queue()
+    def produce(start):
+        for i in xrange(start, n, PRODUCERS):
+            queue.put(QueueItem(i % CONSUMERS))
+    def consume(id):
+        for i in xrange(len(xrange(id, n, CONSUMERS))):
+            queue.get(id)
+    threads = ([threading.Thread(target=consume, args=(id,))
+                for id in xrange(CONSUMERS)] +
+               [threading.Thread(target=produce, args=(start,))
+                for start in xrange(PRODUCERS)])
+    def work():
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return work
@@ -0,0 +1,86 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+from tadek.engine.tasker import TestTasker
+from tadek.engine.testdefs import TestStep, TestCase, TestSuite
+
+from benchmark import benchmark
+
+__all__ = []
+
+#: A number of test cases in each synthetic test suite
+CASES = 10
+
+def _step(test, device):
+    pass
+
+def _suite(n):
+    '''
+    Creates a test suite of the given number of test cases grouped
+    in nested suites of CASES cases each.
+    '''
+    suites = {}
+    for i in xrange(0, n, CASES):
+        cases = dict([("case%02d" % j, TestCase(TestStep(_step, {}, {})))
+                      for j in xrange(min(CASES, n - i))])
+        suites["suite%06d" % i] = type("Suite%d" % i, (TestSuite,), cases)()
+    return type("Suite", (TestSuite,), suites)()
+
+@benchmark("tasker.create")
+def create(n):
+    suite = _suite(n)
+    def work():
+        TestTasker(suite)
+    return work
+
+@benchmark("tasker.get", maxScale=10000)
+def get(n):
+    '''
+    Gets all tasks of a tasker, first excluding tasks of a few suites as
+    devices do for suites they are not allowed to run.
+    '''
+    tasker = TestTasker(_suite(n))
+    # Ids of nested suites follow the id of the root one and an id of its
+    # direct test cases
+    root = tasker._suites[0].id
+    exclude = [root + 2 + i for i in xrange(min(2, (n + CASES - 1) / CASES))]
+    def work():
+        for ids in (exclude, None):
+            task = tasker.get(exclude=ids)
+            while task is not None:
+                task.done()
+                task = tasker.get(exclude=ids)
+    return work
@@ -0,0 +1,76 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+from xml.etree import cElementTree as etree
+
+from tadek.core.accessible import Path, Accessible
+
+from benchmark import benchmark
+
+__all__ = []
+
+#: A number of children of each accessible of synthetic trees
+FANOUT = 10
+
+def _tree(n, path=None, number=0):
+    '''
+    Creates a tree of the given number of accessibles, where the accessible
+    numbered k in level order has children numbered from k * FANOUT + 1.
+    '''
+    if path is None:
+        path = Path()
+    first = number * FANOUT + 1
+    children = [_tree(n, path.child(i), first + i)
+                for i in xrange(min(FANOUT, max(0, n - first)))]
+    acc = Accessible(path, children)
+    acc.role = u"PANEL" if children else u"PUSH_BUTTON"
+    acc.name = u"Accessible %d" % number
+    acc.states = [u"ENABLED", u"VISIBLE"]
+    return acc
+
+@benchmark("accessible.marshal")
+def marshal(n):
+    root = _tree(n)
+    def work():
+        root.marshal()
+    return work
+
+@benchmark("accessible.unmarshal")
+def unmarshal(n):
+    element = etree.fromstring(etree.tostring(_tree(n).marshal()))
+    def work():
+        Accessible.unmarshal(element)
+    return work
@@ -36,3 +36,7 @@
 
 from protocol import *
 from dirfiles import *
+from dirchanges import *
+from client import *
+from simulator import *
+from tracing import *
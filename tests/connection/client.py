@@ -0,0 +1,232 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+import os
+import time
+import unittest
+from xml.etree import cElementTree as etree
+
+from tadek.connection import protocol
+from tadek.connection.client import Client, Recorder
+from tadek.connection.device import OfflineDevice, ReplayDevice
+from tadek.core import dump
+from tadek.core.accessible import Path, Accessible
+
+from core.search import _table
+
+__all__ = ["XmlClientTest", "XmlClientDumpTest", "ReplayClientTest"]
+
+class XmlClientTest(unittest.TestCase):
+    _TEST_FILE = os.path.abspath(os.path.join("tests", "_xmlclient.xml"))
+
+    def _dump(self):
+        root = Accessible(Path(), children=(_table(10),))
+        etree.ElementTree(root.marshal()).write(self._TEST_FILE)
+        return self._TEST_FILE
+
+    def setUp(self):
+        self.device = OfflineDevice("Offline", self._dump())
+        self.device.connect()
+
+    def tearDown(self):
+        self.device.disconnect()
+        for file in (self._TEST_FILE, XmlClientDumpTest._TEST_DUMP_FILE):
+            if os.path.exists(file):
+                os.remove(file)
+
+    def testGetAccessible(self):
+        acc = self.device.getAccessible(Path(0, 0, 3, 1))
+        self.failUnlessEqual(u"Value 3", acc.name)
+        self.failUnlessEqual(None, self.device.getAccessible(Path(0, 1)))
+
+    def testSearchAccessible(self):
+        acc = self.device.searchAccessible(Path(), protocol.MHD_SEARCH_DEEP,
+                                           role=u"TABLE_CELL", nth=3)
+        self.failUnlessEqual(Path(0, 0, 1, 1), acc.path)
+        acc = self.device.searchAccessible(Path(0, 0),
+                                           protocol.MHD_SEARCH_BACKWARDS,
+                                           name=u"Row", nth=1)
+        self.failUnlessEqual(Path(0, 0, 8), acc.path)
+        self.failUnlessEqual(None,
+            self.device.searchAccessible(Path(0, 0, 3),
+                                         protocol.MHD_SEARCH_DEEP,
+                                         role=u"TABLE_ROW"))
+
+    def testSearchAccessibles(self):
+        found = self.device.searchAccessibles(Path(0, 0),
+                                              protocol.MHD_SEARCH_SIMPLE,
+                                              role=u"TABLE_ROW", nth=8)
+        self.failUnlessEqual([Path(0, 0, 8), Path(0, 0, 9)],
+                             [acc.path for acc in found])
+
+    def testSearchStructure(self):
+        searchers = [{
+            "method": protocol.MHD_SEARCH_SIMPLE,
+            "predicates": {"state": u"SELECTED"}
+        }]
+        found = self.device.searchStructure(Path(), protocol.MHD_SEARCH_DEEP,
+                                            searchers, role=u"TABLE_ROW",
+                                            nth=1)
+        self.failUnlessEqual([Path(0, 0, 3)], [acc.path for acc in found])
+        found = self.device.searchStructure(Path(), protocol.MHD_SEARCH_DEEP,
+                                            searchers, role=u"TABLE_ROW",
+                                            nth=5)
+        self.failUnlessEqual([], found)
+
+    def testSearchAccessiblesOldResponse(self):
+        response = protocol.create(protocol.MSG_TYPE_RESPONSE,
+                                   protocol.MSG_TARGET_ACCESSIBILITY,
+                                   protocol.MSG_NAME_SEARCH, status=True,
+                                   accessible=Accessible(Path(0, 0)))
+        self.failIf(hasattr(response, "accessibles"))
+        self.failUnlessEqual(None,
+            self.device._accessibles("searchAccessibles", response))
+        self.failUnlessEqual(None,
+            self.device.searchAccessibles(Path(0, 0),
+                                          protocol.MHD_SEARCH_SIMPLE))
+
+
+class XmlClientDumpTest(XmlClientTest):
+    _TEST_DUMP_FILE = os.path.abspath(os.path.join("tests", "_xmlclient.dmp"))
+
+    def _dump(self):
+        dump.convert(XmlClientTest._dump(self), self._TEST_DUMP_FILE)
+        return self._TEST_DUMP_FILE
+
+    def testLazyChildren(self):
+        acc = self.device.getAccessible(Path(0, 0))
+        self.failUnlessEqual(10, acc.count)
+        self.failUnlessEqual([u"Row"] * 10,
+                             [child.name for child in acc.children()])
+
+    def testSubtreeDump(self):
+        element = etree.ElementTree(file=self._TEST_FILE).getroot()
+        table = element.find("children")[0].find("children")[0]
+        etree.ElementTree(table).write(self._TEST_FILE)
+        dump.convert(self._TEST_FILE, self._TEST_DUMP_FILE)
+        self.device.disconnect()
+        self.device.connect()
+        acc = self.device.getAccessible(Path(0, 3, 1))
+        self.failUnlessEqual(u"Value 3", acc.name)
+        self.failUnlessEqual(None, self.device.getAccessible(Path(0, 10)))
+
+
+class ReplayClientTest(unittest.TestCase):
+    _TEST_FILE = os.path.abspath(os.path.join("tests", "_replayclient.rec"))
+
+    def _request(self, path):
+        return protocol.create(protocol.MSG_TYPE_REQUEST,
+                               protocol.MSG_TARGET_ACCESSIBILITY,
+                               protocol.MSG_NAME_GET, path=path, depth=0,
+                               include=[u"name", u"role", u"count"])
+
+    def _response(self, request, name):
+        accessible = Accessible(request.path)
+        accessible.name = name
+        response = protocol.create(protocol.MSG_TYPE_RESPONSE,
+                                   protocol.MSG_TARGET_ACCESSIBILITY,
+                                   protocol.MSG_NAME_GET, status=True,
+                                   accessible=accessible)
+        response.id = request.id
+        return response
+
+    def _record(self, recorder, request, name, latency=0.0):
+        recorder.request(request)
+        time.sleep(latency)
+        response = self._response(request, name)
+        recorder.response(response, response.marshal())
+
+    def setUp(self):
+        recorder = Recorder(self._TEST_FILE)
+        recorder.connect()
+        info = protocol.create(protocol.MSG_TYPE_RESPONSE,
+                               protocol.MSG_TARGET_SYSTEM,
+                               protocol.MSG_NAME_INFO, status=True,
+                               version=u"1.0", locale=u"",
+                               extensions=[u"dirfiles"])
+        recorder.response(info, info.marshal())
+        self._record(recorder, self._request(Path(0)), u"Before", 0.2)
+        self._record(recorder, self._request(Path(0, 1)), u"Child")
+        self._record(recorder, self._request(Path(0)), u"After")
+        recorder.close()
+
+    def tearDown(self):
+        if os.path.exists(self._TEST_FILE):
+            os.remove(self._TEST_FILE)
+
+    def testReplay(self):
+        device = ReplayDevice("Replay", self._TEST_FILE)
+        device.connect()
+        self.failUnlessEqual(u"1.0", device.version)
+        self.failUnlessEqual([u"dirfiles"], device.extensions)
+        start = time.time()
+        self.failUnlessEqual(u"Child", device.getAccessible(Path(0, 1)).name)
+        self.failUnlessEqual(u"Before", device.getAccessible(Path(0)).name)
+        self.failUnlessEqual(u"After", device.getAccessible(Path(0)).name)
+        self.failUnlessEqual(u"After", device.getAccessible(Path(0)).name)
+        self.failUnless(time.time() - start < 0.2)
+        self.failUnlessEqual(None, device.getAccessible(Path(1)))
+        device.disconnect()
+        self.failIf(device.isConnected())
+
+    def testReplayRealTime(self):
+        device = ReplayDevice("Replay", self._TEST_FILE, realtime=True)
+        device.connect()
+        start = time.time()
+        self.failUnlessEqual(u"Before", device.getAccessible(Path(0)).name)
+        self.failUnless(time.time() - start >= 0.2)
+        device.disconnect()
+
+    def testClientRecording(self):
+        client = Client()
+        client.startRecording(self._TEST_FILE)
+        self.failUnless(client.isRecording())
+        request = self._request(Path(2))
+        client.request(request)
+        client.collect_incoming_data(self._response(request,
+                                                    u"Recorded").marshal())
+        client.found_terminator()
+        client.stopRecording()
+        self.failIf(client.isRecording())
+        self.failUnlessEqual(u"Recorded",
+                             client.response(request.id).accessible.name)
+        device = ReplayDevice("Replay", self._TEST_FILE)
+        device.client.connect(self._TEST_FILE)
+        self.failUnlessEqual(u"Recorded", device.getAccessible(Path(2)).name)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
@@ -0,0 +1,119 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import os
+import shutil
+import unittest
+
+from tadek.connection import protocol
+from tadek.connection.protocol import dirchanges
+
+__all__ = ["DirChangesExtensionTest"]
+
+class DirChangesExtensionTest(unittest.TestCase):
+    _TEST_FILE_PATTERN = ".+\\.dat"
+    _TEST_ROOT_DIR = os.path.abspath(os.path.join("tests", "_dirchanges"))
+
+    def _createFile(self, *path, **kwargs):
+        path = os.path.join(self._TEST_ROOT_DIR, *path)
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        fd = open(path, "wb")
+        try:
+            fd.write('0' * kwargs.get("size", 256))
+        finally:
+            fd.close()
+        return path
+
+    def _changes(self, cursor=u'', **params):
+        params = self.dirChanges.request(self._TEST_ROOT_DIR,
+                                         self._TEST_FILE_PATTERN,
+                                         cursor=cursor, **params)
+        status, result = self.dirChanges.response(**params)
+        self.failUnless(status)
+        return sorted([fd.path for fd in result["files"]]), result["cursor"]
+
+    def setUp(self):
+        self.dirChanges = protocol.getExtension("dirchanges")
+        self.failUnless(self.dirChanges)
+        self._files = [self._createFile("file1.dat"),
+                       self._createFile("file2.txt"),
+                       self._createFile("dir3", "file31.dat")]
+
+    def tearDown(self):
+        dirchanges._indexes.clear()
+        shutil.rmtree(self._TEST_ROOT_DIR)
+
+    def testAllFiles(self):
+        files, cursor = self._changes()
+        self.failUnlessEqual([self._files[0]], files)
+        files, cursor = self._changes(recursive=True)
+        self.failUnlessEqual([self._files[2], self._files[0]], files)
+
+    def testNoChanges(self):
+        files, cursor = self._changes()
+        files, cursor = self._changes(cursor)
+        self.failUnlessEqual([], files)
+
+    def testNewFile(self):
+        files, cursor = self._changes(recursive=True)
+        path = self._createFile("dir3", "file32.dat")
+        self._createFile("dir3", "file33.txt")
+        files, cursor = self._changes(cursor, recursive=True)
+        self.failUnlessEqual([path], files)
+        files, cursor = self._changes(cursor, recursive=True)
+        self.failUnlessEqual([], files)
+
+    def testChangedFile(self):
+        files, cursor = self._changes()
+        self._createFile("file1.dat", size=512)
+        files, cursor = self._changes(cursor)
+        self.failUnlessEqual([self._files[0]], files)
+
+    def testInvalidCursor(self):
+        files, cursor = self._changes(u"invalid:1")
+        self.failUnlessEqual([self._files[0]], files)
+
+    def testNoDirectory(self):
+        params = self.dirChanges.request(os.path.join(self._TEST_ROOT_DIR,
+                                                      "dir4"))
+        status, result = self.dirChanges.response(**params)
+        self.failIf(status)
+        self.failUnlessEqual([], result["files"])
+
+
+if __name__ == "__main__":
+    unittest.main()
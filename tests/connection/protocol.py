@@ -164,6 +164,78 @@ class MessagesTest(unittest.TestCase):
         for name in params:
             self.failUnlessEqual(getattr(req, name), params[name])
 
+    def testSearchAllA11yRequest(self):
+        params = {
+            "path": Path(0, 1, 2, 3),
+            "method": protocol.MHD_SEARCH_DEEP,
+            "predicates": {
+                            "name": u"&Test.*",
+                            "nth": 2
+            },
+            "include": (u"name", u"states")
+        }
+        req = protocol.create(protocol.MSG_TYPE_REQUEST,
+                              protocol.MSG_TARGET_ACCESSIBILITY,
+                              protocol.MSG_NAME_SEARCH, **params)
+        self.failUnless(isinstance(req, message.Request))
+        cls = type(req)
+        req = protocol.parse(req.marshal())
+        self.failUnless(isinstance(req, cls))
+        for name in params:
+            self.failUnlessEqual(getattr(req, name), params[name])
+
+    def testSearchStructureA11yRequest(self):
+        params = {
+            "path": Path(0, 1),
+            "method": protocol.MHD_SEARCH_DEEP,
+            "predicates": {
+                            "role": u"TABLE_ROW",
+                            "nth": 1
+            },
+            "searchers": [{
+                "method": protocol.MHD_SEARCH_SIMPLE,
+                "predicates": {
+                                "name": u"TestName",
+                                "nth": 0
+                },
+                "searchers": ({
+                    "method": protocol.MHD_SEARCH_BACKWARDS,
+                    "predicates": {
+                                    "nth": 2
+                    },
+                    "searchers": ()
+                },)
+            }]
+        }
+        req = protocol.create(protocol.MSG_TYPE_REQUEST,
+                              protocol.MSG_TARGET_ACCESSIBILITY,
+                              protocol.MSG_NAME_SEARCH, **params)
+        self.failUnless(isinstance(req, message.Request))
+        cls = type(req)
+        req = protocol.parse(req.marshal())
+        self.failUnless(isinstance(req, cls))
+        for name in ("path", "method", "predicates"):
+            self.failUnlessEqual(getattr(req, name), params[name])
+        searcher = req.searchers[0]
+        self.failUnlessEqual(searcher["predicates"],
+                             params["searchers"][0]["predicates"])
+        self.failUnlessEqual(searcher["searchers"],
+                             params["searchers"][0]["searchers"])
+
+    def testSearchStructureA11yRequestError(self):
+        try:
+            protocol.create(protocol.MSG_TYPE_REQUEST,
+                            protocol.MSG_TARGET_ACCESSIBILITY,
+                            protocol.MSG_NAME_SEARCH, path=Path(0),
+                            method=protocol.MHD_SEARCH_SIMPLE,
+                            predicates={}, searchers=[{"predicates": {}}])
+        except parameters.ParameterError:
+            pass
+        except:
+            self.failIf(True)
+        else:
+            self.failIf(True)
+
     def testPutTextA11yRequest(self):
         params = {
             "path": Path(0, 1, 2, 3),
@@ -331,6 +403,22 @@ class MessagesTest(unittest.TestCase):
         self.failUnlessEqual(res.accessible.path, accessible.path)
         self.failUnlessEqual(res.status, True)
 
+    def testSearchAllA11yResponse(self):
+        accessibles = (Accessible(Path(0, 1)), Accessible(Path(0, 1, 2)))
+        accessibles[0].name = u"TestName"
+        res = protocol.create(protocol.MSG_TYPE_RESPONSE,
+                              protocol.MSG_TARGET_ACCESSIBILITY,
+                              protocol.MSG_NAME_SEARCH,
+                              accessibles=accessibles, status=True)
+        self.failUnless(isinstance(res, message.Response))
+        cls = type(res)
+        res = protocol.parse(res.marshal())
+        self.failUnless(isinstance(res, cls))
+        self.failUnlessEqual([a.path for a in res.accessibles],
+                             [a.path for a in accessibles])
+        self.failUnlessEqual(res.accessibles[0].name, u"TestName")
+        self.failUnlessEqual(res.status, True)
+
     def testPutA11yResponse(self):
         res = protocol.create(protocol.MSG_TYPE_RESPONSE,
                               protocol.MSG_TARGET_ACCESSIBILITY,
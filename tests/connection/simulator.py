@@ -0,0 +1,138 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import os
+import time
+import unittest
+
+from tadek.connection import protocol
+from tadek.connection.device import Device
+from tadek.connection.simulator import SimulatedDaemon, syntheticTree
+from tadek.core.accessible import Path, Accessible
+
+from core.search import _table
+
+__all__ = ["SimulatedDaemonTest"]
+
+class SimulatedDaemonTest(unittest.TestCase):
+    def _start(self, tree=None, **params):
+        self.daemon = SimulatedDaemon(("127.0.0.1", 0), tree, seed=0, **params)
+        self.daemon.start()
+        self.device = Device("Simulated", *self.daemon.address)
+        self.device.connect()
+
+    def setUp(self):
+        self.daemon = None
+        self.device = None
+
+    def tearDown(self):
+        if self.device is not None:
+            self.device.disconnect()
+        if self.daemon is not None:
+            self.daemon.stop()
+
+    def testSyntheticTree(self):
+        root = syntheticTree(depth=3, fanout=4)
+        self.failUnlessEqual(4, root.count)
+        leaf = list(list(list(root.children())[1].children())[2].children())[3]
+        self.failUnlessEqual(Path(1, 2, 3), leaf.path)
+        self.failUnlessEqual(u"Node 1.2.3", leaf.name)
+        self.failUnlessEqual(0, leaf.count)
+
+    def testGetAccessible(self):
+        self._start()
+        self.failUnless(self.device.isConnected())
+        self.failUnlessEqual([u"dirfiles", u"utime"], self.device.extensions)
+        acc = self.device.getAccessible(Path(0, 1), depth=1)
+        self.failUnlessEqual(u"Node 0.1", acc.name)
+        self.failUnlessEqual(5, acc.count)
+        children = list(acc.children(force=False))
+        self.failUnlessEqual(5, len(children))
+        self.failUnlessEqual(0, len(list(children[0].children(force=False))))
+        self.failUnlessEqual(None, self.device.getAccessible(Path(9)))
+
+    def testSearchAccessible(self):
+        self._start(Accessible(Path(), children=(_table(10),)))
+        acc = self.device.searchAccessible(Path(), protocol.MHD_SEARCH_DEEP,
+                                           role=u"TABLE_CELL", nth=3)
+        self.failUnlessEqual(Path(0, 0, 1, 1), acc.path)
+        accs = self.device.searchAccessibles(Path(0), protocol.MHD_SEARCH_DEEP,
+                                             name=u"&Value [0-4]")
+        self.failUnlessEqual(5, len(accs))
+
+    def testSetAndDoAccessible(self):
+        self._start()
+        path = Path(0, 1, 2, 3)
+        self.failUnless(self.device.setAccessible(path, text=u"Text"))
+        self.failUnlessEqual(u"Text", self.daemon.tree._index.get(path).text)
+        self.failIf(self.device.setAccessible(Path(0, 1), text=u"Text"))
+        self.failUnless(self.device.doAccessible(path, u"CLICK"))
+        self.failIf(self.device.doAccessible(Path(0, 1), u"CLICK"))
+
+    def testSystem(self):
+        self._start()
+        self.failUnless(self.device.putFile(u"/tmp/file", u"Data"))
+        self.failUnlessEqual(u"Data", self.device.getFile(u"/tmp/file"))
+        self.failUnlessEqual(None, self.device.getFile(u"/tmp/missing"))
+        self.failUnlessEqual((True, u'', u''),
+                             self.device.systemExec(u"ls"))
+
+    def testExtension(self):
+        self._start()
+        path = os.path.abspath(os.path.dirname(__file__))
+        status, files = self.device.extension(u"dirfiles", path=path,
+                                              pattern=r".+\.py")
+        self.failUnless(status)
+        self.failUnless(os.path.join(path, "simulator.py") in
+                        [file.path for file in files])
+
+    def testLatency(self):
+        self._start(latency=0.2, jitter=0.05)
+        start = time.time()
+        self.device.getAccessible(Path(0))
+        self.failUnless(time.time() - start >= 0.15)
+
+    def testBandwidth(self):
+        self._start(bandwidth=20000)
+        start = time.time()
+        acc = self.device.getAccessible(Path(), depth=-1)
+        self.failUnlessEqual(5, acc.count)
+        self.failUnless(time.time() - start >= 0.1)
+
+    def testFailures(self):
+        self._start(failures=1.0)
+        self.failUnlessEqual(None, self.device.getAccessible(Path(0)))
+        self.failIf(self.device.putFile(u"/tmp/file", u"Data"))
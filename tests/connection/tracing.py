@@ -0,0 +1,132 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import unittest
+
+from tadek.connection import protocol
+from tadek.connection import tracing
+from tadek.connection.device import Device
+from tadek.connection.simulator import SimulatedDaemon
+from tadek.core.accessible import Path
+
+__all__ = ["TracerTest", "DeviceTracingTest"]
+
+def _request(path):
+    return protocol.create(protocol.MSG_TYPE_REQUEST,
+                           protocol.MSG_TARGET_ACCESSIBILITY,
+                           protocol.MSG_NAME_GET, path=path, depth=0,
+                           include=[u"name"])
+
+class TracerTest(unittest.TestCase):
+    def _trace(self, tracer, request, start):
+        tracer.begin(request, start)
+        for i, stage in enumerate(tracing.STAGES[1:]):
+            tracer.mark(request.id, stage, start + 0.001 * (i + 1))
+
+    def testSpan(self):
+        spans = []
+        tracer = tracing.Tracer(hook=spans.append)
+        request = _request(Path(0))
+        self._trace(tracer, request, 10.0)
+        self.failUnlessEqual(1, len(spans))
+        span = spans[0]
+        self.failUnlessEqual(request.id, span.id)
+        self.failUnlessEqual(10.0, span.stamp(tracing.STAGE_CREATED))
+        durations = span.durations()
+        self.failUnlessAlmostEqual(0.006, durations["total"])
+        self.failUnlessAlmostEqual(0.001, durations[tracing.STAGE_SENT])
+        self.failUnlessEqual([span], tracer.spans())
+
+    def testUnknownRequest(self):
+        tracer = tracing.Tracer()
+        tracer.mark(protocol.INFO_MSG_ID, tracing.STAGE_DEQUEUED)
+        self.failUnlessEqual([], tracer.spans())
+
+    def testUnsent(self):
+        tracer = tracing.Tracer()
+        request = _request(Path(0))
+        tracer.begin(request)
+        tracer.unsent(request.id)
+        tracer.sent()
+        tracer.mark(request.id, tracing.STAGE_DEQUEUED)
+        self.failIf(tracer.spans()[0].stamp(tracing.STAGE_SENT) is None)
+
+    def testRingBuffer(self):
+        tracer = tracing.Tracer(size=4)
+        requests = [_request(Path(i)) for i in xrange(10)]
+        for request in requests:
+            self._trace(tracer, request, 1.0)
+        self.failUnlessEqual(sorted([r.id for r in requests[-4:]]),
+                             sorted([s.id for s in tracer.spans()]))
+
+    def testHistograms(self):
+        tracer = tracing.Tracer()
+        for i in xrange(100):
+            self._trace(tracer, _request(Path(i)), 1.0)
+        histograms = tracer.histograms()
+        self.failUnlessEqual([(protocol.MSG_TARGET_ACCESSIBILITY,
+                               protocol.MSG_NAME_GET)], histograms.keys())
+        total = histograms.values()[0]["total"]
+        self.failUnlessEqual(100, total.count)
+        self.failUnlessAlmostEqual(0.006, total.mean())
+        self.failUnless(0.006 <= total.percentile(99) <= 0.0082)
+
+
+class DeviceTracingTest(unittest.TestCase):
+    def setUp(self):
+        self.daemon = SimulatedDaemon(("127.0.0.1", 0), latency=0.01)
+        self.daemon.start()
+        self.device = Device("Simulated", *self.daemon.address)
+        self.device.connect()
+
+    def tearDown(self):
+        self.device.disconnect()
+        self.daemon.stop()
+
+    def testTracing(self):
+        self.failUnlessEqual(None, self.device.tracer)
+        tracer = self.device.startTracing()
+        self.failUnless(tracer is self.device.tracer)
+        for i in xrange(3):
+            self.device.getAccessible(Path(0, i))
+        self.device.stopTracing()
+        self.device.getAccessible(Path(0))
+        spans = tracer.spans()
+        self.failUnlessEqual(3, len(spans))
+        for span in spans:
+            self.failIf(None in span.stamps)
+            self.failUnlessEqual(sorted(span.stamps), span.stamps)
+            self.failUnless(span.durations()["total"] >= 0.01)
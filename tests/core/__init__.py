@@ -40,3 +40,5 @@ from devices import *
 from locale import *
 from location import *
 from utils import *
+from search import *
+from timing import *
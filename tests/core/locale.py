@@ -132,6 +132,16 @@ class LocaleTest(unittest.TestCase):
         self.failUnlessEqual(locale.gettext(_MSG1_ID, device), _TRANS1)
         self.failUnlessEqual(locale.gettext(_MSG2_ID, device), _MSG2_ID)
 
+    def testChanges(self):
+        changes = locale.changes()
+        self._addLocaleDir("locale1")
+        self.failUnless(locale.changes() > changes)
+        changes = locale.changes()
+        self._addLocaleDir("locale1")
+        self.failUnlessEqual(changes, locale.changes())
+        locale.reset()
+        self.failUnless(locale.changes() > changes)
+
     def testGetTextTranslatedMsg1(self):
         self._addLocaleDir("locale1")
         self._addLocaleDir("locale2")
@@ -292,3 +302,21 @@ class LocaleTest(unittest.TestCase):
         self.failUnless(isinstance(msg, locale.MessageSum))
         self.failUnlessEqual(str(msg),  _MSG1_ID + " " + _MSG2_ID)
 
+
+    def testNGetTextMemoRemove(self):
+        self._addLocaleDir("locale1")
+        device = _Device()
+        self.failUnlessEqual(locale.ngettext(_SING_ID, _PLUR_ID, 5, device),
+                             _PLUR_TRANS)
+        self._removeLocaleDir("locale1")
+        self.failUnlessEqual(locale.ngettext(_SING_ID, _PLUR_ID, 5, device),
+                             _PLUR_ID)
+
+    def testGetTextCatalogLanguages(self):
+        self._addLocaleDir("locale1")
+        device = _Device()
+        self.failUnlessEqual(locale.gettext(_MSG1_ID, device), _TRANS1)
+        device.locale = "C"
+        self.failUnlessEqual(locale.gettext(_MSG1_ID, device), _MSG1_ID)
+        device.locale = "en_US"
+        self.failUnlessEqual(locale.gettext(_MSG1_ID, device), _MSG1_ID)
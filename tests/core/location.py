@@ -36,6 +36,9 @@
 
 import os
 import sys
+import time
+import shutil
+import tempfile
 import unittest
 
 from tadek import models
@@ -44,7 +47,7 @@ from tadek import testcases
 from tadek import testsuites
 from tadek.core import location
 
-__all__ = ["LocationTest"]
+__all__ = ["LocationTest", "DiscoveryIndexTest"]
 
 
 _LOCATION_DIR = os.path.abspath("tests")
@@ -55,8 +58,13 @@ _TESTSUITES_DIR = os.path.join(_LOCATION_DIR, "testsuites")
 
 
 class LocationTest(unittest.TestCase):
+    def setUp(self):
+        self._index = location._index
+        location._index = location.DiscoveryIndex()
+
     def tearDown(self):
         location.remove(_LOCATION_DIR)
+        location._index = self._index
 
     def testAdd(self):
         location.add(_LOCATION_DIR)
@@ -231,3 +239,92 @@ class LocationTest(unittest.TestCase):
         self.failUnless("suitespkg2.suitesmdl21" in suites)
         self.failUnless("suitespkg2.suitesmdl22" in suites)
 
+
+class DiscoveryIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.file = os.path.join(self.tmp, "cache", "discovery.json")
+        self.dir = os.path.join(self.tmp, "location")
+        self.pkg = os.path.join(self.dir, "pkg")
+        os.makedirs(self.pkg)
+        for path in ("__init__.py", "mdl1.py"):
+            open(os.path.join(self.pkg, path), 'w').close()
+        self._resolution = location._MTIME_RESOLUTION
+        location._MTIME_RESOLUTION = 0.0
+        self._getDirContent = location._getDirContent
+        self.scans = []
+        def getDirContent(dir, package=None, stamps=None):
+            if package is None:
+                self.scans.append(dir)
+            return self._getDirContent(dir, package, stamps)
+        location._getDirContent = getDirContent
+
+    def tearDown(self):
+        location._getDirContent = self._getDirContent
+        location._MTIME_RESOLUTION = self._resolution
+        shutil.rmtree(self.tmp)
+
+    def _touch(self, path):
+        mtime = os.stat(path).st_mtime + 10
+        os.utime(path, (mtime, mtime))
+
+    def testContent(self):
+        index = location.DiscoveryIndex()
+        content = index.content(self.dir)
+        self.failUnlessEqual(sorted(content), ["pkg", "pkg.mdl1"])
+        self.failUnlessEqual(index.content(self.dir), content)
+        self.failUnlessEqual(self.scans, [self.dir])
+
+    def testContentAddedModule(self):
+        index = location.DiscoveryIndex()
+        index.content(self.dir)
+        open(os.path.join(self.pkg, "mdl2.py"), 'w').close()
+        self._touch(self.pkg)
+        self.failUnless("pkg.mdl2" in index.content(self.dir))
+        self.failUnlessEqual(self.scans, [self.dir, self.dir])
+
+    def testContentNewPackage(self):
+        index = location.DiscoveryIndex()
+        dir = os.path.join(self.dir, "dir")
+        os.mkdir(dir)
+        self.failIf("dir" in index.content(self.dir))
+        open(os.path.join(dir, "__init__.py"), 'w').close()
+        self._touch(dir)
+        self.failUnless("dir" in index.content(self.dir))
+
+    def testContentRecentChange(self):
+        location._MTIME_RESOLUTION = 3600.0
+        index = location.DiscoveryIndex()
+        index.content(self.dir)
+        index.content(self.dir)
+        self.failUnlessEqual(self.scans, [self.dir, self.dir])
+
+    def testSuites(self):
+        index = location.DiscoveryIndex()
+        path = os.path.join(self.pkg, "mdl1.py")
+        self.failUnlessEqual(index.suites(path), None)
+        index.setSuites(path, ["Suite1", "Suite2"])
+        self.failUnlessEqual(index.suites(path), ["Suite1", "Suite2"])
+        self._touch(path)
+        self.failUnlessEqual(index.suites(path), None)
+
+    def testSaveLoad(self):
+        index = location.DiscoveryIndex(self.file)
+        path = os.path.join(self.pkg, "mdl1.py")
+        content = index.content(self.dir)
+        index.setSuites(path, ["Suite1"])
+        index.save()
+        self.failIf(index.dirty)
+        index = location.DiscoveryIndex(self.file)
+        self.failUnlessEqual(index.content(self.dir), content)
+        self.failUnlessEqual(index.suites(path), ["Suite1"])
+        self.failUnlessEqual(self.scans, [self.dir])
+
+    def testLoadInvalid(self):
+        os.mkdir(os.path.dirname(self.file))
+        fd = open(self.file, 'w')
+        fd.write("{invalid")
+        fd.close()
+        index = location.DiscoveryIndex(self.file)
+        self.failUnless(index.content(self.dir))
+
@@ -0,0 +1,207 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import unittest
+
+from tadek.connection import protocol
+from tadek.core import search
+from tadek.core.accessible import Path, Accessible
+
+__all__ = ["SearchTest", "AccessibleIndexTest"]
+
+def _accessible(path, role, name, children=(), **params):
+    acc = Accessible(Path(*path), children=children)
+    acc.role = role
+    acc.name = name
+    for attr, value in params.iteritems():
+        setattr(acc, attr, value)
+    return acc
+
+def _table(nrows):
+    rows = []
+    for i in xrange(nrows):
+        cells = (_accessible((0, 0, i, 0), u"TABLE_CELL", u"Cell %d" % i,
+                             states=[u"SELECTED"] if i % 2 else []),
+                 _accessible((0, 0, i, 1), u"TABLE_CELL", u"Value %d" % i))
+        rows.append(_accessible((0, 0, i), u"TABLE_ROW", u"Row", cells))
+    table = _accessible((0, 0), u"TABLE", u"Table", rows)
+    return _accessible((0,), u"FRAME", u"Frame", (table,))
+
+
+class SearchTest(unittest.TestCase):
+    def setUp(self):
+        self.root = Accessible(Path(), children=(_table(10),))
+
+    def testMatch(self):
+        acc = _accessible((0,), u"BUTTON", u"Test button", text=u"Line\nText",
+                          states=[u"ENABLED"], actions=[u"CLICK"])
+        acc.attributes["toolkit"] = u"gtk"
+        self.failUnless(search.match(acc, {"name": u"Test button",
+                                           "role": u"BUTTON", "nth": 3}))
+        self.failUnless(search.match(acc, {"name": u"&Test.*",
+                                           "text": u"&Line.Text",
+                                           "state": u"ENABLED",
+                                           "action": u"CLICK",
+                                           "toolkit": u"&g.k"}))
+        self.failIf(search.match(acc, {"name": u"&Test"}))
+        self.failIf(search.match(acc, {"description": u"&.*"}))
+        self.failIf(search.match(acc, {"state": u"FOCUSED"}))
+        self.failIf(search.match(acc, {"toolkit": u"qt"}))
+
+    def testMatchValue(self):
+        self.failUnless(search.matchValue(u"&Line.Text", u"Line\nText"))
+        self.failIf(search.matchValue(u"&Line", u"Line\nText"))
+        self.failIf(search.matchValue(u"&Line\nTex", u"Line\nText"))
+        self.failUnless(search.matchValue(u"Text", u"Text"))
+        self.failIf(search.matchValue(u"Text", None))
+
+    def testCompilePattern(self):
+        self.failUnlessEqual(None, search.compilePattern(u"Text"))
+        self.failUnlessEqual(None, search.compilePattern(None))
+        self.failUnlessEqual(None, search.compilePattern(1))
+        regexp = search.compilePattern(u"&T.xt")
+        self.failUnless(regexp is search.compilePattern(u"&T.xt"))
+
+    def testSearchSimple(self):
+        acc = search.search(self.root, protocol.MHD_SEARCH_SIMPLE,
+                            {"role": u"FRAME"})
+        self.failUnlessEqual(Path(0), acc.path)
+        self.failUnlessEqual(None, search.search(self.root,
+                                                 protocol.MHD_SEARCH_SIMPLE,
+                                                 {"role": u"TABLE"}))
+
+    def testSearchDeep(self):
+        acc = search.search(self.root, protocol.MHD_SEARCH_DEEP,
+                            {"role": u"TABLE_CELL", "nth": 3})
+        self.failUnlessEqual(Path(0, 0, 1, 1), acc.path)
+
+    def testSearchBackwards(self):
+        table = search.search(self.root, protocol.MHD_SEARCH_DEEP,
+                              {"role": u"TABLE"})
+        acc = search.search(table, protocol.MHD_SEARCH_BACKWARDS,
+                            {"role": u"TABLE_ROW", "nth": 1})
+        self.failUnlessEqual(Path(0, 0, 8), acc.path)
+
+    def testSearchAll(self):
+        found = search.searchAll(self.root, protocol.MHD_SEARCH_DEEP,
+                                 {"name": u"&Cell \\d", "nth": 2})
+        self.failUnlessEqual([Path(0, 0, i, 0) for i in xrange(2, 10)],
+                             [acc.path for acc in found])
+
+    def testSearchStructure(self):
+        searchers = (
+            {"method": protocol.MHD_SEARCH_SIMPLE,
+             "predicates": {"name": u"&Cell .*", "state": u"SELECTED"}},
+            {"method": protocol.MHD_SEARCH_SIMPLE,
+             "predicates": {"name": u"&Value [0-9]"}},
+        )
+        acc = search.search(self.root, protocol.MHD_SEARCH_DEEP,
+                            {"role": u"TABLE_ROW", "nth": 2}, searchers)
+        self.failUnlessEqual(Path(0, 0, 5), acc.path)
+        acc = search.search(self.root, protocol.MHD_SEARCH_DEEP,
+                            {"role": u"TABLE_ROW", "nth": 5}, searchers)
+        self.failUnlessEqual(None, acc)
+
+    def testSearchNestedStructure(self):
+        searchers = (
+            {"method": protocol.MHD_SEARCH_SIMPLE,
+             "predicates": {"role": u"TABLE_ROW", "nth": 0},
+             "searchers": (
+                {"method": protocol.MHD_SEARCH_SIMPLE,
+                 "predicates": {"name": u"Value 7"}},)},
+        )
+        acc = search.search(self.root, protocol.MHD_SEARCH_DEEP,
+                            {"role": u"TABLE"}, searchers)
+        self.failUnlessEqual(Path(0, 0), acc.path)
+        acc = search.search(self.root, protocol.MHD_SEARCH_DEEP,
+                            {"role": u"TABLE", "nth": 1}, searchers)
+        self.failUnlessEqual(None, acc)
+
+class AccessibleIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.root = Accessible(Path(), children=(_table(10),))
+        self.index = search.AccessibleIndex(self.root)
+
+    def testGet(self):
+        self.failUnlessEqual(1 + 1 + 1 + 10 + 20, len(self.index))
+        self.failUnlessEqual(u"Value 7",
+                             self.index.get(Path(0, 0, 7, 1)).name)
+        self.failUnless(self.index.get(Path()) is self.root)
+        self.failUnlessEqual(None, self.index.get(Path(0, 0, 10)))
+
+    def testSearchLikeUnindexed(self):
+        table = self.index.get(Path(0, 0))
+        for acc, method, predicates in (
+            (self.root, protocol.MHD_SEARCH_DEEP,
+             {"role": u"TABLE_CELL", "nth": 3}),
+            (table, protocol.MHD_SEARCH_DEEP,
+             {"name": u"Row", "nth": 4}),
+            (self.index.get(Path(0, 0, 5)), protocol.MHD_SEARCH_DEEP,
+             {"role": u"TABLE_CELL", "name": u"Value 5"}),
+            (table, protocol.MHD_SEARCH_DEEP, {"name": u"&Value [3-5]"}),
+            (table, protocol.MHD_SEARCH_BACKWARDS,
+             {"role": u"TABLE_ROW", "nth": 1}),
+            (table, protocol.MHD_SEARCH_SIMPLE, {"role": u"TABLE_CELL"})):
+            self.failUnless(search.search(acc, method, predicates) is
+                            search.search(acc, method, predicates,
+                                          index=self.index))
+            self.failUnlessEqual(search.searchAll(acc, method, predicates),
+                                 search.searchAll(acc, method, predicates,
+                                                  index=self.index))
+
+    def testSearchDescendantsOnly(self):
+        row = self.index.get(Path(0, 0, 2))
+        found = search.searchAll(row, protocol.MHD_SEARCH_DEEP,
+                                 {"role": u"TABLE_CELL"}, index=self.index)
+        self.failUnlessEqual([Path(0, 0, 2, 0), Path(0, 0, 2, 1)],
+                             [acc.path for acc in found])
+        self.failUnlessEqual(None, search.search(row, protocol.MHD_SEARCH_DEEP,
+                                                 {"role": u"TABLE_ROW"},
+                                                 index=self.index))
+
+    def testSearchStructure(self):
+        searchers = (
+            {"method": protocol.MHD_SEARCH_DEEP,
+             "predicates": {"role": u"TABLE_CELL", "state": u"SELECTED"}},
+        )
+        acc = search.search(self.root, protocol.MHD_SEARCH_DEEP,
+                            {"role": u"TABLE_ROW", "nth": 2}, searchers,
+                            index=self.index)
+        self.failUnlessEqual(Path(0, 0, 5), acc.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
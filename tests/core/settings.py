@@ -40,7 +40,8 @@ import unittest
 from tadek.core import config, settings
 import pdb
 
-__all__ = ["SettingsTest", "SettingsOptionTest", "SettingsSectionTest"]
+__all__ = ["SettingsTest", "SettingsOptionTest", "SettingsSectionTest",
+           "SettingsSnapshotTest"]
 
 _PROGRAM_NAME = 'unittest'
 
@@ -399,6 +400,69 @@ class SettingsSectionTest(unittest.TestCase):
             self.assertEqual(option.get(), refDict[option.name()])
 
 
+class SettingsSnapshotTest(unittest.TestCase):
+    _filename = '__testCaseSettingsSnapshot__'
+
+    def setUp(self):
+        self._file = os.path.join(config._USER_CONF_DIR, _PROGRAM_NAME,
+                                  self._filename + config._CONF_FILE_EXT)
+        try:
+            os.remove(self._file)
+        except OSError:
+            pass
+        config.reload()
+
+    def tearDown(self):
+        config.reload()
+        try:
+            os.remove(self._file)
+        except OSError:
+            pass
+
+    def testForcedGetDoesNotWrite(self):
+        config.set(self._filename, "Test", "test_1", "1")
+        stamp = os.stat(self._file).st_mtime
+        option = settings.get(self._filename, "Test", "test_1", force=True)
+        self.assertEqual("1", option.get())
+        self.assertEqual(stamp, os.stat(self._file).st_mtime)
+        self.assertFalse(settings._META_OPTION_NAME in open(self._file).read())
+        settings.flush()
+        self.assertTrue(settings._META_OPTION_NAME in open(self._file).read())
+
+    def testSnapshot(self):
+        settings.set(self._filename, "Test", "test_1", "1")
+        config.set(self._filename, "Other", "test_2", "2")
+        snap = settings.snapshot(self._filename)
+        self.assertTrue(snap is settings.snapshot(self._filename))
+        self.assertEqual(["Test"], list(snap))
+        self.assertEqual(["test_1"], snap.options("Test"))
+        self.assertEqual("1", snap.get("Test", "test_1"))
+        self.assertEqual("x", snap.get("Other", "test_2", "x"))
+        self.assertRaises(AttributeError, setattr, snap, "_sections", {})
+        settings.set(self._filename, "Test", "test_1", "11")
+        self.assertEqual("1", snap.get("Test", "test_1"))
+        snap = settings.snapshot(self._filename)
+        self.assertEqual("11", snap.get("Test", "test_1"))
+
+    def testModifiedFile(self):
+        settings.set(self._filename, "Test", "test_1", "1")
+        snap = settings.snapshot(self._filename)
+        fd = open(self._file, 'w')
+        try:
+            fd.write("[Test]\n%s = %s\ntest_1 = 2\n[Test2]\n"
+                     % (settings._META_OPTION_NAME,
+                        settings._META_OPTION_VALUE))
+        finally:
+            fd.close()
+        interval = config._MTIME_CHECK_INTERVAL
+        config._MTIME_CHECK_INTERVAL = 0.0
+        try:
+            snap = settings.snapshot(self._filename)
+        finally:
+            config._MTIME_CHECK_INTERVAL = interval
+        self.assertEqual("2", snap.get("Test", "test_1"))
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,76 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import time
+import unittest
+
+from tadek.core import timing
+
+__all__ = ["StepProfileTest"]
+
+class StepProfileTest(unittest.TestCase):
+    def tearDown(self):
+        timing.stop()
+
+    def testNotProfiled(self):
+        self.failUnlessEqual(None, timing.current())
+        timing.sleep(0.01)
+        self.failUnlessEqual(None, timing.stop())
+
+    def testBreakdown(self):
+        profile = timing.start()
+        self.failUnless(profile is timing.current())
+        timing.sleep(0.05)
+        profile.request(1, u"a11y", u"get", time.time() - 0.2)
+        profile.response(1)
+        profile.response(2)
+        self.failUnless(timing.stop() is profile)
+        self.failUnlessEqual(None, timing.current())
+        breakdown = profile.breakdown()
+        self.failUnless(breakdown[timing.CATEGORY_SLEEP] >= 0.05)
+        self.failUnless(breakdown[timing.CATEGORY_REMOTE + "a11y/get"] >= 0.2)
+        self.failUnlessEqual(3, len(breakdown))
+        self.failUnless(breakdown[timing.CATEGORY_LOCAL] >= 0.0)
+
+    def testNestedMeasurements(self):
+        profile = timing.start()
+        stamp = profile.enter(timing.CATEGORY_TRANSLATION)
+        timing.sleep(0.02)
+        profile.leave(timing.CATEGORY_TRANSLATION, stamp)
+        timing.stop()
+        breakdown = profile.breakdown()
+        self.failIf(timing.CATEGORY_SLEEP in breakdown)
+        self.failUnless(breakdown[timing.CATEGORY_TRANSLATION] >= 0.02)
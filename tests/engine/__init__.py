@@ -41,4 +41,6 @@ from contexts import *
 from loader import *
 from runner import *
 from tasker import *
+from searchers import *
+from widgets import *
 from channels import *
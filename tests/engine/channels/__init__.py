@@ -38,3 +38,4 @@ from basechannels import *
 from xmlchannel import *
 from streamchannel import *
 from summarychannel import *
+from sqlitechannel import *
@@ -0,0 +1,106 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import os
+import unittest
+
+from tadek.engine import testexec
+from tadek.engine.channels.sqlitechannel import SqliteChannel, ResultStore
+
+import helpers
+
+__all__ = ["SqliteChannelTest"]
+
+class SqliteChannelTest(unittest.TestCase):
+    _dbFile = "/tmp/_test_sqlitechannel.db"
+
+    def setUp(self):
+        self.channel = SqliteChannel("Test", filename=self._dbFile)
+
+    def tearDown(self):
+        if os.path.exists(self._dbFile):
+            os.remove(self._dbFile)
+
+    def _run(self, statuses, times):
+        suites, cases, steps = helpers.structResult(1, 1, len(times))
+        device = helpers.deviceResult()
+        self.channel.start(None)
+        for step, status, time in zip(steps, statuses, times):
+            self.channel.startTest(step, device)
+            device.status = status
+            device.time = time
+            self.channel.stopTest(step, device)
+        device.status = statuses[-1]
+        self.channel.stopTest(cases[0], device)
+        self.channel.stop()
+        return steps, cases[0]
+
+    def testNoResults(self):
+        self.channel.start(None)
+        self.channel.stop()
+        self.failIf(os.path.exists(self._dbFile))
+
+    def testStatusHistory(self):
+        steps, case = self._run([testexec.STATUS_PASSED], [1.0])
+        self._run([testexec.STATUS_FAILED], [2.0])
+        store = self.channel.read(self._dbFile)
+        try:
+            self.failUnlessEqual(2, len(store.runs()))
+            history = store.statusHistory(case.id)
+            self.failUnlessEqual([testexec.STATUS_PASSED,
+                                  testexec.STATUS_FAILED],
+                                 [status for run, device, status, date, time
+                                         in history])
+            self.failIf(store.statusHistory(case.id, device="Unknown"))
+        finally:
+            store.close()
+
+    def testSlowestSteps(self):
+        self._run([testexec.STATUS_PASSED] * 3, [1.0, 5.0, 2.0])
+        steps, case = self._run([testexec.STATUS_ERROR], [3.0])
+        store = ResultStore(self._dbFile)
+        try:
+            slowest = store.slowestSteps(limit=2)
+            self.failUnlessEqual([5.0, 3.0],
+                                 [time for id, run, device, status, time
+                                       in slowest])
+            self.failUnlessEqual((steps[0].id, 2, "Device",
+                                  testexec.STATUS_ERROR, 3.0), slowest[1])
+        finally:
+            store.close()
+
+if __name__ == "__main__":
+    unittest.main()
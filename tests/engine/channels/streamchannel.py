@@ -35,6 +35,7 @@
 ################################################################################
 
 import unittest
+import datetime
 import traceback
 import cStringIO
 
@@ -47,7 +48,8 @@ import helpers
 from engine.commons import *
 
 __all__ = ["StreamChannelTest", "StreamChannelTestVerbose",
-           "StreamChannelTestErrorsCores"]
+           "StreamChannelTestErrorsCores", "StreamChannelTestBuffered",
+           "StreamChannelTestTemplate"]
 
 def _deviceDateTime(device, runTime=False):
     return helpers.deviceDateTime(device, runTime).split()
@@ -1412,3 +1414,100 @@ class StreamChannelTestErrorsCores(unittest.TestCase):
         channel.stop()
         helpers.assertOutput(self, output, string)
 
+
+class _CountingStream(object):
+    def __init__(self):
+        self.string = cStringIO.StringIO()
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, data):
+        self.writes += 1
+        self.string.write(data)
+
+    def flush(self):
+        self.flushes += 1
+
+
+class StreamChannelTestBuffered(unittest.TestCase):
+    def testUnbufferedEvents(self):
+        stream = _CountingStream()
+        channel = streamchannel.StreamChannel("Test", stream=stream,
+                                              verbose=True)
+        device = helpers.deviceResult()
+        device.errors = ["Error"]
+        channel.start(None)
+        channel.startTest(helpers.stepResult(), device)
+        channel.stopTest(helpers.stepResult(), device)
+        self.failUnlessEqual(2, stream.writes)
+        channel.stop()
+
+    def testBufferSize(self):
+        stream = _CountingStream()
+        channel = streamchannel.StreamChannel("Test", stream=stream,
+                                              buffer=4096, interval=0)
+        device = helpers.deviceResult()
+        channel.start(None)
+        channel.startTest(helpers.stepResult(), device)
+        self.failUnlessEqual(0, stream.writes)
+        channel.write('0' * 4096)
+        self.failUnlessEqual(1, stream.writes)
+        self.failUnlessEqual(1, stream.flushes)
+        channel.stopTest(helpers.stepResult(), device)
+        self.failUnlessEqual(1, stream.writes)
+        channel.stop()
+        self.failUnlessEqual(2, stream.writes)
+        self.failUnless(stream.string.getvalue().endswith("]\n"))
+
+    def testFlushInterval(self):
+        stream = _CountingStream()
+        channel = streamchannel.StreamChannel("Test", stream=stream,
+                                              buffer=4096, interval=60)
+        channel.start(None)
+        channel.startTest(helpers.stepResult(), helpers.deviceResult())
+        self.failUnlessEqual(0, stream.writes)
+        timer = channel._timer
+        self.failUnlessEqual(60.0, timer.interval)
+        # Fire the flush timer at once instead of waiting for it
+        timer.function(*timer.args, **timer.kwargs)
+        self.failUnlessEqual(1, stream.writes)
+        self.failUnlessEqual(1, stream.flushes)
+        self.failUnlessEqual(None, channel._timer)
+        self.failUnless(timer.finished.isSet())
+        channel.stop()
+        self.failUnlessEqual(1, stream.writes)
+
+
+def _formatData(formatter, attrs):
+    # Formatting of output data from before formatters were compiled
+    for name, type in streamchannel._placeHolders(formatter):
+        if type not in streamchannel._CONVERSION_TYPES:
+            continue
+        formatter = formatter.replace(u"%%(%s)%s" % (name, type),
+                        streamchannel._CONVERSION_TYPES[type](attrs[name]))
+    return formatter % attrs
+
+
+class StreamChannelTestTemplate(unittest.TestCase):
+    _VALUES = {
+        's': u"Text",
+        'r': u"Value",
+        'U': "Device",
+        'D': datetime.datetime(2011, 5, 3, 12, 30, 15),
+        'T': datetime.datetime(2011, 5, 3, 12, 30, 15),
+        'R': 5.1,
+        'S': 1024
+    }
+
+    def testRenderOldFormatting(self):
+        channel = streamchannel.StreamChannel
+        for formats in (channel._simpleFormats, channel._verboseFormats):
+            for formatter in formats.itervalues():
+                if isinstance(formatter, tuple):
+                    formatter = formatter[0]
+                attrs = dict([(name, self._VALUES[type]) for name, type
+                              in streamchannel._placeHolders(formatter)])
+                template = streamchannel._Template(formatter,
+                                            streamchannel._CONVERSION_TYPES)
+                self.failUnlessEqual(_formatData(formatter, attrs),
+                                     template.render(attrs))
@@ -34,6 +34,7 @@
 ##                                                                            ##
 ################################################################################
 
+import math
 import unittest
 
 from engine.commons import *
@@ -44,8 +45,11 @@ from tadek.engine.testresult import DeviceExecResult
 from tadek.engine.runner import TestRunner
 from tadek.engine.channels.summarychannel import SummaryChannel, \
                         COUNTER_N_TESTS, COUNTER_TESTS_RUN, COUNTER_CORE_DUMPS
+from tadek.engine.channels.summarychannel import QuantileSketch, RateMeter, \
+                        COUNTER_DURATION, COUNTER_DEVICE_DURATIONS, \
+                        COUNTER_RATE, COUNTER_ETA
 
-__all__ = ["SummaryChannelTest"]
+__all__ = ["SummaryChannelTest", "QuantileSketchTest", "RateMeterTest"]
 
 class SummaryChannelTest(unittest.TestCase):
     '''
@@ -134,6 +138,75 @@ class SummaryChannelTest(unittest.TestCase):
         self.assertEqual(len(self.deviceResult.cores),
                          summary[COUNTER_CORE_DUMPS])
 
+    def testDurationsAndEta(self):
+        channel = SummaryChannel("summary")
+        channel.start(self.suiteResult)
+        self.deviceResult.time = 2.0
+        self.deviceResult1.time = 4.0
+        channel.startTest(self.caseResult, self.deviceResult)
+        channel.stopTest(self.caseResult, self.deviceResult)
+        channel.startTest(self.caseResult1, self.deviceResult1)
+        channel.stopTest(self.caseResult1, self.deviceResult1)
+        summary = channel.getSummary()
+        durations = summary[COUNTER_DURATION]
+        self.assertEqual(2, durations["count"])
+        self.assertAlmostEqual(3.0, durations["mean"])
+        self.assertAlmostEqual(2.0, durations["p50"], delta=0.02)
+        self.assertAlmostEqual(4.0, durations["p99"], delta=0.04)
+        devices = summary[COUNTER_DEVICE_DURATIONS]
+        self.assertEqual(["ExampleDevice", "ExampleDevice1"], sorted(devices))
+        self.assertAlmostEqual(4.0, devices["ExampleDevice1"]["p50"],
+                               delta=0.04)
+        self.failUnless(summary[COUNTER_RATE] > 0)
+        self.failUnless(summary[COUNTER_ETA] > 0)
+        channel.startTest(self.caseResult2, self.deviceResult)
+        channel.stopTest(self.caseResult2, self.deviceResult)
+        self.assertEqual(0.0, channel.getSummary()[COUNTER_ETA])
+
+
+class QuantileSketchTest(unittest.TestCase):
+    def testEmpty(self):
+        sketch = QuantileSketch()
+        self.assertEqual(None, sketch.quantile(0.5))
+        self.assertEqual(0, sketch.summary()["count"])
+
+    def testRelativeError(self):
+        sketch = QuantileSketch(error=0.01)
+        values = [0.001 * x for x in xrange(1, 10001)]
+        for value in reversed(values):
+            sketch.add(value)
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(math.ceil(q * len(values))) - 1]
+            self.assertAlmostEqual(exact, sketch.quantile(q),
+                                   delta=exact*0.01)
+        self.assertEqual(values[-1], sketch.quantile(1.0))
+        self.failUnless(len(sketch._buckets) < 500)
+
+    def testZeros(self):
+        sketch = QuantileSketch()
+        for value in (0.0, 0.0, 0.0, 5.0):
+            sketch.add(value)
+        self.assertEqual(0.0, sketch.quantile(0.5))
+        self.assertEqual(5.0, sketch.quantile(1.0))
+
+
+class RateMeterTest(unittest.TestCase):
+    def testRate(self):
+        meter = RateMeter(window=10.0)
+        self.assertEqual(None, meter.rate())
+        for stamp in xrange(100, 110):
+            meter.add(stamp)
+        self.assertAlmostEqual(1.0, meter.rate(109.99), places=2)
+        self.assertAlmostEqual(0.9, meter.rate(110.0))
+
+    def testWindow(self):
+        meter = RateMeter(window=10.0)
+        for stamp in xrange(100, 110):
+            meter.add(stamp, 5)
+        meter.add(130.0)
+        self.assertAlmostEqual(0.1, meter.rate(130.0))
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -2799,7 +2799,7 @@ class XmlChannelTestRead(unittest.TestCase):
 
     def _compareDevices(self, device1, device2):
         for attr in ("name", "description", "address", "port",
-                     "status", "date", "time", "errors"):
+                     "status", "date", "time", "errors", "profile"):
             self.failUnlessEqual(getattr(device1, attr), getattr(device2, attr))
         if device1.cores:
             self.failUnless(device2.cores)
@@ -2879,6 +2879,45 @@ class XmlChannelTestRead(unittest.TestCase):
         suite.devices = case.devices = [device]
         self._compareResults(suite, container.children[0])
 
+    def testStopTestStepProfile(self):
+        suites, cases, steps = helpers.structResult(1, 1, 1)
+        suite, case, step = suites[0], cases[0], steps[0]
+        device = self._device(status=testexec.STATUS_PASSED, time=1.5)
+        stepDevice = device.snapshot()
+        stepDevice.profile = {"local": 0.25, "sleep": 1.0,
+                              "remote:a11y/get": 0.25}
+        self.channel.setVerbose(True)
+        self.channel.start(None)
+        self.channel.startTest(suite, device)
+        self.channel.startTest(case, device)
+        self.channel.startTest(step, stepDevice)
+        self.channel.stopTest(step, stepDevice)
+        self.channel.stopTest(case, device)
+        self.channel.stopTest(suite, device)
+        self.channel.stop()
+        container = self.channel.read(self.channel.filePath())
+        suite.devices = case.devices = [device]
+        step.devices = [stepDevice]
+        self._compareResults(suite, container.children[0])
+
+    def testStopTestStepNoProfile(self):
+        suites, cases, steps = helpers.structResult(1, 1, 1)
+        suite, case, step = suites[0], cases[0], steps[0]
+        device = self._device(status=testexec.STATUS_PASSED, time=1.5)
+        self.channel.setVerbose(True)
+        self.channel.start(None)
+        self.channel.startTest(suite, device)
+        self.channel.startTest(case, device)
+        self.channel.startTest(step, device)
+        self.channel.stopTest(step, device)
+        self.channel.stopTest(case, device)
+        self.channel.stopTest(suite, device)
+        self.channel.stop()
+        self.failIf("<profile" in open(self.channel.filePath()).read())
+        container = self.channel.read(self.channel.filePath())
+        step = container.children[0].children[0].children[0]
+        self.failUnlessEqual(None, step.devices[0].profile)
+
     def testStartStopTest1Suite1Case1StepVerbose(self):
         string = cStringIO.StringIO()
         suites, cases, steps = helpers.structResult(1, 1, 1)
@@ -3159,6 +3198,47 @@ class XmlChannelTestRead(unittest.TestCase):
             self.failIf(True, err)
         else:
             self.failIf(True)
+    def _writeResults(self):
+        suites, cases, steps = helpers.structResult(2, 2, 1)
+        device = self._device(status=testexec.STATUS_PASSED, time=1.0)
+        self.channel.setVerbose(True)
+        self.channel.start(None)
+        for suite in suites:
+            self.channel.startTest(suite, device)
+            for case in suite.children:
+                self.channel.startTest(case, device)
+                for step in case.children:
+                    self.channel.startTest(step, device)
+                    self.channel.stopTest(step, device)
+                self.channel.stopTest(case, device)
+            self.channel.stopTest(suite, device)
+        self.channel.stop()
+        for result in suites + cases + steps:
+            result.devices = [device]
+        return suites
+
+    def testIterReadSuites(self):
+        suites = self._writeResults()
+        results = self.channel.iterRead(self.channel.filePath())
+        suite = results.next()
+        self._compareResults(suites[0], suite)
+        self.failUnlessEqual(None, suite.parent)
+        self._compareResults(suites[1], results.next())
+        self.failUnlessRaises(StopIteration, results.next)
+
+    def testIterReadPrefix(self):
+        suites = self._writeResults()
+        path = self.channel.filePath()
+        results = list(self.channel.iterRead(path, "Suite2.Case"))
+        self.failUnlessEqual(2, len(results))
+        for case, result in zip(suites[1].children, results):
+            self.failUnlessEqual(None, result.parent)
+            self._compareResults(case, result)
+        results = list(self.channel.iterRead(path, "Suite2"))
+        self.failUnlessEqual(1, len(results))
+        self._compareResults(suites[1], results[0])
+        self.failIf(list(self.channel.iterRead(path, "Suite3")))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -108,6 +108,9 @@ class FakeTestResult(object):
     def start(self, result):
         self.result = result
 
+    def flush(self, timeout=None):
+        return True
+
     def stop(self):
         self.result = None
 
@@ -125,6 +128,12 @@ class DummyChannel(object):
     def isEnabled(self):
         return bool(self._enabled)
 
+    def setEnabled(self, enabled):
+        self._enabled = enabled
+
+    def isScanningSteps(self):
+        return True
+
     def isVerbose(self):
         return bool(self._verbose)
 
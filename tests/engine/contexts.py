@@ -38,13 +38,19 @@ import time
 import unittest
 
 from commons import *
+from tadek.core import timing
 from tadek.engine.contexts import *
+from tadek.engine.delay import Delay
 from tadek.engine.testdefs import *
 from tadek.engine.tasker import *
 from tadek.engine.testexec import TestAbortError
 
 __all__ = ["CaseContextTest", "ContextsTest"]
 
+@testStep()
+def sleepStep(test, device):
+    Delay(1, 0.1).wait()
+
 @testStep()
 def step1(test, device):
     if "step1" not in test:
@@ -514,6 +520,32 @@ class CaseContextTest(unittest.TestCase):
             self.failIf(True)
         _validExec(self, test, step2=1, step3=None, step6=1)
 
+    def testNoStepProfile(self):
+        test = FakeTestExec()
+        case = TestCase(step1(), sleepStep())
+        result = case.result(id="case")
+        context = CaseTask(1, case, result).context()
+        context.run(test, FakeDevice(), FakeTestResult())
+        device = FakeDevice()
+        for stepResult in result.children:
+            self.failUnlessEqual(None, stepResult.device(device).profile)
+        self.failUnlessEqual(None, timing.current())
+
+    def testStepProfile(self):
+        test = FakeTestExec()
+        case = TestCase(step1(), sleepStep())
+        result = case.result(id="case")
+        context = CaseTask(1, case, result).context()
+        context.profiling = True
+        context.run(test, FakeDevice(), FakeTestResult())
+        device = FakeDevice()
+        profile = result.children[1].device(device).profile
+        self.failUnless(profile[timing.CATEGORY_SLEEP] >= 0.1)
+        self.failUnless(timing.CATEGORY_LOCAL in profile)
+        self.failIf(timing.CATEGORY_SLEEP in
+                    result.children[0].device(device).profile)
+        self.failUnlessEqual(None, timing.current())
+
 
 class ContextsTest(unittest.TestCase):
     def testRunSimpeSuite(self):
@@ -35,6 +35,7 @@
 ################################################################################
 
 import os
+import sys
 import unittest
 
 from tadek.core import location
@@ -44,8 +45,13 @@ __all__ = ["LoaderTest"]
 
 class LoaderTest(unittest.TestCase):
     def setUp(self):
+        self._index = location._index
+        location._index = location.DiscoveryIndex()
         location.add("tests")
 
+    def tearDown(self):
+        location._index = self._index
+
     def testLoadFromNames(self):
         loader = TestLoader()
         tests, errors = loader.loadFromNames()
@@ -244,3 +250,60 @@ class LoaderTest(unittest.TestCase):
         self.failIf(tree)
         self.failUnless(errors)
 
+    def testListSuites(self):
+        loader = TestLoader()
+        suites, errors = loader.listSuites()
+        self.failUnlessEqual(suites["suitespkg1.suitesmdl11"],
+                             ["Suite111", "Suite112"])
+        self.failIf(errors)
+        self.failUnlessEqual(loader.listSuites()[0], suites)
+
+    def testLoadRefreshUnchanged(self):
+        loader = TestLoader()
+        loader.loadFromNames("suitespkg1.suitesmdl11")
+        module = sys.modules["tadek.testsuites.suitespkg1.suitesmdl11"]
+        loader.loadFromNames("suitespkg1.suitesmdl11")
+        self.failUnless(
+            sys.modules["tadek.testsuites.suitespkg1.suitesmdl11"] is module)
+
+    def testLoadRefreshChanged(self):
+        loader = TestLoader()
+        loader.loadFromNames("suitespkg1.suitesmdl11")
+        module = sys.modules["tadek.testsuites.suitespkg1.suitesmdl11"]
+        location._imported["tadek.testsuites.suitespkg1.suitesmdl11"] = 0
+        loader.loadFromNames("suitespkg1.suitesmdl11")
+        self.failIf(
+            sys.modules["tadek.testsuites.suitespkg1.suitesmdl11"] is module)
+
+    def testLoadRefreshDependentSuites(self):
+        loader = TestLoader()
+        loader.loadFromNames("suitespkg1")
+        module = sys.modules["tadek.testsuites.suitespkg1.suitesmdl12"]
+        cases = sys.modules["tadek.testcases.casespkg1.casesmdl11"]
+        location._imported["tadek.testsuites.suitespkg1.suitesmdl11"] = 0
+        loader.loadFromNames("suitespkg1.suitesmdl11")
+        self.failIf(
+            sys.modules.get("tadek.testsuites.suitespkg1.suitesmdl12")
+            is module)
+        self.failUnless(
+            sys.modules["tadek.testcases.casespkg1.casesmdl11"] is cases)
+
+    def testCollect(self):
+        loader = TestLoader()
+        location.clear()
+        suites, errors = loader.collect(2)
+        self.failIf(errors)
+        self.failIf("tadek.testsuites.suitespkg1.suitesmdl11" in sys.modules)
+        suite = suites["suitespkg1.suitesmdl11"]["Suite111"]
+        self.failUnless(suite["cases"])
+        self.failUnless(isinstance(suite["attrs"], dict))
+        self.failUnlessEqual(sorted(suites["suitespkg1.suitesmdl11"]),
+                             ["Suite111", "Suite112"])
+
+    def testCollectRefresh(self):
+        loader = TestLoader()
+        loader.loadFromNames("suitespkg1.suitesmdl11")
+        location._imported["tadek.testsuites.suitespkg1.suitesmdl11"] = 0
+        suites, errors = loader.collect(1)
+        self.failIf(errors)
+        self.failIf("tadek.testsuites.suitespkg1.suitesmdl11" in sys.modules)
@@ -529,6 +529,60 @@ class DeviceLockTest(unittest.TestCase):
         self.assertFalse(devLock._locked)
         self.assertTrue(devLock._shouldAbort)
 
+    def testStaticAttrs(self):
+        device = FakeDevice("d1")
+        devLock = DeviceLock(device, FakeTestExec())
+        device.connected = False
+        devLock.stop()
+        self.assertEqual("d1", devLock.name)
+        self.assertEqual(device.address, devLock.address)
+        self.assertTrue(devLock._shouldAbort)
+
+    def testCallCheck(self):
+        device = FakeDevice("d1")
+        devLock = DeviceLock(device, FakeTestExec())
+        device.connected = False
+        ids = devLock.testCaseIds
+        self.assertRaises(TestAbortError, ids)
+        device.connected = True
+        self.assertEqual([], ids())
+        devLock.stop()
+        self.assertRaises(TestAbortError, ids)
+        self.assertFalse(devLock._shouldAbort)
+        self.assertEqual([], ids())
+
+    def testLockedCall(self):
+        device = FakeDevice("d1")
+        devLock = DeviceLock(device, FakeTestExec())
+        devLock.lock()
+        thread = threading.Thread(target=devLock.updateTestCaseIds,
+                                  args=("id1",))
+        thread.start()
+        thread.join(0.1)
+        self.assertTrue(thread.isAlive())
+        self.assertEqual([], device.ids)
+        devLock.unlock()
+        thread.join(1.0)
+        self.assertFalse(thread.isAlive())
+        self.assertEqual(["id1"], device.ids)
+
+    def testAttributeAccessChecks(self):
+        device = FakeDevice("d1")
+        devLock = DeviceLock(device, FakeTestExec())
+        device.box = {}
+        checks = []
+        devLock.check = lambda: checks.append(True)
+        devLock.name
+        self.assertEqual([], checks)
+        devLock.box
+        self.assertEqual(1, len(checks))
+        call = devLock.isConnected
+        self.assertTrue(call is devLock.isConnected)
+        self.assertEqual(1, len(checks))
+        for i in xrange(3):
+            call()
+        self.assertEqual(4, len(checks))
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,125 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import os
+import unittest
+
+from tadek.core import locale
+from tadek.core.accessible import Path, Accessible
+from tadek.engine.searchers import Predicates, searcher
+
+__all__ = ["PredicatesTest", "SearcherTest"]
+
+_LOCALE_DIR = os.path.abspath(os.path.join("tests", "locales", "locale1"))
+
+class _Device:
+    locale = "pl_PL"
+
+    def searchEscaped(self, path, method, predicates):
+        self.predicates = predicates
+        return None
+
+
+class PredicatesTest(unittest.TestCase):
+    def tearDown(self):
+        locale.remove(_LOCALE_DIR)
+
+    def testImmutable(self):
+        predicates = Predicates(name=u"Name", role=None)
+        self.failUnlessEqual([("name", u"Name")], list(predicates))
+        self.failUnlessEqual(u"Name", predicates.get("name"))
+        self.failUnlessEqual(None, predicates.get("role"))
+        self.failUnlessRaises(AttributeError, setattr, predicates,
+                              "_items", ())
+
+    def testEscaped(self):
+        device = _Device()
+        predicates = Predicates(name=locale.gettext__("hello"), role=u"FRAME")
+        self.failUnlessEqual({"name": u"hello", "role": u"FRAME"},
+                             predicates.escaped(device))
+        locale.add(_LOCALE_DIR)
+        self.failUnlessEqual({"name": u"witaj", "role": u"FRAME"},
+                             predicates.escaped(device))
+
+    def testPattern(self):
+        device = _Device()
+        predicates = Predicates(name=u"&Te.t", role=u"FRAME")
+        self.failUnlessEqual(None, predicates.pattern("role", device))
+        regexp = predicates.pattern("name", device)
+        self.failUnless(regexp is predicates.pattern("name", device))
+        self.failUnless(regexp.match(u"Text"))
+
+    def testMatch(self):
+        acc = Accessible(Path(0))
+        acc.device = _Device()
+        acc.name = u"Text"
+        acc.role = u"FRAME"
+        self.failUnless(Predicates(name=u"&Te.t", role=u"FRAME").match(acc))
+        self.failIf(Predicates(name=u"&Te", role=u"FRAME").match(acc))
+
+
+class SearcherTest(unittest.TestCase):
+    def tearDown(self):
+        locale.remove(_LOCALE_DIR)
+
+    def testFindEscapedPredicates(self):
+        locale.add(_LOCALE_DIR)
+        escapes = []
+        escape = locale.escape
+        def countingEscape(value, device):
+            escapes.append(device.locale)
+            return escape(value, device)
+        locale.escape = countingEscape
+        try:
+            acc = Accessible(Path(0))
+            acc.device = _Device()
+            find = searcher(name=locale.gettext__("hello"))
+            for i in xrange(3):
+                find.find(acc)
+                self.failUnlessEqual({"name": u"witaj", "nth": 0},
+                                     acc.device.predicates)
+            acc.device = _Device()
+            acc.device.locale = "en_US"
+            for i in xrange(3):
+                find.find(acc)
+                self.failUnlessEqual({"name": u"hello", "nth": 0},
+                                     acc.device.predicates)
+        finally:
+            locale.escape = escape
+        self.failUnlessEqual(["pl_PL", "en_US"], escapes)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -42,12 +42,14 @@ import threading
 
 from tadek.core import settings
 from tadek.engine import channels
+from tadek.engine import testexec
 from tadek.engine import testresult 
 from tadek.engine.testresult import *
 
 from engine import commons
 
-__all__ = ["TestResultTest", "TestResultCoreDumpsTest"]
+__all__ = ["TestResultTest", "TestResultDispatchTest",
+           "TestResultCoreDumpsTest", "TestResultStatusTest"]
 
 
 class OutputThread(threading.Thread):
@@ -120,6 +122,105 @@ class TestResultTest(unittest.TestCase):
                                                 len(set(channel.testBuffer)))
 
 
+class SlowChannel(channels.TestResultChannel):
+    def __init__(self, name, delay=0.0, **params):
+        channels.TestResultChannel.__init__(self, name, **params)
+        self.delay = delay
+        self.statuses = []
+        self.results = []
+        self.threads = set()
+
+    def startTest(self, result, device):
+        time.sleep(self.delay)
+        self.threads.add(threading.currentThread())
+        self.statuses.append(device.status)
+        self.results.append((result, result.status))
+
+    def stopTest(self, result, device):
+        self.startTest(result, device)
+
+
+class TestResultDispatchTest(unittest.TestCase):
+    def setUp(self):
+        self.originalChannels = testresult.channels
+        testresult.channels = commons.DummyChannels()
+
+    def tearDown(self):
+        testresult.channels = self.originalChannels
+
+    def testInvalidPolicy(self):
+        self.failUnlessRaises(channels.TestResultChannelError, SlowChannel,
+                              "Test", dispatch="wait")
+
+    def testSyncDispatch(self):
+        channel = SlowChannel("Test")
+        testresult.channels.scenario.append(channel)
+        result = TestResult()
+        result.start(None)
+        caseResult = TestCaseResult()
+        result.startTest(caseResult, commons.FakeDevice())
+        self.failUnlessEqual(set([threading.currentThread()]),
+                             channel.threads)
+        result.stop()
+
+    def testBlockDispatch(self):
+        channel = SlowChannel("Test", delay=0.05,
+                              dispatch=channels.DISPATCH_BLOCK)
+        testresult.channels.scenario.append(channel)
+        result = TestResult()
+        result.start(None)
+        device = commons.FakeDevice()
+        caseResult = TestCaseResult()
+        stamp = time.time()
+        result.startTest(caseResult, device)
+        caseResult.device(device).status = testexec.STATUS_PASSED
+        result.stopTest(caseResult, device)
+        self.failUnless(time.time() - stamp < 0.05)
+        self.failUnless(result.flush())
+        self.failUnlessEqual([testexec.STATUS_NOT_COMPLETED,
+                              testexec.STATUS_PASSED], channel.statuses)
+        self.failIf(threading.currentThread() in channel.threads)
+        for snapshot, status in channel.results:
+            self.failIf(snapshot is caseResult)
+            self.failUnlessEqual(status, snapshot.status)
+        result.stop()
+
+    def testBlockDispatchOutsideLock(self):
+        channel = SlowChannel("Test", delay=0.2, queue=1,
+                              dispatch=channels.DISPATCH_BLOCK)
+        testresult.channels.scenario.append(channel)
+        result = TestResult()
+        result.start(None)
+        device = commons.FakeDevice()
+        threads = []
+        for x in xrange(3):
+            thread = threading.Thread(target=result.startTest,
+                                      args=(TestCaseResult(), device))
+            thread.start()
+            threads.append(thread)
+        time.sleep(0.05)
+        # Device threads blocked on the full queue do not hold the mutex
+        self.failUnless(result._mutex.acquire(False))
+        result._mutex.release()
+        for thread in threads:
+            thread.join()
+        result.stop()
+
+    def testDropDispatch(self):
+        channel = SlowChannel("Test", delay=0.05, queue=1,
+                              dispatch=channels.DISPATCH_DROP)
+        testresult.channels.scenario.append(channel)
+        result = TestResult()
+        result.start(None)
+        device = commons.FakeDevice()
+        for x in xrange(5):
+            result.startTest(TestCaseResult(), device)
+        dispatcher = result._dispatchers[id(channel)]
+        result.stop()
+        self.failUnless(dispatcher.dropped > 0)
+        self.failUnlessEqual(5, len(channel.statuses) + dispatcher.dropped)
+
+
 class TestResultCoreDumpsTest(unittest.TestCase):
     _TEST_CORE_DIR = os.path.abspath(os.path.join("tests", "_coredumps"))
     _TEST_CORE_FILE = "file.core"
@@ -196,6 +297,142 @@ class TestResultCoreDumpsTest(unittest.TestCase):
         execResult = result.device(device)
         self.failIf(execResult.cores)
 
+    def testScanningStepsDisabled(self):
+        caseResult = TestCaseResult()
+        stepResult = TestStepResult()
+        device = commons.FakeDevice()
+        self.testResult._coreDumps.setEnabled(True)
+        self.testResult._coreDumps.setScanningSteps(False)
+        self.testResult.startTest(caseResult, device)
+        self.testResult.startTest(stepResult, device)
+        core = os.path.join(self._TEST_CORE_DIR, self._TEST_CORE_FILE)
+        commons.createRandomSizeFile(core)
+        self.testResult.stopTest(stepResult, device)
+        self.testResult.stopTest(caseResult, device)
+        self.failIf(stepResult.device(device).cores)
+        self.failUnlessEqual([core], caseResult.device(device).cores)
+
+    def testChangedCoreDump(self):
+        device = commons.FakeDevice()
+        core = os.path.join(self._TEST_CORE_DIR, self._TEST_CORE_FILE)
+        self.testResult._coreDumps.setEnabled(True)
+        for size in (256, 512):
+            result = TestCaseResult()
+            self.testResult.startTest(result, device)
+            fd = open(core, "wb")
+            try:
+                fd.write('0' * size)
+            finally:
+                fd.close()
+            self.testResult.stopTest(result, device)
+            self.failUnlessEqual([core], result.device(device).cores)
+
+    def testDirChangesCoreDumps(self):
+        device = commons.FakeDevice()
+        device.extensions = ("dirfiles", "dirchanges")
+        core = os.path.join(self._TEST_CORE_DIR, self._TEST_CORE_FILE)
+        self.testResult._coreDumps.setEnabled(True)
+        result = TestCaseResult()
+        self.testResult.startTest(result, device)
+        commons.createRandomSizeFile(core)
+        self.testResult.stopTest(result, device)
+        self.failUnlessEqual([core], result.device(device).cores)
+        cache = self.testResult._coreDumps._cache(device)
+        self.failUnless(cache.cursors)
+        result = TestCaseResult()
+        self.testResult.startTest(result, device)
+        self.testResult.stopTest(result, device)
+        self.failIf(result.device(device).cores)
+
+
+class TestResultStatusTest(unittest.TestCase):
+    def setUp(self):
+        self.device1 = commons.FakeDevice("d1")
+        self.device2 = commons.FakeDevice("d2")
+        self.suite = TestSuiteResult(id="Suite")
+        self.case = TestCaseResult(id="Case", parent=self.suite)
+        self.step = TestStepResult(id="Step", parent=self.case)
+
+    def testDeviceLookup(self):
+        execResult = self.case.device(self.device1)
+        self.failUnless(execResult is self.case.device(self.device1))
+        self.failIf(execResult is self.case.device(self.device2))
+        self.failUnlessEqual(2, len(self.case.devices))
+
+    def testNoDevices(self):
+        self.failUnlessEqual(testexec.STATUS_NO_RUN, self.suite.status)
+        self.failUnlessEqual({}, self.suite.statusCounts(recursive=True))
+
+    def testStatusChanges(self):
+        self.step.device(self.device1).status = testexec.STATUS_PASSED
+        self.step.device(self.device2).status = testexec.STATUS_FAILED
+        self.failUnlessEqual(testexec.STATUS_FAILED, self.step.status)
+        self.failUnlessEqual({testexec.STATUS_PASSED: 1,
+                              testexec.STATUS_FAILED: 1},
+                             self.step.statusCounts())
+        self.step.device(self.device2).status = testexec.STATUS_PASSED
+        self.failUnlessEqual(testexec.STATUS_PASSED, self.step.status)
+        self.failUnlessEqual({testexec.STATUS_PASSED: 2},
+                             self.step.statusCounts())
+
+    def testRollUp(self):
+        self.case.device(self.device1).status = testexec.STATUS_PASSED
+        self.step.device(self.device1).status = testexec.STATUS_ERROR
+        self.failUnlessEqual({}, self.suite.statusCounts())
+        self.failUnlessEqual({testexec.STATUS_PASSED: 1,
+                              testexec.STATUS_ERROR: 1},
+                             self.suite.statusCounts(recursive=True))
+        self.step.device(self.device1).status = testexec.STATUS_PASSED
+        self.failUnlessEqual({testexec.STATUS_PASSED: 2},
+                             self.suite.statusCounts(recursive=True))
+
+    def testReparent(self):
+        self.step.device(self.device1).status = testexec.STATUS_FAILED
+        suite = TestSuiteResult(id="Other")
+        self.case.parent = suite
+        self.failUnlessEqual({}, self.suite.statusCounts(recursive=True))
+        self.failUnlessEqual({testexec.STATUS_FAILED: 1},
+                             suite.statusCounts(recursive=True))
+
+    def testAssignDevices(self):
+        execResult = self.step.device(self.device1)
+        execResult.status = testexec.STATUS_PASSED
+        self.case.devices = [execResult]
+        self.failUnlessEqual({testexec.STATUS_PASSED: 2},
+                             self.suite.statusCounts(recursive=True))
+        self.step.devices = []
+        execResult.status = testexec.STATUS_FAILED
+        self.failUnlessEqual(testexec.STATUS_FAILED, self.case.status)
+        self.failUnlessEqual({testexec.STATUS_FAILED: 1},
+                             self.suite.statusCounts(recursive=True))
+
+    def testResultSnapshot(self):
+        self.step.device(self.device1).status = testexec.STATUS_PASSED
+        snapshot = self.case.snapshot()
+        self.step.device(self.device1).status = testexec.STATUS_FAILED
+        TestStepResult(id="Step2", parent=self.case)
+        self.case.attrs["name"] = u"Case"
+        self.failIf(snapshot is self.case)
+        self.failUnlessEqual("Suite.Case", snapshot.id)
+        self.failUnlessEqual("Suite", snapshot.parent.id)
+        self.failUnlessEqual({}, snapshot.attrs)
+        self.failUnlessEqual(["Suite.Case.Step"],
+                             [child.id for child in snapshot.children])
+        self.failUnless(snapshot.children[0].parent is snapshot)
+        self.failUnlessEqual(testexec.STATUS_PASSED,
+                             snapshot.children[0].status)
+        self.failUnlessEqual({testexec.STATUS_PASSED: 1},
+                             snapshot.parent.statusCounts(recursive=True))
+
+    def testSnapshot(self):
+        execResult = self.case.device(self.device1)
+        snapshot = execResult.snapshot()
+        snapshot.status = testexec.STATUS_ERROR
+        self.failUnlessEqual(testexec.STATUS_NO_RUN,
+                             self.case.device(self.device1).status)
+        self.failUnlessEqual({testexec.STATUS_NO_RUN: 1},
+                             self.suite.statusCounts(recursive=True))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,177 @@
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import os
+import unittest
+from xml.etree import cElementTree as etree
+
+from tadek.connection.device import OfflineDevice
+from tadek.core.accessible import Path, Accessible
+from tadek.engine import delay
+from tadek.engine import searchers
+from tadek.engine.widgets import Widget, WidgetSnapshot, Container
+
+from core.search import _table
+
+__all__ = ["WidgetSnapshotTest", "ContainerTest"]
+
+class _Device(object):
+    locale = None
+
+    def __init__(self):
+        self.requests = []
+        self.accessible = Accessible(Path(0, 1))
+        self.accessible.name = u"Button"
+        self.accessible.role = u"PUSH_BUTTON"
+        self.accessible.position = (10, 20)
+        self.accessible.states = [u"ENABLED", u"FOCUSED"]
+        self.accessible.attributes = {u"toolkit": u"gtk"}
+
+    def searchEscaped(self, path, method, predicates):
+        self.requests.append("searchAccessible")
+        return self.accessible
+
+    def getAccessible(self, path, depth=0, **fields):
+        self.requests.append(("getAccessible", path,
+                              sorted([f for f in fields if fields[f]])))
+        return self.accessible
+
+
+class WidgetSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.device = _Device()
+        self.widget = Widget(1)
+        self._delay = delay.default
+        delay.default = delay.immediate
+
+    def tearDown(self):
+        delay.default = self._delay
+
+    def testSnapshot(self):
+        snapshot = self.widget.snapshot(self.device,
+                                        fields=("name", "position", "states"))
+        self.failUnlessEqual(["searchAccessible",
+                              ("getAccessible", Path(0, 1),
+                               ["name", "position", "states"])],
+                             self.device.requests)
+        self.failUnlessEqual(Path(0, 1), snapshot.path)
+        self.failUnlessEqual(u"Button", snapshot.name)
+        self.failUnlessEqual((u"ENABLED", u"FOCUSED"), snapshot.states)
+        self.failUnlessRaises(AttributeError, getattr, snapshot, "role")
+        self.failUnlessRaises(AttributeError, setattr, snapshot, "name", u"")
+
+    def testSnapshotInvalidField(self):
+        self.failUnlessRaises(ValueError, self.widget.snapshot, self.device,
+                              fields=("color",))
+
+    def testGettersUseSnapshot(self):
+        snapshot = self.widget.snapshot(self.device)
+        requests = len(self.device.requests)
+        self.failUnlessEqual(1, self.widget.getIndex(self.device, snapshot))
+        self.failUnlessEqual(u"Button",
+                             self.widget.getName(self.device, snapshot))
+        self.failUnlessEqual(u"PUSH_BUTTON",
+                             self.widget.getRoleName(self.device, snapshot))
+        self.failUnlessEqual((10, 20),
+                             self.widget.getPosition(self.device, snapshot))
+        self.failUnlessEqual(u"gtk",
+                             self.widget.getAttribute(self.device, "toolkit",
+                                                      snapshot))
+        self.failUnless(self.widget.isEnabled(self.device, snapshot=snapshot))
+        self.failIf(self.widget.isChecked(self.device, snapshot=snapshot))
+        self.failUnlessEqual(requests, len(self.device.requests))
+
+
+class _Rows(Container):
+    searcher_of_children = searchers.searcher
+
+
+class ContainerTest(unittest.TestCase):
+    _TEST_FILE = os.path.abspath(os.path.join("tests", "_container.xml"))
+
+    def setUp(self):
+        root = Accessible(Path(), children=(_table(10),))
+        etree.ElementTree(root.marshal()).write(self._TEST_FILE)
+        self.device = OfflineDevice("Offline", self._TEST_FILE)
+        self.device.connect()
+        self.requests = []
+        request = self.device.request
+        def countRequest(target, name, *args, **kwargs):
+            self.requests.append(name)
+            return request(target, name, *args, **kwargs)
+        self.device.request = countRequest
+        self.table = _Rows(searchers.searcher__(role=u"TABLE"))
+        self._delay = delay.default
+        delay.default = delay.immediate
+
+    def tearDown(self):
+        delay.default = self._delay
+        self.device.disconnect()
+        os.remove(self._TEST_FILE)
+
+    def testChildIter(self):
+        children = list(self.table.childIter(self.device))
+        self.failUnlessEqual(10, len(children))
+        self.failUnlessEqual(2, len(self.requests))
+        del self.requests[:]
+        self.failUnlessEqual(Path(0, 0, 7),
+                             children[7].getWidget(self.device).path)
+        self.failUnlessEqual(u"Row", children[7].getName(self.device))
+        # The table is searched and the row is got by its path
+        self.failUnlessEqual(4, len(self.requests))
+
+    def testChildIterStale(self):
+        child = list(self.table.childIter(self.device))[3]
+        child.getPath()._searchers[0]._path = Path(0, 0, 3, 1)
+        self.failUnlessEqual(None, child.getImmediate(self.device))
+
+    def testGetCurrent(self):
+        row = Container(self.table.getPath(),
+                        searchers.searcher(role=u"TABLE_ROW", nth=3))
+        current = row.getCurrent(self.device)
+        self.failUnlessEqual(Path(0, 0, 3, 0),
+                             current.getWidget(self.device).path)
+        row = Container(self.table.getPath(),
+                        searchers.searcher(role=u"TABLE_ROW", nth=2))
+        self.failUnlessEqual(None, row.getCurrent(self.device))
+
+    def testHasChild(self):
+        self.failUnless(self.table.hasChild(self.device, "Row"))
+        self.failUnlessEqual(["search", "search"], self.requests)
+        self.failIf(self.table.hasChild(self.device, "Column"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import os
+import sys
+import time
+import optparse
+import threading
+
+try:
+    import tadek
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tadek.connection import protocol
+from tadek.connection.device import Device
+from tadek.connection.simulator import SimulatedDaemon, syntheticTree
+from tadek.core import config
+from tadek.core.accessible import Path
+
+_PROGRAM_NAME = 'loadtest'
+config.setProgramName(_PROGRAM_NAME)
+
+def _percentile(values, percent):
+    '''
+    Returns the given percentile of the sorted values using
+    the nearest-rank method.
+    '''
+    if not values:
+        return 0.0
+    rank = max(0, int(round(percent / 100.0 * len(values) + 0.5)) - 1)
+    return values[min(rank, len(values) - 1)]
+
+def _work(device, requests, latencies, errors):
+    '''
+    Issues the given number of get and search requests to the device and
+    appends their latencies to the specified list.
+    '''
+    for i in xrange(requests):
+        start = time.time()
+        try:
+            if i % 2:
+                device.searchAccessible(Path(), protocol.MHD_SEARCH_DEEP,
+                                        name=u"Node 0.%d" % (i % 5))
+            else:
+                device.getAccessible(Path(0, i % 5), depth=1)
+        except Exception:
+            errors.append(i)
+            continue
+        latencies.append(time.time() - start)
+
+def run(daemon, devices, requests):
+    '''
+    Runs the given number of devices connected to the daemon, each issuing
+    the specified number of requests, and returns the measured throughput
+    and latency percentiles.
+    '''
+    connected = []
+    for i in xrange(devices):
+        device = Device("device%d" % i, *daemon.address)
+        device.connect()
+        connected.append(device)
+    latencies = []
+    errors = []
+    threads = [threading.Thread(target=_work,
+                                args=(device, requests, latencies, errors))
+               for device in connected]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+    for device in connected:
+        device.disconnect()
+    latencies.sort()
+    return {
+        "devices": devices,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": _percentile(latencies, 50),
+        "p95": _percentile(latencies, 95),
+        "p99": _percentile(latencies, 99),
+    }
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage="%prog [options] [DEVICES...]")
+    parser.add_option("-n", "--requests",
+        type="int",
+        dest="requests",
+        default=100,
+        help="set the number of requests issued by each device to NUM",
+        metavar="NUM")
+    parser.add_option("-d", "--depth",
+        type="int",
+        dest="depth",
+        default=4,
+        help="set the depth of the synthetic accessible tree to NUM",
+        metavar="NUM")
+    parser.add_option("-f", "--fanout",
+        type="int",
+        dest="fanout",
+        default=5,
+        help="set the number of children in the synthetic tree to NUM",
+        metavar="NUM")
+    parser.add_option("-t", "--tree",
+        dest="tree",
+        default=None,
+        help="serve the accessible tree dumped in FILE",
+        metavar="FILE")
+    parser.add_option("-l", "--latency",
+        type="float",
+        dest="latency",
+        default=0.0,
+        help="set the mean latency of responses to SEC",
+        metavar="SEC")
+    parser.add_option("-j", "--jitter",
+        type="float",
+        dest="jitter",
+        default=0.0,
+        help="set the maximum deviation of latencies to SEC",
+        metavar="SEC")
+    parser.add_option("-b", "--bandwidth",
+        type="int",
+        dest="bandwidth",
+        default=0,
+        help="limit the bandwidth of each connection to BPS bytes per second",
+        metavar="BPS")
+    parser.add_option("-e", "--failures",
+        type="float",
+        dest="failures",
+        default=0.0,
+        help="set the probability of a request failure to RATE",
+        metavar="RATE")
+    options, args = parser.parse_args()
+
+    counts = [int(arg) for arg in args] or [1, 2, 4, 8]
+    tree = options.tree or syntheticTree(options.depth, options.fanout)
+    daemon = SimulatedDaemon(("127.0.0.1", 0), tree,
+                             latency=options.latency, jitter=options.jitter,
+                             bandwidth=options.bandwidth,
+                             failures=options.failures)
+    daemon.start()
+    try:
+        print "%8s %10s %8s %12s %10s %10s %10s" % ("devices", "requests",
+                "errors", "requests/s", "p50 [ms]", "p95 [ms]", "p99 [ms]")
+        for count in counts:
+            result = run(daemon, count, options.requests)
+            print "%8d %10d %8d %12.1f %10.2f %10.2f %10.2f" % (
+                result["devices"], result["requests"], result["errors"],
+                result["throughput"], result["p50"] * 1000,
+                result["p95"] * 1000, result["p99"] * 1000)
+    finally:
+        daemon.stop()
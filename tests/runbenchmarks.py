@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+################################################################################
+##                                                                            ##
+## This file is a part of TADEK.                                              ##
+##                                                                            ##
+## TADEK - Test Automation in a Distributed Environment                       ##
+## (http://tadek.comarch.com)                                                 ##
+##                                                                            ##
+## Copyright (C) 2011 Comarch S.A.                                            ##
+## All rights reserved.                                                       ##
+##                                                                            ##
+## TADEK is free software for non-commercial purposes. For commercial ones    ##
+## we offer a commercial license. Please check http://tadek.comarch.com for   ##
+## details or write to tadek-licenses@comarch.com                             ##
+##                                                                            ##
+## You can redistribute it and/or modify it under the terms of the            ##
+## GNU General Public License as published by the Free Software Foundation,   ##
+## either version 3 of the License, or (at your option) any later version.    ##
+##                                                                            ##
+## TADEK is distributed in the hope that it will be useful,                   ##
+## but WITHOUT ANY WARRANTY; without even the implied warranty of             ##
+## MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the              ##
+## GNU General Public License for more details.                               ##
+##                                                                            ##
+## You should have received a copy of the GNU General Public License          ##
+## along with TADEK bundled with this file in the file LICENSE.               ##
+## If not, see http://www.gnu.org/licenses/.                                  ##
+##                                                                            ##
+## Please notice that Contributor Agreement applies to any contribution       ##
+## you make to TADEK. The Agreement must be completed, signed and sent        ##
+## to Comarch before any contribution is made. You should have received       ##
+## a copy of Contribution Agreement along with TADEK bundled with this file   ##
+## in the file CONTRIBUTION_AGREEMENT.pdf or see http://tadek.comarch.com     ##
+## or write to tadek-licenses@comarch.com                                     ##
+##                                                                            ##
+################################################################################
+
+import os
+import sys
+import optparse
+
+try:
+    import tadek
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tadek.core import config
+from tadek.core import location
+
+_PROGRAM_NAME = 'benchmark'
+config.setProgramName(_PROGRAM_NAME)
+# Keep the discovery index of test locations in memory only
+location._index = location.DiscoveryIndex()
+
+import benchmarks
+
+#: A path to the stored baseline report
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "benchmarks", "baseline.json")
+
+if __name__ == "__main__":
+    parser = optparse.OptionParser(usage="%prog [options] [NAME...]")
+    parser.add_option("-s", "--scales",
+        dest="scales",
+        default=','.join([str(s) for s in benchmarks.DEFAULT_SCALES]),
+        help="set the comma separated scales of workloads to LIST",
+        metavar="LIST")
+    parser.add_option("-r", "--repeat",
+        type="int",
+        dest="repeat",
+        default=benchmarks.DEFAULT_REPEAT,
+        help="set the number of runs of each workload to NUM",
+        metavar="NUM")
+    parser.add_option("-o", "--output",
+        dest="output",
+        default=None,
+        help="write the JSON report to FILE, '-' for the standard output",
+        metavar="FILE")
+    parser.add_option("-b", "--baseline",
+        dest="baseline",
+        default=BASELINE_FILE,
+        help="compare the results with the JSON report in FILE",
+        metavar="FILE")
+    parser.add_option("-t", "--tolerance",
+        type="float",
+        dest="tolerance",
+        default=benchmarks.DEFAULT_TOLERANCE,
+        help="report slowdowns above RATIO of the baseline as regressions",
+        metavar="RATIO")
+    parser.add_option("-u", "--update",
+        action="store_true",
+        dest="update",
+        default=False,
+        help="store the results as the new baseline")
+    options, args = parser.parse_args()
+
+    scales = [int(scale) for scale in options.scales.split(',') if scale]
+    report = benchmarks.run(benchmarks.getBenchmarks(args), scales,
+                            options.repeat, out=sys.stderr)
+    if options.output:
+        benchmarks.save(report, sys.stdout if options.output == '-'
+                                else options.output)
+    if options.update:
+        benchmarks.save(report, options.baseline)
+        sys.exit(0)
+    if not os.path.exists(options.baseline):
+        sys.exit(0)
+    comparisons, regressions = benchmarks.compare(
+                        report, benchmarks.load(options.baseline),
+                        options.tolerance)
+    for name, scale, base, elapsed, ratio in comparisons:
+        sys.stderr.write("%-24s %8d %12.6f s %12.6f s %7.2fx%s\n"
+                         % (name, scale, base, elapsed, ratio,
+                            " REGRESSION" if (name, scale, base, elapsed,
+                                              ratio) in regressions else ''))
+    sys.exit(1 if regressions else 0)
@@ -47,6 +47,7 @@ except ImportError:
     sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from tadek.core import config
+from tadek.core import location
 
 TEST_MODULES = (
     "connection",
@@ -56,6 +57,8 @@ TEST_MODULES = (
 
 _PROGRAM_NAME = 'unittest'
 config.setProgramName(_PROGRAM_NAME)
+# Keep the discovery index of test locations in memory only
+location._index = location.DiscoveryIndex()
 
 if __name__ == "__main__":
     parser = optparse.OptionParser()